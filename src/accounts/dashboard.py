@@ -0,0 +1,125 @@
+"""
+Số liệu của bảng điều khiển admin, giữ sẵn trong cache.
+
+Các bộ đếm được tính lại từ CSDL (mỗi bảng một truy vấn aggregate có điều kiện)
+khi snapshot hết hạn, còn giữa hai lần đó được cộng/trừ tăng dần qua signals
+khi User/Complaint được tạo, xóa hoặc đổi loại/trạng thái (xem accounts.signals).
+Snapshot hết hạn sau DASHBOARD_STATS_TIMEOUT giây để các bộ đếm "30 ngày qua"
+trượt theo thời gian. Danh sách khiếu nại/hoạt động gần đây được cache riêng và
+xóa khi có bản ghi mới.
+
+Các bộ đếm được cộng dồn trực tiếp trong cache nên snapshot cần một cache dùng chung
+giữa các tiến trình (Redis/Memcached): với LocMemCache mỗi tiến trình giữ một bản
+riêng và chỉ thấy thay đổi do chính nó ghi cho tới khi snapshot hết hạn.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from jobs.caching import get_or_build
+
+from .models import AdminActivity, Complaint, User
+
+STATS_TIMEOUT = getattr(settings, 'DASHBOARD_STATS_TIMEOUT', 3600)
+RECENT_TIMEOUT = 300
+NEW_WINDOW = timedelta(days=30)
+
+STAT_NAMES = (
+    'total_users', 'total_workers', 'total_employers', 'new_users_30d',
+    'total_complaints', 'pending_complaints', 'new_complaints_30d',
+)
+# Bộ đếm theo loại tài khoản
+USER_TYPE_STATS = {
+    'worker': 'total_workers',
+    'employer': 'total_employers',
+}
+
+BUILT_KEY = 'accounts:dashboard:built'
+RECENT_COMPLAINTS_KEY = 'accounts:dashboard:recent_complaints'
+RECENT_ACTIVITIES_KEY = 'accounts:dashboard:recent_activities'
+
+
+def _stat_key(name):
+    return f'accounts:dashboard:{name}'
+
+
+def compute_stats():
+    """Tính toàn bộ bộ đếm từ CSDL: một aggregate có điều kiện cho mỗi bảng"""
+    since = timezone.now() - NEW_WINDOW
+    stats = User.objects.aggregate(
+        total_users=Count('pk'),
+        new_users_30d=Count('pk', filter=Q(created_at__gte=since)),
+        **{name: Count('pk', filter=Q(user_type=user_type)) for user_type, name in USER_TYPE_STATS.items()},
+    )
+    stats.update(Complaint.objects.aggregate(
+        total_complaints=Count('pk'),
+        pending_complaints=Count('pk', filter=Q(status='pending')),
+        new_complaints_30d=Count('pk', filter=Q(created_at__gte=since)),
+    ))
+    return stats
+
+
+def rebuild():
+    stats = compute_stats()
+    cache.set_many({_stat_key(name): value for name, value in stats.items()}, None)
+    cache.set(BUILT_KEY, True, STATS_TIMEOUT)
+    return stats
+
+
+def get_stats():
+    """Các bộ đếm hiện tại (đọc cache, dựng lại khi snapshot hết hạn hoặc thiếu khóa)"""
+    if cache.get(BUILT_KEY):
+        values = cache.get_many([_stat_key(name) for name in STAT_NAMES])
+        if len(values) == len(STAT_NAMES):
+            return {name: values[_stat_key(name)] for name in STAT_NAMES}
+    return rebuild()
+
+
+def _incr_stats(changes):
+    for name, delta in changes.items():
+        if not delta:
+            continue
+        try:
+            cache.incr(_stat_key(name), delta)
+        except ValueError:
+            # Khóa không còn: lần đọc sau sẽ dựng lại toàn bộ snapshot
+            cache.delete(BUILT_KEY)
+
+
+def apply_changes(changes):
+    """
+    Cộng các độ thay đổi {tên bộ đếm: delta} vào snapshot (bỏ qua nếu chưa dựng),
+    chỉ khi giao dịch hiện tại commit: bản ghi bị rollback không làm lệch bộ đếm.
+    """
+    changes = {name: delta for name, delta in changes.items() if delta}
+    if changes:
+        transaction.on_commit(lambda: _incr_stats(changes))
+
+
+def invalidate(key):
+    """Xóa một danh sách gần đây khỏi cache sau khi giao dịch hiện tại commit"""
+    transaction.on_commit(lambda: cache.delete(key))
+
+
+def is_recent(created_at):
+    return created_at is not None and created_at >= timezone.now() - NEW_WINDOW
+
+
+def recent_complaints():
+    return get_or_build(
+        RECENT_COMPLAINTS_KEY,
+        lambda: list(Complaint.objects.select_related('user').order_by('-created_at')[:5]),
+        RECENT_TIMEOUT,
+    )
+
+
+def recent_activities():
+    return get_or_build(
+        RECENT_ACTIVITIES_KEY,
+        lambda: list(AdminActivity.objects.select_related('admin').order_by('-created_at')[:10]),
+        RECENT_TIMEOUT,
+    )
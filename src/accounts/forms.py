@@ -2,6 +2,7 @@ from django import forms
 from django.contrib.auth.forms import UserCreationForm, AuthenticationForm
 from django.contrib.auth import get_user_model
 from .models import UserProfile, Skill, Complaint
+from jobs.forms import SearchQueryField
 
 User = get_user_model()
 
@@ -209,3 +210,8 @@ class UserForm(forms.ModelForm):
         if phone_number and User.objects.filter(phone_number=phone_number).exclude(pk=self.instance.pk).exists():
             raise forms.ValidationError('Số điện thoại này đã được sử dụng. Vui lòng chọn số khác.')
         return phone_number
+
+
+class UserSearchForm(forms.Form):
+    """Form tìm người dùng trong trang quản trị (so khớp không dấu trên User.search_name)"""
+    search = SearchQueryField(required=False)
@@ -0,0 +1,51 @@
+# Generated by Django 5.2.6 on 2026-10-17 19:55
+
+from django.db import migrations, models
+
+BATCH_SIZE = 500
+
+
+def backfill_skill_cache(apps, schema_editor):
+    """Dựng bộ nhớ đệm kỹ năng cho các hồ sơ hiện có theo từng lô"""
+    UserProfile = apps.get_model('accounts', 'UserProfile')
+    Through = UserProfile.skills.through
+    last_id = 0
+    while True:
+        batch = list(UserProfile.objects.filter(pk__gt=last_id).order_by('pk')[:BATCH_SIZE])
+        if not batch:
+            break
+        skills_by_profile = {}
+        rows = Through.objects.filter(
+            userprofile_id__in=[profile.pk for profile in batch]
+        ).order_by('skill__name').values_list('userprofile_id', 'skill__name', 'skill__normalized_name')
+        for profile_id, name, normalized in rows:
+            skills_by_profile.setdefault(profile_id, []).append((name, normalized))
+        for profile in batch:
+            skills = skills_by_profile.get(profile.pk, [])
+            custom_list = [skill.strip() for skill in (profile.custom_skills or '').split(',') if skill.strip()]
+            profile.skill_names = [name for name, _ in skills] + custom_list
+            profile.normalized_skills = [normalized for _, normalized in skills] + \
+                [skill.lower() for skill in custom_list]
+        UserProfile.objects.bulk_update(batch, ['skill_names', 'normalized_skills'])
+        last_id = batch[-1].pk
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0004_alter_user_email_alter_user_phone_number'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='userprofile',
+            name='normalized_skills',
+            field=models.JSONField(blank=True, default=list, editable=False, help_text='Kỹ năng đã chuẩn hóa (tự động)'),
+        ),
+        migrations.AddField(
+            model_name='userprofile',
+            name='skill_names',
+            field=models.JSONField(blank=True, default=list, editable=False, help_text='Tên kỹ năng hiển thị (tự động)'),
+        ),
+        migrations.RunPython(backfill_skill_cache, migrations.RunPython.noop),
+    ]
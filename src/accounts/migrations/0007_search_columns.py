@@ -0,0 +1,52 @@
+# Generated by Django 5.2.6 on 2026-10-17 20:08
+
+import re
+import unicodedata
+
+from django.db import migrations, models
+
+BATCH_SIZE = 500
+SEARCH_NAME_FIELDS = ('first_name', 'last_name', 'username', 'email')
+
+
+# Bản sao cố định của jobs.text.fold_words tại thời điểm viết migration
+_NON_WORD = re.compile(r'[^\w]+')
+
+
+def fold_words(text):
+    if not text:
+        return ''
+    text = text.lower().replace('đ', 'd')
+    text = unicodedata.normalize('NFD', text)
+    text = ''.join(char for char in text if not unicodedata.combining(char))
+    return ' '.join(_NON_WORD.sub(' ', text).replace('_', ' ').split())
+
+
+def backfill_search_name(apps, schema_editor):
+    """Ghi cột search_name (bỏ dấu) cho người dùng hiện có theo từng lô"""
+    User = apps.get_model('accounts', 'User')
+    last_id = 0
+    while True:
+        batch = list(User.objects.filter(pk__gt=last_id).order_by('pk').only('pk', *SEARCH_NAME_FIELDS)[:BATCH_SIZE])
+        if not batch:
+            break
+        for row in batch:
+            row.search_name = fold_words(' '.join(getattr(row, field) or '' for field in SEARCH_NAME_FIELDS))
+        User.objects.bulk_update(batch, ['search_name'])
+        last_id = batch[-1].pk
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0006_location_ids'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='search_name',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=500),
+        ),
+        migrations.RunPython(backfill_search_name, migrations.RunPython.noop),
+    ]
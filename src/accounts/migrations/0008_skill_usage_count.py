@@ -0,0 +1,34 @@
+# Generated by Django 5.2.6 on 2026-10-17 20:13
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def backfill_usage_counts(apps, schema_editor):
+    """Đếm số hồ sơ của từng kỹ năng bằng một truy vấn GROUP BY trên bảng liên kết"""
+    Skill = apps.get_model('accounts', 'Skill')
+    UserProfile = apps.get_model('accounts', 'UserProfile')
+    counts = dict(
+        UserProfile.skills.through.objects.order_by().values('skill_id')
+        .annotate(total=Count('pk')).values_list('skill_id', 'total')
+    )
+    skills = list(Skill.objects.filter(pk__in=counts).only('pk'))
+    for skill in skills:
+        skill.usage_count = counts[skill.pk]
+    Skill.objects.bulk_update(skills, ['usage_count'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0007_search_columns'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='skill',
+            name='usage_count',
+            field=models.PositiveIntegerField(db_index=True, default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_usage_counts, migrations.RunPython.noop),
+    ]
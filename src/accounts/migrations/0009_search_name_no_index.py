@@ -0,0 +1,18 @@
+# Generated by Django 5.2.6 on 2026-10-17 20:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0008_skill_usage_count'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='user',
+            name='search_name',
+            field=models.CharField(blank=True, editable=False, max_length=500),
+        ),
+    ]
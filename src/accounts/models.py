@@ -1,6 +1,12 @@
 from django.contrib.auth.models import AbstractUser
 from django.db import models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
 from django.utils import timezone
+from django.utils.functional import cached_property
+
+from jobs.locations import resolve as resolve_location
+from jobs.text import fold_words
 
 class Skill(models.Model):
     """
@@ -10,6 +16,8 @@ class Skill(models.Model):
     normalized_name = models.CharField(max_length=100, unique=True, help_text='Tên chuẩn hóa')
     category = models.CharField(max_length=50, blank=True, help_text='Danh mục kỹ năng')
     is_active = models.BooleanField(default=True)
+    # Số hồ sơ đang chọn kỹ năng này, cập nhật qua signals (accounts.signals)
+    usage_count = models.PositiveIntegerField(default=0, editable=False, db_index=True)
     created_at = models.DateTimeField(auto_now_add=True)
     
     class Meta:
@@ -22,6 +30,18 @@ class Skill(models.Model):
         self.normalized_name = self.name.lower().strip()
         super().save(*args, **kwargs)
     
+    @classmethod
+    def refresh_usage_counts(cls, skill_ids):
+        """Đếm lại usage_count của các kỹ năng (một UPDATE, đếm trên chỉ mục skill_id)"""
+        skill_ids = list(skill_ids)
+        if not skill_ids:
+            return 0
+        through = UserProfile.skills.through
+        usage = through.objects.filter(skill_id=OuterRef('pk')).order_by().values('skill_id').annotate(
+            total=Count('pk')
+        ).values('total')
+        return cls.objects.filter(pk__in=skill_ids).update(usage_count=Coalesce(Subquery(usage), 0))
+    
     def __str__(self):
         return self.name
 
@@ -41,7 +61,12 @@ class User(AbstractUser):
                                    help_text='Mỗi số điện thoại chỉ được đăng ký 1 tài khoản')
     date_of_birth = models.DateField(blank=True, null=True)
     address = models.TextField(blank=True, null=True)
+    # Mã tỉnh/thành và quận/huyện (GSO) chuẩn hóa từ address khi lưu
+    province_id = models.PositiveSmallIntegerField(null=True, blank=True, editable=False, db_index=True)
+    district_id = models.PositiveSmallIntegerField(null=True, blank=True, editable=False, db_index=True)
     avatar = models.ImageField(upload_to='avatars/', blank=True, null=True)
+    # Họ tên, username, email bỏ dấu và chữ thường (jobs.text.fold_words), dùng cho tìm kiếm
+    search_name = models.CharField(max_length=500, blank=True, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     is_verified = models.BooleanField(default=False, help_text='Tài khoản đã xác thực')
@@ -49,6 +74,13 @@ class User(AbstractUser):
     def __str__(self):
         return f"{self.username} ({self.get_user_type_display()})"
     
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Ghi nhớ user_type lúc tải để signals thống kê biết loại tài khoản đã đổi"""
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_user_type = dict(zip(field_names, values)).get('user_type')
+        return instance
+    
     def get_accepted_applications_count(self):
         """Đếm số đơn ứng tuyển được chấp nhận"""
         return self.job_applications.filter(status='accepted').count()
@@ -60,6 +92,26 @@ class User(AbstractUser):
     def is_admin(self):
         """Kiểm tra có phải admin không"""
         return self.user_type == 'admin' or self.is_superuser
+    
+    SEARCH_NAME_FIELDS = ('first_name', 'last_name', 'username', 'email')
+    
+    def get_search_name(self):
+        """Họ tên, username, email bỏ dấu: "Đỗ Hùng" -> "do hung" """
+        return fold_words(' '.join(getattr(self, field) or '' for field in self.SEARCH_NAME_FIELDS))
+    
+    def save(self, *args, **kwargs):
+        """Chuẩn hóa địa chỉ thành mã tỉnh/quận và cập nhật cột tìm kiếm trước khi lưu"""
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or 'address' in update_fields:
+            self.province_id, self.district_id = resolve_location(self.address)
+            if update_fields is not None:
+                kwargs['update_fields'] = set(update_fields) | {'province_id', 'district_id'}
+        if update_fields is None or set(self.SEARCH_NAME_FIELDS) & set(update_fields):
+            self.search_name = self.get_search_name()
+            if update_fields is not None:
+                kwargs['update_fields'] = set(kwargs['update_fields']) | {'search_name'}
+        super().save(*args, **kwargs)
+        self._loaded_user_type = self.user_type
 
 class UserProfile(models.Model):
     """
@@ -74,33 +126,87 @@ class UserProfile(models.Model):
                                      help_text='Mức lương theo giờ (VND)')
     availability = models.TextField(blank=True, help_text='Thời gian có thể làm việc')
     is_available = models.BooleanField(default=True, help_text='Đang tìm việc')
+    # Bộ nhớ đệm kỹ năng (skills + custom_skills), dựng lại khi lưu hồ sơ và khi
+    # quan hệ skills thay đổi (m2m_changed) để đọc hàng loạt không cần truy vấn thêm
+    skill_names = models.JSONField(default=list, blank=True, editable=False,
+                                   help_text='Tên kỹ năng hiển thị (tự động)')
+    normalized_skills = models.JSONField(default=list, blank=True, editable=False,
+                                         help_text='Kỹ năng đã chuẩn hóa (tự động)')
+    
+    SKILL_CACHE_FIELDS = ('skill_names', 'normalized_skills')
+    # Các trường quyết định feed "Việc làm cho bạn" của worker
+    MATCH_FIELDS = ('normalized_skills', 'is_available')
     
     def __str__(self):
         return f"Profile của {self.user.username}"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Ghi nhớ các trường so khớp lúc tải để signals biết feed có cần tính lại không"""
+        instance = super().from_db(db, field_names, values)
+        loaded = dict(zip(field_names, values))
+        instance._loaded_match_values = tuple(loaded.get(field) for field in cls.MATCH_FIELDS)
+        return instance
+
+    def match_fields_changed(self):
+        """Kỹ năng đã chuẩn hóa hoặc trạng thái tìm việc khác lúc tải (luôn đúng với hồ sơ mới)"""
+        loaded = getattr(self, '_loaded_match_values', None)
+        return loaded != tuple(getattr(self, field) for field in self.MATCH_FIELDS)
+
+    def set_skill_cache(self, skills):
+        """Dựng bộ nhớ đệm từ các cặp (name, normalized_name) của skills và custom_skills"""
+        custom_list = [skill.strip() for skill in self.custom_skills.split(',') if skill.strip()] \
+            if self.custom_skills else []
+        self.skill_names = [name for name, _ in skills] + custom_list
+        self.normalized_skills = [normalized for _, normalized in skills] + \
+            [skill.lower() for skill in custom_list]
+        self.__dict__.pop('skill_set', None)
+    
+    def refresh_skill_cache(self):
+        """Đọc lại skills từ CSDL và dựng bộ nhớ đệm (chưa lưu)"""
+        skills = list(self.skills.values_list('name', 'normalized_name')) if self.pk else []
+        self.set_skill_cache(skills)
+    
+    @classmethod
+    def rebuild_skill_caches(cls, profile_ids, batch_size=500):
+        """Dựng lại và lưu bộ nhớ đệm kỹ năng của nhiều hồ sơ (2 truy vấn đọc cho cả lô)"""
+        profiles = list(cls.objects.filter(pk__in=profile_ids).only('pk', 'custom_skills'))
+        if not profiles:
+            return 0
+        skills_by_profile = {}
+        rows = cls.skills.through.objects.filter(
+            userprofile_id__in=[profile.pk for profile in profiles]
+        ).order_by('skill__name').values_list('userprofile_id', 'skill__name', 'skill__normalized_name')
+        for profile_id, name, normalized in rows:
+            skills_by_profile.setdefault(profile_id, []).append((name, normalized))
+        for profile in profiles:
+            profile.set_skill_cache(skills_by_profile.get(profile.pk, []))
+        cls.objects.bulk_update(profiles, cls.SKILL_CACHE_FIELDS, batch_size=batch_size)
+        return len(profiles)
+    
+    @cached_property
+    def skill_set(self):
+        """Tập kỹ năng đã chuẩn hóa (frozenset) để so khớp nhanh"""
+        return frozenset(self.normalized_skills)
+    
     def get_skills_list(self):
         """Trả về danh sách kỹ năng dưới dạng list"""
-        skills_list = []
-        # Thêm skills có sẵn
-        for skill in self.skills.all():
-            skills_list.append(skill.name)
-        # Thêm custom skills
-        if self.custom_skills:
-            custom_list = [skill.strip() for skill in self.custom_skills.split(',') if skill.strip()]
-            skills_list.extend(custom_list)
-        return skills_list
+        return list(self.skill_names)
     
     def get_all_skills_normalized(self):
         """Trả về danh sách skills đã chuẩn hóa để tìm kiếm"""
-        skills_list = []
-        # Thêm skills có sẵn (đã chuẩn hóa)
-        for skill in self.skills.all():
-            skills_list.append(skill.normalized_name)
-        # Thêm custom skills (chuẩn hóa)
-        if self.custom_skills:
-            custom_list = [skill.lower().strip() for skill in self.custom_skills.split(',') if skill.strip()]
-            skills_list.extend(custom_list)
-        return skills_list
+        return list(self.normalized_skills)
+    
+    def save(self, *args, **kwargs):
+        """Dựng lại bộ nhớ đệm kỹ năng trước khi lưu"""
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or 'custom_skills' in update_fields:
+            self.refresh_skill_cache()
+            if update_fields is not None:
+                kwargs['update_fields'] = set(update_fields) | set(self.SKILL_CACHE_FIELDS)
+        super().save(*args, **kwargs)
+        # Signals đã xử lý xong, cập nhật giá trị đã lưu
+        self._loaded_match_values = tuple(getattr(self, field) for field in self.MATCH_FIELDS)
 
 class Complaint(models.Model):
     """
@@ -138,6 +244,17 @@ class Complaint(models.Model):
     
     def __str__(self):
         return f"{self.title} - {self.user.username}"
+    
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_status = dict(zip(field_names, values)).get('status')
+        return instance
+    
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        # Signals đã xử lý xong, cập nhật trạng thái đã lưu
+        self._loaded_status = self.status
 
 class AdminActivity(models.Model):
     """
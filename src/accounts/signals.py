@@ -0,0 +1,131 @@
+from collections import Counter
+
+from django.db.models.signals import m2m_changed, post_save, pre_delete, post_delete
+from django.dispatch import receiver
+
+from . import dashboard
+from .models import AdminActivity, Complaint, Skill, User, UserProfile
+
+
+@receiver(m2m_changed, sender=UserProfile.skills.through)
+def rebuild_profile_skill_cache(sender, instance, action, reverse, pk_set, **kwargs):
+    """Quan hệ skills của hồ sơ thay đổi: dựng lại bộ nhớ đệm kỹ năng"""
+    if action == 'pre_clear' and reverse:
+        # skill.userprofile_set.clear(): ghi nhớ các hồ sơ trước khi mất liên kết
+        instance._skill_cache_profile_ids = list(
+            sender.objects.filter(skill_id=instance.pk).values_list('userprofile_id', flat=True)
+        )
+        return
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if not reverse:
+        UserProfile.rebuild_skill_caches([instance.pk])
+    elif action == 'post_clear':
+        UserProfile.rebuild_skill_caches(getattr(instance, '_skill_cache_profile_ids', []))
+    elif pk_set:
+        UserProfile.rebuild_skill_caches(pk_set)
+
+
+@receiver(post_save, sender=Skill)
+def rebuild_skill_caches_on_rename(sender, instance, created, **kwargs):
+    """Tên kỹ năng thay đổi: cập nhật các hồ sơ đang dùng kỹ năng này"""
+    if not created:
+        UserProfile.rebuild_skill_caches(instance.userprofile_set.values_list('pk', flat=True))
+
+
+@receiver(pre_delete, sender=Skill)
+def remember_skill_profiles(sender, instance, **kwargs):
+    instance._skill_cache_profile_ids = list(instance.userprofile_set.values_list('pk', flat=True))
+
+
+@receiver(post_delete, sender=Skill)
+def rebuild_skill_caches_on_delete(sender, instance, **kwargs):
+    """Kỹ năng bị xóa (liên kết bị xóa theo cascade, không gửi m2m_changed)"""
+    UserProfile.rebuild_skill_caches(getattr(instance, '_skill_cache_profile_ids', []))
+
+
+@receiver(m2m_changed, sender=UserProfile.skills.through)
+def update_skill_usage_counts(sender, instance, action, reverse, pk_set, **kwargs):
+    """Đếm lại usage_count của các kỹ năng vừa được thêm/bỏ khỏi hồ sơ"""
+    if action == 'pre_clear' and not reverse:
+        instance._usage_skill_ids = list(instance.skills.values_list('pk', flat=True))
+        return
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if reverse:
+        Skill.refresh_usage_counts([instance.pk])
+    elif action == 'post_clear':
+        Skill.refresh_usage_counts(getattr(instance, '_usage_skill_ids', []))
+    else:
+        Skill.refresh_usage_counts(pk_set or [])
+
+
+@receiver(pre_delete, sender=UserProfile)
+def remember_profile_skills(sender, instance, **kwargs):
+    instance._usage_skill_ids = list(instance.skills.values_list('pk', flat=True))
+
+
+@receiver(post_delete, sender=UserProfile)
+def update_skill_usage_counts_on_delete(sender, instance, **kwargs):
+    """Hồ sơ bị xóa (liên kết bị xóa theo cascade, không gửi m2m_changed)"""
+    Skill.refresh_usage_counts(getattr(instance, '_usage_skill_ids', []))
+
+
+@receiver(post_save, sender=User)
+def update_dashboard_user_stats(sender, instance, created, **kwargs):
+    changes = Counter()
+    if created:
+        changes['total_users'] += 1
+        changes['new_users_30d'] += 1
+    else:
+        old_type = getattr(instance, '_loaded_user_type', instance.user_type)
+        if old_type == instance.user_type:
+            return
+        if old_type in dashboard.USER_TYPE_STATS:
+            changes[dashboard.USER_TYPE_STATS[old_type]] -= 1
+    if instance.user_type in dashboard.USER_TYPE_STATS:
+        changes[dashboard.USER_TYPE_STATS[instance.user_type]] += 1
+    dashboard.apply_changes(changes)
+
+
+@receiver(post_delete, sender=User)
+def update_dashboard_user_stats_on_delete(sender, instance, **kwargs):
+    changes = Counter(total_users=-1)
+    if dashboard.is_recent(instance.created_at):
+        changes['new_users_30d'] -= 1
+    if instance.user_type in dashboard.USER_TYPE_STATS:
+        changes[dashboard.USER_TYPE_STATS[instance.user_type]] -= 1
+    dashboard.apply_changes(changes)
+
+
+@receiver(post_save, sender=Complaint)
+def update_dashboard_complaint_stats(sender, instance, created, **kwargs):
+    changes = Counter()
+    if created:
+        changes['total_complaints'] += 1
+        changes['new_complaints_30d'] += 1
+        old_status = None
+    else:
+        old_status = getattr(instance, '_loaded_status', instance.status)
+    if (old_status == 'pending') != (instance.status == 'pending'):
+        changes['pending_complaints'] += 1 if instance.status == 'pending' else -1
+    dashboard.apply_changes(changes)
+    # Danh sách gần đây hiển thị tiêu đề và trạng thái
+    dashboard.invalidate(dashboard.RECENT_COMPLAINTS_KEY)
+
+
+@receiver(post_delete, sender=Complaint)
+def update_dashboard_complaint_stats_on_delete(sender, instance, **kwargs):
+    changes = Counter(total_complaints=-1)
+    if dashboard.is_recent(instance.created_at):
+        changes['new_complaints_30d'] -= 1
+    if instance.status == 'pending':
+        changes['pending_complaints'] -= 1
+    dashboard.apply_changes(changes)
+    dashboard.invalidate(dashboard.RECENT_COMPLAINTS_KEY)
+
+
+@receiver(post_save, sender=AdminActivity)
+@receiver(post_delete, sender=AdminActivity)
+def invalidate_recent_activities(sender, **kwargs):
+    dashboard.invalidate(dashboard.RECENT_ACTIVITIES_KEY)
@@ -4,12 +4,13 @@ from django.contrib.auth.decorators import login_required, user_passes_test
 from django.contrib import messages
 from django.views.generic import CreateView
 from django.urls import reverse_lazy
-from django.db.models import Count, Q
 from django.utils import timezone
-from datetime import datetime, timedelta
+from datetime import datetime
 from .forms import (CustomUserCreationForm, UserProfileForm, AdminComplaintForm, 
-                  CustomAuthenticationForm, UserForm)
+                  CustomAuthenticationForm, UserForm, UserSearchForm)
 from .models import UserProfile, Skill, Complaint, AdminActivity, User
+from jobs import result_cache
+from . import dashboard
 
 def is_admin(user):
     """Kiểm tra user có phải admin không"""
@@ -92,40 +93,19 @@ def profile_view(request):
 @user_passes_test(is_admin)
 def admin_dashboard(request):
     """Dashboard chính cho admin"""
-    # Thống kê tổng quan
-    total_users = User.objects.count()
-    total_workers = User.objects.filter(user_type='worker').count()
-    total_employers = User.objects.filter(user_type='employer').count()
-    total_complaints = Complaint.objects.count()
-    pending_complaints = Complaint.objects.filter(status='pending').count()
+    # Thống kê tổng quan và 30 ngày qua: đọc từ snapshot trong cache
+    stats = dashboard.get_stats()
     
-    # Thống kê theo thời gian (30 ngày qua)
-    thirty_days_ago = timezone.now() - timedelta(days=30)
-    new_users_30d = User.objects.filter(created_at__gte=thirty_days_ago).count()
-    new_complaints_30d = Complaint.objects.filter(created_at__gte=thirty_days_ago).count()
-    
-    # Top skills được sử dụng nhiều nhất
-    top_skills = Skill.objects.annotate(
-        usage_count=Count('userprofile')
-    ).order_by('-usage_count')[:10]
-    
-    # Khiếu nại mới nhất
-    recent_complaints = Complaint.objects.select_related('user').order_by('-created_at')[:5]
-    
-    # Hoạt động admin gần đây
-    recent_activities = AdminActivity.objects.select_related('admin').order_by('-created_at')[:10]
+    # Top skills được sử dụng nhiều nhất (bộ đếm usage_count có chỉ mục)
+    top_skills = Skill.objects.order_by('-usage_count')[:10]
     
     context = {
-        'total_users': total_users,
-        'total_workers': total_workers,
-        'total_employers': total_employers,
-        'total_complaints': total_complaints,
-        'pending_complaints': pending_complaints,
-        'new_users_30d': new_users_30d,
-        'new_complaints_30d': new_complaints_30d,
+        **stats,
         'top_skills': top_skills,
-        'recent_complaints': recent_complaints,
-        'recent_activities': recent_activities,
+        # Khiếu nại mới nhất và hoạt động admin gần đây
+        'recent_complaints': dashboard.recent_complaints(),
+        'recent_activities': dashboard.recent_activities(),
+        'search_cache': result_cache.stats(),
     }
     return render(request, 'accounts/admin_dashboard.html', context)
 
@@ -249,13 +229,10 @@ def admin_user_management(request):
     if user_type_filter != 'all':
         users = users.filter(user_type=user_type_filter)
     
-    if search_query:
-        users = users.filter(
-            Q(username__icontains=search_query) |
-            Q(email__icontains=search_query) |
-            Q(first_name__icontains=search_query) |
-            Q(last_name__icontains=search_query)
-        )
+    search_form = UserSearchForm(request.GET)
+    if search_form.is_valid() and search_form.cleaned_data['search']:
+        # Một điều kiện LIKE trên cột search_name (bỏ dấu) thay vì bốn cột của bảng user
+        users = users.filter(search_name__contains=search_form.cleaned_data['search'])
     
     users = users.order_by('-date_joined')
     
@@ -321,17 +298,32 @@ def admin_user_detail(request, user_id):
     }
     return render(request, 'accounts/admin_user_detail.html', context)
 
+# Thời gian sống tối đa của dữ liệu trang chủ trong cache (giây)
+HOME_CACHE_TIMEOUT = 300
+
 def home_view(request):
     """View trang chủ"""
-    from jobs.models import JobPost, JobCategory
+    from jobs.models import JobPost
+    from jobs.caching import get_generation, get_or_build
+    from jobs.categories import category_registry
+    
+    def load_recent_jobs():
+        # Lấy các job mới nhất, chỉ lấy những trường cần thiết
+        return list(JobPost.objects.filter(status='published').select_related('category').values(
+            'id', 'title', 'description', 'location', 'work_date', 'work_time_start', 'work_time_end',
+            'payment_type', 'payment_amount', 'created_at', 'category__name'
+        ).order_by('-created_at')[:6])
     
-    # Lấy các job mới nhất, chỉ lấy những trường cần thiết
-    recent_jobs = JobPost.objects.filter(status='published').select_related('category').values(
-        'id', 'title', 'description', 'location', 'work_date', 'work_time_start', 'work_time_end',
-        'payment_type', 'payment_amount', 'created_at', 'category__name'
-    ).order_by('-created_at')[:6]
+    # Cache theo thế hệ 'jobs' (tăng khi bài đăng công khai/danh mục thay đổi),
+    # trong lúc dựng lại các request khác dùng bản cũ thay vì cùng truy vấn
+    recent_jobs = get_or_build(
+        f"home:recent_jobs:{get_generation('jobs')}",
+        load_recent_jobs,
+        timeout=HOME_CACHE_TIMEOUT,
+        stale_key='home:recent_jobs:last',
+    )
     # Lấy các categories
-    categories = JobCategory.objects.filter(is_active=True)
+    categories = category_registry.active()
     
     context = {
         'recent_jobs': recent_jobs,
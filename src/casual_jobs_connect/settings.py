@@ -83,6 +83,21 @@ DATABASES = {
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/4.2/topics/cache/
+# Môi trường production nhiều tiến trình nên dùng cache dùng chung (Redis/Memcached)
+# để việc vô hiệu hóa cache (danh mục, trang chủ) có hiệu lực trên mọi tiến trình.
+# Bắt buộc với snapshot số liệu bảng điều khiển admin (accounts.dashboard): các bộ đếm
+# được cộng dồn bằng cache.incr, LocMemCache giữ một bản riêng cho mỗi tiến trình.
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'casual-jobs',
+    }
+}
+
+
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
 
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import JobCategory, JobPost, JobApplication
+from .models import JobCategory, JobPost, JobApplication, JobSkillTag, ExpiryRun
 
 @admin.register(JobCategory)
 class JobCategoryAdmin(admin.ModelAdmin):
@@ -22,30 +22,37 @@ class JobCategoryAdmin(admin.ModelAdmin):
 @admin.register(JobPost)
 class JobPostAdmin(admin.ModelAdmin):
     """Admin configuration cho JobPost"""
-    list_display = ('title', 'employer', 'category', 'location', 'work_date', 'payment_amount', 'status', 'priority', 'created_at')
+    list_display = ('title', 'employer', 'category', 'location', 'work_date', 'payment_amount', 'status', 'priority', 'applications_count', 'created_at')
     list_filter = ('status', 'priority', 'category', 'payment_type', 'work_date', 'created_at')
     search_fields = ('title', 'description', 'location', 'employer__username', 'required_skills')
     ordering = ('-created_at',)
-    readonly_fields = ('created_at', 'updated_at')
+    readonly_fields = ('created_at', 'updated_at', 'start_at', 'end_at', 'province_id', 'district_id',
+                       'skills_indexed', 'applications_count',
+                       'pending_applications_count', 'accepted_applications_count', 'rejected_applications_count')
     
     fieldsets = (
         ('Thông tin cơ bản', {
             'fields': ('title', 'description', 'employer', 'category', 'status', 'priority')
         }),
         ('Địa điểm và thời gian', {
-            'fields': ('location', 'work_date', 'work_time_start', 'work_time_end', 'duration_hours')
+            'fields': ('location', 'province_id', 'district_id', 'work_date', 'work_time_start',
+                       'work_time_end', 'duration_hours')
         }),
         ('Lương và thanh toán', {
             'fields': ('payment_type', 'payment_amount')
         }),
         ('Yêu cầu công việc', {
-            'fields': ('required_skills', 'number_of_workers')
+            'fields': ('required_skills', 'skills_indexed', 'number_of_workers')
+        }),
+        ('Đơn ứng tuyển', {
+            'fields': ('applications_count', 'pending_applications_count',
+                       'accepted_applications_count', 'rejected_applications_count'),
         }),
         ('Thông tin liên hệ', {
             'fields': ('contact_phone', 'contact_email', 'application_deadline')
         }),
         ('Thời gian hệ thống', {
-            'fields': ('created_at', 'updated_at'),
+            'fields': ('created_at', 'updated_at', 'start_at', 'end_at'),
             'classes': ('collapse',)
         }),
     )
@@ -80,6 +87,30 @@ class JobApplicationAdmin(admin.ModelAdmin):
         qs = super().get_queryset(request)
         return qs.select_related('applicant', 'job', 'job__category')
 
+@admin.register(JobSkillTag)
+class JobSkillTagAdmin(admin.ModelAdmin):
+    """Admin configuration cho JobSkillTag"""
+    list_display = ('name', 'job')
+    search_fields = ('name', 'job__title')
+    ordering = ('name',)
+    
+    def get_queryset(self, request):
+        qs = super().get_queryset(request)
+        return qs.select_related('job', 'job__category')
+
+@admin.register(ExpiryRun)
+class ExpiryRunAdmin(admin.ModelAdmin):
+    """Admin configuration cho ExpiryRun (chỉ xem)"""
+    list_display = ('cutoff', 'incremental', 'rows_scanned', 'rows_closed', 'elapsed_ms')
+    list_filter = ('incremental',)
+    ordering = ('-cutoff',)
+    
+    def has_add_permission(self, request):
+        return False
+    
+    def has_change_permission(self, request, obj=None):
+        return False
+
 # Tùy chỉnh Django Admin interface
 admin.site.site_header = 'CasualJobs Admin'
 admin.site.site_title = 'CasualJobs Admin'
@@ -0,0 +1,62 @@
+import time
+
+from django.core.cache import cache
+
+_MISSING = object()
+
+
+def get_generation(name):
+    """Số thế hệ hiện tại của một nhóm dữ liệu (dùng để tạo khóa cache)"""
+    key = f'generation:{name}'
+    generation = cache.get(key)
+    if generation is None:
+        cache.add(key, 1, None)
+        generation = cache.get(key, 1)
+    return generation
+
+
+def bump_generation(name):
+    """Tăng thế hệ: mọi khóa cache được tạo từ thế hệ cũ coi như hết hiệu lực"""
+    key = f'generation:{name}'
+    try:
+        return cache.incr(key)
+    except ValueError:
+        cache.add(key, 1, None)
+        return cache.incr(key)
+
+
+def get_or_build(key, builder, timeout=300, stale_key=None, lock_timeout=30, wait=2.0):
+    """
+    Lấy giá trị từ cache, nếu thiếu thì dựng lại với chống "cache stampede".
+
+    Chỉ request giành được khóa (`cache.add`) mới gọi `builder()`. Các request
+    khác trả về bản cũ ở `stale_key` nếu có, hoặc chờ tối đa `wait` giây để
+    bản mới xuất hiện; quá thời gian chờ thì tự dựng để không treo request.
+    """
+    value = cache.get(key, _MISSING)
+    if value is not _MISSING:
+        return value
+
+    lock_key = f'{key}:lock'
+    if cache.add(lock_key, 1, lock_timeout):
+        try:
+            value = builder()
+            cache.set(key, value, timeout)
+            if stale_key:
+                cache.set(stale_key, value, None)
+            return value
+        finally:
+            cache.delete(lock_key)
+
+    if stale_key:
+        value = cache.get(stale_key, _MISSING)
+        if value is not _MISSING:
+            return value
+
+    deadline = time.monotonic() + wait
+    while time.monotonic() < deadline:
+        time.sleep(0.05)
+        value = cache.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+    return builder()
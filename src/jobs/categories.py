@@ -0,0 +1,67 @@
+import threading
+import uuid
+
+from django.core.cache import cache
+
+VERSION_CACHE_KEY = 'jobs:categories:version'
+
+
+class CategoryRegistry:
+    """
+    Bộ nhớ đệm JobCategory dùng chung trong tiến trình.
+
+    Mỗi tiến trình giữ một bản sao danh mục kèm phiên bản; phiên bản hiện hành
+    nằm trong Django cache nên khi signal của JobCategory gọi `invalidate()`
+    mọi tiến trình dùng chung cache sẽ tải lại ở lần đọc kế tiếp.
+    Các đối tượng trả về được dùng chung giữa các request, chỉ được đọc.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._version = None
+        self._by_id = {}
+        self._ordered = []
+
+    def _current_version(self):
+        version = cache.get(VERSION_CACHE_KEY)
+        if version is None:
+            cache.add(VERSION_CACHE_KEY, uuid.uuid4().hex, None)
+            version = cache.get(VERSION_CACHE_KEY)
+        return version
+
+    def _ensure_loaded(self):
+        version = self._current_version()
+        if version == self._version:
+            return
+        from .models import JobCategory
+
+        with self._lock:
+            if version == self._version:
+                return
+            ordered = list(JobCategory.objects.all())
+            self._by_id = {category.pk: category for category in ordered}
+            self._ordered = ordered
+            self._version = version
+
+    def all(self):
+        """Tất cả danh mục, sắp xếp theo tên"""
+        self._ensure_loaded()
+        return list(self._ordered)
+
+    def active(self):
+        """Các danh mục đang hoạt động, sắp xếp theo tên"""
+        self._ensure_loaded()
+        return [category for category in self._ordered if category.is_active]
+
+    def get(self, pk):
+        """Lấy danh mục theo id, trả về None nếu không có"""
+        self._ensure_loaded()
+        return self._by_id.get(pk)
+
+    def invalidate(self):
+        """Đổi phiên bản để mọi tiến trình tải lại danh mục"""
+        cache.set(VERSION_CACHE_KEY, uuid.uuid4().hex, None)
+        self._version = None
+
+
+category_registry = CategoryRegistry()
@@ -0,0 +1,171 @@
+import datetime
+import heapq
+import time
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import ExpiryRun, JobPost
+from .signals import jobs_closed
+
+
+# Số ngày giữ nhật ký ExpiryRun (lần chạy gần nhất luôn được giữ làm mốc incremental)
+RUN_RETENTION = datetime.timedelta(days=getattr(settings, 'JOB_EXPIRY_RUN_RETENTION_DAYS', 7))
+# Lùi mốc updated_at một chút để không bỏ sót giao dịch commit muộn
+UPDATED_OVERLAP = datetime.timedelta(seconds=5)
+
+
+@dataclass
+class ExpiryStats:
+    """Thống kê của một lần đóng job quá hạn"""
+    rows_scanned: int = 0
+    rows_closed: int = 0
+    elapsed_ms: int = 0
+
+
+def close_jobs(job_ids, now=None):
+    """
+    Đóng (một lệnh UPDATE) các job trong `job_ids` vẫn còn 'published' và đã đến giờ bắt đầu.
+    Trả về số dòng đã đóng; gửi signal `jobs_closed` cho các nơi giữ dữ liệu dẫn xuất.
+    """
+    if not job_ids:
+        return 0
+    now = now or timezone.now()
+    with transaction.atomic():
+        # Khóa và lấy đúng các job sẽ đóng để signal chỉ mang các job thực sự đổi trạng thái
+        closing = list(JobPost.objects.select_for_update().filter(
+            pk__in=job_ids, status='published', start_at__lte=now
+        ).values_list('pk', flat=True))
+        if not closing:
+            return 0
+        closed = JobPost.objects.filter(pk__in=closing).update(status='closed', updated_at=now)
+        transaction.on_commit(
+            lambda: jobs_closed.send(sender=JobPost, job_ids=closing)
+        )
+    return closed
+
+
+def close_expired_jobs(now=None, since=None, batch_size=500, dry_run=False):
+    """
+    Đóng mọi job 'published' có start_at <= now, theo từng lô `batch_size` dòng.
+
+    Mỗi lô là một truy vấn range trên chỉ mục (status, start_at) và một lệnh
+    UPDATE theo danh sách id. `since` (mốc của lần chạy trước, chế độ incremental)
+    giới hạn vào các job bắt đầu sau mốc đó hoặc được tạo/sửa/đăng lại sau mốc đó
+    (theo updated_at): job đăng muộn với start_at đã qua không bị bỏ sót.
+    `dry_run` chỉ đếm, không ghi.
+    """
+    started = time.perf_counter()
+    now = now or timezone.now()
+    stats = ExpiryStats()
+
+    candidates = JobPost.objects.filter(status='published', start_at__lte=now)
+    if since is not None:
+        candidates = candidates.filter(
+            Q(start_at__gt=since) | Q(updated_at__gt=since - UPDATED_OVERLAP)
+        )
+    candidates = candidates.order_by('start_at', 'pk')
+
+    last = None
+    while True:
+        batch = candidates
+        if last is not None:
+            # Keyset theo (start_at, pk) để dry-run không đọc lại cùng một lô
+            batch = batch.filter(Q(start_at__gt=last[0]) | Q(start_at=last[0], pk__gt=last[1]))
+        rows = list(batch.values_list('start_at', 'pk')[:batch_size])
+        if not rows:
+            break
+        stats.rows_scanned += len(rows)
+        if not dry_run:
+            stats.rows_closed += close_jobs([pk for _, pk in rows], now=now)
+        last = rows[-1]
+
+    stats.elapsed_ms = int((time.perf_counter() - started) * 1000)
+    return stats
+
+
+def record_run(cutoff, stats, incremental=False):
+    """Ghi nhật ký một lần chạy và xóa các lần chạy cũ hơn RUN_RETENTION"""
+    run = ExpiryRun.objects.create(
+        cutoff=cutoff,
+        incremental=incremental,
+        rows_scanned=stats.rows_scanned,
+        rows_closed=stats.rows_closed,
+        elapsed_ms=stats.elapsed_ms,
+    )
+    ExpiryRun.objects.filter(cutoff__lt=cutoff - RUN_RETENTION).delete()
+    return run
+
+
+class ExpiryScheduler:
+    """
+    Lịch đóng job đúng giờ bắt đầu, giữ trong một min-heap (start_at, pk).
+
+    Heap chỉ chứa các job 'published' bắt đầu trong `horizon` tới nên luôn nhỏ.
+    `refresh()` đọc thêm các job mới tạo/sửa (theo updated_at) và nạp tiếp phần
+    cửa sổ thời gian mới; mục cũ trong heap không cần xóa vì `close_jobs()`
+    kiểm tra lại trạng thái và start_at trong CSDL trước khi đóng.
+    """
+
+    REFRESH_OVERLAP = UPDATED_OVERLAP
+
+    def __init__(self, horizon=datetime.timedelta(hours=6)):
+        self.horizon = horizon
+        self.heap = []
+        self.scheduled = {}
+        self.loaded_until = None
+        self.last_refresh = None
+
+    def _push(self, pk, start_at):
+        if self.scheduled.get(pk) == start_at:
+            return
+        self.scheduled[pk] = start_at
+        heapq.heappush(self.heap, (start_at, pk))
+
+    def load(self, now):
+        """Nạp lần đầu: đóng các job đã quá hạn rồi nạp cửa sổ [now, now + horizon]"""
+        stats = close_expired_jobs(now=now)
+        self.loaded_until = now
+        self.last_refresh = now
+        self._load_window(now)
+        return stats
+
+    def _load_window(self, now):
+        until = now + self.horizon
+        rows = JobPost.objects.filter(
+            status='published', start_at__gt=self.loaded_until, start_at__lte=until
+        ).values_list('pk', 'start_at')
+        for pk, start_at in rows:
+            self._push(pk, start_at)
+        self.loaded_until = until
+
+    def refresh(self, now):
+        """Nạp các job vừa tạo/sửa trong cửa sổ hiện tại và mở rộng cửa sổ theo thời gian"""
+        rows = JobPost.objects.filter(
+            status='published',
+            updated_at__gt=self.last_refresh - self.REFRESH_OVERLAP,
+            start_at__lte=self.loaded_until,
+        ).values_list('pk', 'start_at')
+        for pk, start_at in rows:
+            self._push(pk, start_at)
+        self.last_refresh = now
+        self._load_window(now)
+
+    def run_due(self, now):
+        """Lấy khỏi heap các job đã đến giờ và đóng chúng, trả về số job đã đóng"""
+        due = []
+        while self.heap and self.heap[0][0] <= now:
+            start_at, pk = heapq.heappop(self.heap)
+            if self.scheduled.get(pk) == start_at:
+                del self.scheduled[pk]
+            due.append(pk)
+        return close_jobs(due, now=now)
+
+    def seconds_until_next(self, now, max_wait):
+        """Số giây cần ngủ trước lần kiểm tra kế tiếp (không quá max_wait)"""
+        if not self.heap:
+            return max_wait
+        return max(0.0, min(max_wait, (self.heap[0][0] - now).total_seconds()))
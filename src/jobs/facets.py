@@ -0,0 +1,136 @@
+"""
+Đếm facet (danh mục, quận/huyện, khoảng lương, ngày làm việc) cho trang tìm việc.
+
+Khi có bộ lọc, các facet được tính trong một truy vấn GROUP BY duy nhất trên tập
+đã lọc rồi cộng dồn theo từng chiều. Trang danh sách không lọc đọc bảng
+JobFacetCount, được cập nhật tăng/giảm qua signals khi job vào/ra trạng thái
+'published' (xem jobs.signals) và có thể dựng lại bằng `rebuild_job_facets`.
+"""
+from collections import Counter, defaultdict
+
+from django.db import IntegrityError, transaction
+from django.db.models import Case, CharField, Count, F, Value, When
+
+from .models import JobFacetCount, JobPost
+
+# (khóa, nhãn, lương/giờ tối thiểu, lương/giờ tối đa) - khoảng [min, max)
+PAY_BUCKETS = (
+    ('lt25k', 'Dưới 25.000đ/giờ', None, 25000),
+    ('25-40k', '25.000 - 40.000đ/giờ', 25000, 40000),
+    ('40-60k', '40.000 - 60.000đ/giờ', 40000, 60000),
+    ('60-100k', '60.000 - 100.000đ/giờ', 60000, 100000),
+    ('gte100k', 'Từ 100.000đ/giờ', 100000, None),
+)
+
+DIMENSIONS = ('category', 'district', 'pay', 'date')
+
+
+def pay_bucket(hourly_equivalent):
+    """Khóa khoảng lương của một mức lương/giờ (None nếu chưa quy đổi được)"""
+    if hourly_equivalent is None:
+        return None
+    for key, _, low, high in PAY_BUCKETS:
+        if high is None or hourly_equivalent < high:
+            return key
+    return None
+
+
+def pay_bucket_expression():
+    """Biểu thức SQL tương đương pay_bucket() để GROUP BY trong CSDL"""
+    whens = [
+        When(hourly_equivalent__lt=high, then=Value(key))
+        for key, _, _, high in PAY_BUCKETS if high is not None
+    ]
+    last = PAY_BUCKETS[-1][0]
+    return Case(
+        *whens,
+        When(hourly_equivalent__isnull=False, then=Value(last)),
+        default=Value(None),
+        output_field=CharField(),
+    )
+
+
+def facet_keys(category_id, district_id, hourly_equivalent, work_date):
+    """Các cặp (chiều, giá trị) mà một job published được đếm vào"""
+    values = (
+        ('category', category_id),
+        ('district', district_id),
+        ('pay', pay_bucket(hourly_equivalent)),
+        ('date', work_date.isoformat() if work_date else None),
+    )
+    return [(dimension, str(value)) for dimension, value in values if value is not None]
+
+
+def compute_facets(queryset):
+    """Facet của một queryset JobPost đã lọc: một truy vấn GROUP BY, trả về {chiều: Counter}"""
+    rows = (
+        queryset.order_by()
+        .annotate(pay_bucket=pay_bucket_expression())
+        .values('category_id', 'district_id', 'pay_bucket', 'work_date')
+        .annotate(total=Count('pk'))
+    )
+    facets = defaultdict(Counter)
+    for row in rows:
+        values = (
+            ('category', row['category_id']),
+            ('district', row['district_id']),
+            ('pay', row['pay_bucket']),
+            ('date', row['work_date'].isoformat() if row['work_date'] else None),
+        )
+        for dimension, value in values:
+            if value is not None:
+                facets[dimension][str(value)] += row['total']
+    return facets
+
+
+def stored_facets():
+    """Facet của toàn bộ job published, đọc từ bảng JobFacetCount (một truy vấn)"""
+    facets = defaultdict(Counter)
+    for dimension, value, count in JobFacetCount.objects.filter(count__gt=0).values_list(
+        'dimension', 'value', 'count'
+    ):
+        facets[dimension][value] = count
+    return facets
+
+
+def apply_changes(changes):
+    """Cộng các độ thay đổi {(chiều, giá trị): delta} vào bảng JobFacetCount"""
+    for (dimension, value), delta in changes.items():
+        if not delta:
+            continue
+        updated = JobFacetCount.objects.filter(dimension=dimension, value=value).update(
+            count=F('count') + delta
+        )
+        if not updated:
+            try:
+                with transaction.atomic():
+                    JobFacetCount.objects.create(dimension=dimension, value=value, count=delta)
+            except IntegrityError:
+                # Tiến trình khác vừa tạo dòng này
+                JobFacetCount.objects.filter(dimension=dimension, value=value).update(
+                    count=F('count') + delta
+                )
+
+
+def remove_jobs(job_ids):
+    """Trừ các job vừa rời trạng thái published (đóng hàng loạt) khỏi bảng facet"""
+    changes = Counter()
+    rows = JobPost.objects.filter(pk__in=list(job_ids)).values_list(
+        'category_id', 'district_id', 'hourly_equivalent', 'work_date'
+    )
+    for row in rows:
+        for key in facet_keys(*row):
+            changes[key] -= 1
+    apply_changes(changes)
+
+
+def rebuild():
+    """Tính lại toàn bộ bảng JobFacetCount từ các job published"""
+    facets = compute_facets(JobPost.objects.filter(status='published'))
+    with transaction.atomic():
+        JobFacetCount.objects.all().delete()
+        JobFacetCount.objects.bulk_create([
+            JobFacetCount(dimension=dimension, value=value, count=count)
+            for dimension, counter in facets.items() for value, count in counter.items()
+        ])
+    return sum(facets['category'].values())
@@ -0,0 +1,193 @@
+"""
+Feed "Việc làm cho bạn": danh sách job phù hợp tính sẵn cho từng worker.
+
+Khi một job chuyển sang 'published', điểm kỹ năng của job được nhân với chỉ mục
+worker (MatchingEngine dựng từ worker và job đang đăng, giữ trong tiến trình) và các worker
+phù hợp nhất nhận một dòng WorkerJobFeed (fan-out khi ghi). Job đóng thì dòng
+tương ứng bị xóa. Đọc feed là một lần quét chỉ mục (worker, -score) cộng một
+lần lấy job theo khóa chính, không chạy truy vấn tìm kiếm.
+
+Fan-out và tính lại feed không chạy trong request: signals chỉ ghi id vào hàng
+đợi FeedUpdate (`enqueue()`), lệnh run_feed_worker xử lý bằng `process_pending()`.
+"""
+import heapq
+import threading
+import time
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Window
+from django.db.models.functions import RowNumber
+from django.utils import timezone
+
+from .matching import MatchingEngine
+from .models import FeedUpdate, JobPost, WorkerJobFeed
+from .skills import parse_skills
+
+# Số job tối đa giữ trong feed của mỗi worker
+FEED_SIZE = getattr(settings, 'JOB_FEED_SIZE', 50)
+# Số worker tối đa nhận một job khi fan-out (giới hạn chi phí mỗi lần đăng)
+FANOUT_LIMIT = getattr(settings, 'JOB_FEED_FANOUT_LIMIT', 5000)
+# Điểm tối thiểu để job được đưa vào feed
+MIN_SCORE = getattr(settings, 'JOB_FEED_MIN_SCORE', 0.2)
+
+TRIM_BATCH_SIZE = 500
+# Số dòng hàng đợi lấy ra mỗi lần xử lý
+QUEUE_BATCH_SIZE = 100
+
+
+class WorkerIndex:
+    """
+    Chỉ mục kỹ năng của các worker đang tìm việc, dựng lại sau `ttl` giây.
+
+    Engine dùng chung từ vựng và idf (tính trên worker + job đang đăng, xem
+    MatchingEngine.from_database) cho cả fan-out lẫn `rebuild_worker_feed()`,
+    nên một cặp (worker, job) có cùng điểm dù vào feed theo đường nào.
+    """
+
+    def __init__(self, ttl=None):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._engine = None
+        self._built_at = None
+
+    def _expired(self):
+        ttl = self.ttl
+        if ttl is None:
+            ttl = getattr(settings, 'JOB_FEED_WORKER_INDEX_TTL', 300)
+        return self._engine is None or time.monotonic() - self._built_at > ttl
+
+    def get(self):
+        if self._expired():
+            with self._lock:
+                if self._expired():
+                    self._engine = MatchingEngine.from_database()
+                    self._built_at = time.monotonic()
+        return self._engine
+
+    def invalidate(self):
+        self._engine = None
+
+
+worker_index = WorkerIndex()
+
+
+def trim_feeds(worker_ids, size=None):
+    """Xóa các dòng vượt quá `size` (điểm thấp nhất) trong feed của các worker"""
+    size = size or FEED_SIZE
+    worker_ids = list(worker_ids)
+    removed = 0
+    for start in range(0, len(worker_ids), TRIM_BATCH_SIZE):
+        ranked = WorkerJobFeed.objects.filter(
+            worker_id__in=worker_ids[start:start + TRIM_BATCH_SIZE]
+        ).annotate(position=Window(
+            RowNumber(), partition_by=[F('worker_id')], order_by=[F('score').desc(), F('job_id').desc()]
+        ))
+        excess = list(ranked.filter(position__gt=size).values_list('pk', flat=True))
+        if excess:
+            removed += WorkerJobFeed.objects.filter(pk__in=excess).delete()[0]
+    return removed
+
+
+def fan_out_job(job):
+    """Ghi job vào feed của các worker phù hợp nhất, trả về số dòng đã ghi"""
+    if job.status != 'published' or job.is_expired():
+        remove_jobs([job.pk])
+        return 0
+
+    engine = worker_index.get()
+    scores = engine.workers.dot(engine.encode(parse_skills(job.required_skills)))
+    matches = heapq.nlargest(
+        FANOUT_LIMIT,
+        ((worker_id, score) for worker_id, score in scores.items() if score >= MIN_SCORE),
+        key=lambda item: item[1],
+    )
+    with transaction.atomic():
+        # Kỹ năng có thể đã đổi: thay toàn bộ các dòng cũ của job
+        WorkerJobFeed.objects.filter(job_id=job.pk).delete()
+        WorkerJobFeed.objects.bulk_create(
+            [WorkerJobFeed(worker_id=worker_id, job_id=job.pk, score=score) for worker_id, score in matches],
+            batch_size=1000,
+        )
+        trim_feeds([worker_id for worker_id, _ in matches])
+    return len(matches)
+
+
+def remove_jobs(job_ids):
+    """Gỡ các job (đã đóng/gỡ đăng) khỏi mọi feed"""
+    if not job_ids:
+        return 0
+    return WorkerJobFeed.objects.filter(job_id__in=list(job_ids)).delete()[0]
+
+
+def get_feed(worker_id):
+    """
+    Feed của worker, điểm cao nhất trước: quét chỉ mục (worker, -score) rồi lấy
+    các job theo khóa chính. Job đã đóng/đến giờ bắt đầu bị bỏ qua.
+    """
+    entries = list(WorkerJobFeed.objects.filter(worker_id=worker_id).order_by('-score')[:FEED_SIZE])
+    jobs = JobPost.objects.select_related('category').filter(
+        status='published', start_at__gt=timezone.now()
+    ).in_bulk([entry.job_id for entry in entries])
+    feed = []
+    for entry in entries:
+        if entry.job_id in jobs:
+            entry.job = jobs[entry.job_id]
+            feed.append(entry)
+    return feed
+
+
+def rebuild_worker_feed(worker_id):
+    """Tính lại toàn bộ feed của một worker (khi hồ sơ/kỹ năng thay đổi)"""
+    from accounts.models import UserProfile
+
+    skills = UserProfile.objects.filter(
+        user_id=worker_id, user__user_type='worker', is_available=True
+    ).values_list('normalized_skills', flat=True).first()
+    matches = []
+    if skills:
+        engine = worker_index.get()
+        weights = engine.encode(skills)
+        scores = (
+            (job_id, engine.similarity(weights, engine.encode(parse_skills(required_skills))))
+            for job_id, required_skills in JobPost.objects.filter(
+                status='published', start_at__gt=timezone.now()
+            ).values_list('pk', 'required_skills')
+        )
+        matches = heapq.nlargest(
+            FEED_SIZE,
+            ((job_id, score) for job_id, score in scores if score >= MIN_SCORE),
+            key=lambda item: (item[1], -item[0]),
+        )
+    with transaction.atomic():
+        WorkerJobFeed.objects.filter(worker_id=worker_id).delete()
+        WorkerJobFeed.objects.bulk_create(
+            [WorkerJobFeed(worker_id=worker_id, job_id=job_id, score=score) for job_id, score in matches]
+        )
+    return len(matches)
+
+def enqueue(kind, target_ids):
+    """Đưa job ('job') hoặc worker ('worker') vào hàng đợi; dòng đang chờ được giữ nguyên"""
+    FeedUpdate.objects.bulk_create(
+        [FeedUpdate(kind=kind, target_id=target_id) for target_id in set(target_ids)],
+        ignore_conflicts=True,
+    )
+
+
+def process_pending(limit=QUEUE_BATCH_SIZE):
+    """
+    Xử lý tối đa `limit` dòng chờ lâu nhất, trả về số dòng đã xử lý.
+    Dòng được xóa trước khi xử lý: thay đổi mới trong lúc xử lý sẽ tạo dòng mới.
+    """
+    pending = list(FeedUpdate.objects.order_by('queued_at', 'pk')[:limit])
+    if not pending:
+        return 0
+    FeedUpdate.objects.filter(pk__in=[update.pk for update in pending]).delete()
+
+    job_ids = [update.target_id for update in pending if update.kind == 'job']
+    for job in JobPost.objects.filter(pk__in=job_ids):
+        fan_out_job(job)
+    for update in pending:
+        if update.kind == 'worker':
+            rebuild_worker_feed(update.target_id)
+    return len(pending)
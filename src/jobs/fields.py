@@ -0,0 +1,22 @@
+from django.db import models
+
+
+class FullTextSearchField(models.TextField):
+    """
+    Cột ẩn của bảng FTS5 (trùng tên với bảng) dùng làm vế trái của MATCH
+    """
+
+    def db_type(self, connection):
+        # Cột ảo do SQLite tự tạo, không có trong schema
+        return None
+
+
+@FullTextSearchField.register_lookup
+class Match(models.Lookup):
+    """Lookup `__match` sinh ra `<bảng> MATCH <truy vấn FTS5>`"""
+    lookup_name = 'match'
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return f'{lhs} MATCH {rhs}', lhs_params + rhs_params
@@ -1,8 +1,65 @@
 from django import forms
+from django.core.exceptions import ValidationError
+from django.forms.models import ModelChoiceIterator
 from .models import JobPost, JobApplication, JobCategory
+from .categories import category_registry
+from .facets import PAY_BUCKETS
+from .text import fold_words
 from django.utils import timezone
 import datetime
 
+
+class CategoryChoiceIterator(ModelChoiceIterator):
+    """Duyệt lựa chọn danh mục từ category_registry thay vì truy vấn CSDL"""
+
+    def __iter__(self):
+        if self.field.empty_label is not None:
+            yield ("", self.field.empty_label)
+        for category in category_registry.active():
+            yield self.choice(category)
+
+    def __len__(self):
+        return len(category_registry.active()) + (1 if self.field.empty_label is not None else 0)
+
+    def __bool__(self):
+        return self.field.empty_label is not None or bool(category_registry.active())
+
+
+class CategoryChoiceField(forms.ModelChoiceField):
+    """ModelChoiceField cho JobCategory đang hoạt động, không truy vấn CSDL khi render/validate"""
+    iterator = CategoryChoiceIterator
+
+    def __init__(self, **kwargs):
+        kwargs.setdefault('queryset', JobCategory.objects.filter(is_active=True))
+        super().__init__(**kwargs)
+
+    def to_python(self, value):
+        if value in self.empty_values:
+            return None
+        if isinstance(value, JobCategory):
+            value = value.pk
+        try:
+            category = category_registry.get(int(value))
+        except (TypeError, ValueError):
+            category = None
+        if category is None or not category.is_active:
+            raise ValidationError(
+                self.error_messages['invalid_choice'],
+                code='invalid_choice',
+                params={'value': value},
+            )
+        return category
+
+class SearchQueryField(forms.CharField):
+    """
+    Ô tìm kiếm tự do: cleaned_data là chuỗi đã chuẩn hóa (chữ thường, bỏ dấu, bỏ dấu câu)
+    cùng dạng với các cột tìm kiếm search_* và chỉ mục toàn văn.
+    """
+
+    def to_python(self, value):
+        return fold_words(super().to_python(value))
+
+
 class JobPostForm(forms.ModelForm):
     """Form tạo và chỉnh sửa bài đăng việc làm"""
     
@@ -251,23 +308,93 @@ class JobApplicationForm(forms.ModelForm):
 class JobSearchForm(forms.Form):
     """Form tìm kiếm việc làm"""
     
-    keyword = forms.CharField(
+    keyword = SearchQueryField(
         required=False,
         widget=forms.TextInput(attrs={
             'class': 'form-control',
-            'placeholder': 'Tìm kiếm theo từ khóa...'
+            'placeholder': 'Tìm kiếm theo từ khóa...',
+            'data-typeahead': 'title'
         }),
         label='Từ khóa'
     )
     
-    category = forms.ModelChoiceField(
-        queryset=JobCategory.objects.filter(is_active=True),
+    category = CategoryChoiceField(
         required=False,
         empty_label="Tất cả danh mục",
         widget=forms.Select(attrs={'class': 'form-select'}),
         label='Danh mục'
     )
     
+    skill = forms.CharField(
+        required=False,
+        widget=forms.TextInput(attrs={
+            'class': 'form-control',
+            'placeholder': 'Kỹ năng...',
+            'data-typeahead': 'skill'
+        }),
+        label='Kỹ năng'
+    )
+    
+    location = SearchQueryField(
+        required=False,
+        widget=forms.TextInput(attrs={
+            'class': 'form-control',
+            'placeholder': 'Quận/huyện, tỉnh/thành...',
+            'data-typeahead': 'location'
+        }),
+        label='Địa điểm'
+    )
+    
+    # So sánh theo lương quy đổi theo giờ để các job theo giờ/ngày/cố định cùng một thước đo
+    payment_min = forms.DecimalField(
+        required=False,
+        min_value=0,
+        widget=forms.NumberInput(attrs={
+            'class': 'form-control',
+            'placeholder': 'Lương tối thiểu/giờ...',
+            'step': '1000'  # Thay đổi step thành 1000 VND
+        }),
+        label='Lương tối thiểu (VND/giờ)'
+    )
+    
+    payment_max = forms.DecimalField(
+        required=False,
+        min_value=0,
+        widget=forms.NumberInput(attrs={
+            'class': 'form-control',
+            'placeholder': 'Lương tối đa/giờ...',
+            'step': '1000'  # Thay đổi step thành 1000 VND
+        }),
+        label='Lương tối đa (VND/giờ)'
+    )
+    
+    # Chọn qua các facet trên trang kết quả
+    pay = forms.ChoiceField(
+        choices=[('', 'Mọi mức lương')] + [(key, label) for key, label, _, _ in PAY_BUCKETS],
+        required=False,
+        widget=forms.HiddenInput,
+        label='Khoảng lương'
+    )
+    
+    work_date = forms.DateField(
+        required=False,
+        widget=forms.HiddenInput,
+        label='Ngày làm việc'
+    )
+    
+    SORT_CHOICES = [
+        ('', 'Mới nhất'),
+        ('hourly_pay', 'Lương/giờ cao nhất'),
+        ('total_pay', 'Tổng thu nhập cao nhất'),
+    ]
+    
+    sort = forms.ChoiceField(
+        choices=SORT_CHOICES,
+        required=False,
+        widget=forms.Select(attrs={'class': 'form-select'}),
+        label='Sắp xếp'
+    )
+    
 class JobFilterForm(forms.Form):
     """Form lọc công việc trong trang quản lý"""
     
@@ -286,7 +413,7 @@ class JobFilterForm(forms.Form):
         ('this_month', 'Tháng này'),
     ]
     
-    keyword = forms.CharField(
+    keyword = SearchQueryField(
         required=False,
         widget=forms.TextInput(attrs={
             'class': 'form-control',
@@ -302,8 +429,7 @@ class JobFilterForm(forms.Form):
         label='Trạng thái'
     )
     
-    category = forms.ModelChoiceField(
-        queryset=JobCategory.objects.filter(is_active=True),
+    category = CategoryChoiceField(
         required=False,
         empty_label="Tất cả danh mục",
         widget=forms.Select(attrs={'class': 'form-select'}),
@@ -326,35 +452,4 @@ class JobFilterForm(forms.Form):
         required=False,
         widget=forms.Select(attrs={'class': 'form-select'}),
         label='Ứng viên'
-    )
-    
-    location = forms.CharField(
-        required=False,
-        widget=forms.TextInput(attrs={
-            'class': 'form-control',
-            'placeholder': 'Địa điểm...'
-        }),
-        label='Địa điểm'
-    )
-    
-    payment_min = forms.DecimalField(
-        required=False,
-        min_value=0,
-        widget=forms.NumberInput(attrs={
-            'class': 'form-control',
-            'placeholder': 'Lương tối thiểu...',
-            'step': '1000'  # Thay đổi step thành 1000 VND
-        }),
-        label='Lương tối thiểu (VND)'
-    )
-    
-    payment_max = forms.DecimalField(
-        required=False,
-        min_value=0,
-        widget=forms.NumberInput(attrs={
-            'class': 'form-control',
-            'placeholder': 'Lương tối đa...',
-            'step': '1000'  # Thay đổi step thành 1000 VND
-        }),
-        label='Lương tối đa (VND)'
     )
\ No newline at end of file
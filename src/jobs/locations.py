@@ -0,0 +1,233 @@
+"""
+Danh mục hành chính (gazetteer) đóng gói cùng ứng dụng và bộ chuẩn hóa địa điểm.
+
+Mã tỉnh/thành và quận/huyện theo danh mục của Tổng cục Thống kê (GSO).
+Quận/huyện hiện có cho TP. Hồ Chí Minh, Hà Nội và Đà Nẵng; với các tỉnh khác
+chỉ xác định được province_id.
+
+`resolve("123 Lê Lợi, Q1, TP.HCM")` -> (79, 760)
+"""
+import re
+
+from .text import fold_words
+
+# (mã, tên, các tên gọi khác)
+PROVINCES = (
+    (1, 'Hà Nội', ('hn', 'ha noi', 'thu do ha noi')),
+    (2, 'Hà Giang', ()),
+    (4, 'Cao Bằng', ()),
+    (6, 'Bắc Kạn', ('bac can',)),
+    (8, 'Tuyên Quang', ()),
+    (10, 'Lào Cai', ()),
+    (11, 'Điện Biên', ()),
+    (12, 'Lai Châu', ()),
+    (14, 'Sơn La', ()),
+    (15, 'Yên Bái', ()),
+    (17, 'Hòa Bình', ('hoa binh', 'hoà bình')),
+    (19, 'Thái Nguyên', ()),
+    (20, 'Lạng Sơn', ()),
+    (22, 'Quảng Ninh', ()),
+    (24, 'Bắc Giang', ()),
+    (25, 'Phú Thọ', ()),
+    (26, 'Vĩnh Phúc', ()),
+    (27, 'Bắc Ninh', ()),
+    (30, 'Hải Dương', ()),
+    (31, 'Hải Phòng', ('hp',)),
+    (33, 'Hưng Yên', ()),
+    (34, 'Thái Bình', ()),
+    (35, 'Hà Nam', ()),
+    (36, 'Nam Định', ()),
+    (37, 'Ninh Bình', ()),
+    (38, 'Thanh Hóa', ('thanh hoa', 'thanh hoá')),
+    (40, 'Nghệ An', ()),
+    (42, 'Hà Tĩnh', ()),
+    (44, 'Quảng Bình', ()),
+    (45, 'Quảng Trị', ()),
+    (46, 'Thừa Thiên Huế', ('hue', 'thua thien hue')),
+    (48, 'Đà Nẵng', ('da nang', 'dng')),
+    (49, 'Quảng Nam', ()),
+    (51, 'Quảng Ngãi', ()),
+    (52, 'Bình Định', ()),
+    (54, 'Phú Yên', ()),
+    (56, 'Khánh Hòa', ('khanh hoa', 'nha trang')),
+    (58, 'Ninh Thuận', ()),
+    (60, 'Bình Thuận', ()),
+    (62, 'Kon Tum', ()),
+    (64, 'Gia Lai', ()),
+    (66, 'Đắk Lắk', ('dak lak', 'daklak', 'dac lac')),
+    (67, 'Đắk Nông', ('dak nong', 'daknong')),
+    (68, 'Lâm Đồng', ('da lat',)),
+    (70, 'Bình Phước', ()),
+    (72, 'Tây Ninh', ()),
+    (74, 'Bình Dương', ()),
+    (75, 'Đồng Nai', ()),
+    (77, 'Bà Rịa - Vũng Tàu', ('ba ria vung tau', 'brvt', 'vung tau', 'ba ria')),
+    (79, 'TP. Hồ Chí Minh', ('ho chi minh', 'hcm', 'tphcm', 'tp hcm', 'sai gon', 'saigon', 'sg')),
+    (80, 'Long An', ()),
+    (82, 'Tiền Giang', ()),
+    (83, 'Bến Tre', ()),
+    (84, 'Trà Vinh', ()),
+    (86, 'Vĩnh Long', ()),
+    (87, 'Đồng Tháp', ()),
+    (89, 'An Giang', ()),
+    (91, 'Kiên Giang', ()),
+    (92, 'Cần Thơ', ()),
+    (93, 'Hậu Giang', ()),
+    (94, 'Sóc Trăng', ()),
+    (95, 'Bạc Liêu', ()),
+    (96, 'Cà Mau', ()),
+)
+
+# (mã, mã tỉnh, tên, các tên gọi khác)
+DISTRICTS = (
+    # TP. Hồ Chí Minh
+    (760, 79, 'Quận 1', ()),
+    (761, 79, 'Quận 12', ()),
+    (764, 79, 'Quận Gò Vấp', ('go vap',)),
+    (765, 79, 'Quận Bình Thạnh', ('binh thanh',)),
+    (766, 79, 'Quận Tân Bình', ('tan binh',)),
+    (767, 79, 'Quận Tân Phú', ('tan phu',)),
+    (768, 79, 'Quận Phú Nhuận', ('phu nhuan',)),
+    # Quận 2, Quận 9 và quận Thủ Đức cũ đã nhập thành TP. Thủ Đức
+    (769, 79, 'TP. Thủ Đức', ('thu duc', 'quan 2', 'quan 9')),
+    (770, 79, 'Quận 3', ()),
+    (771, 79, 'Quận 10', ()),
+    (772, 79, 'Quận 11', ()),
+    (773, 79, 'Quận 4', ()),
+    (774, 79, 'Quận 5', ()),
+    (775, 79, 'Quận 6', ()),
+    (776, 79, 'Quận 8', ()),
+    (777, 79, 'Quận Bình Tân', ('binh tan',)),
+    (778, 79, 'Quận 7', ()),
+    (783, 79, 'Huyện Củ Chi', ('cu chi',)),
+    (784, 79, 'Huyện Hóc Môn', ('hoc mon',)),
+    (785, 79, 'Huyện Bình Chánh', ('binh chanh',)),
+    (786, 79, 'Huyện Nhà Bè', ('nha be',)),
+    (787, 79, 'Huyện Cần Giờ', ('can gio',)),
+    # Hà Nội
+    (1, 1, 'Quận Ba Đình', ('ba dinh',)),
+    (2, 1, 'Quận Hoàn Kiếm', ('hoan kiem',)),
+    (3, 1, 'Quận Tây Hồ', ('tay ho',)),
+    (4, 1, 'Quận Long Biên', ('long bien',)),
+    (5, 1, 'Quận Cầu Giấy', ('cau giay',)),
+    (6, 1, 'Quận Đống Đa', ('dong da',)),
+    (7, 1, 'Quận Hai Bà Trưng', ('hai ba trung',)),
+    (8, 1, 'Quận Hoàng Mai', ('hoang mai',)),
+    (9, 1, 'Quận Thanh Xuân', ('thanh xuan',)),
+    (16, 1, 'Huyện Sóc Sơn', ('soc son',)),
+    (17, 1, 'Huyện Đông Anh', ('dong anh',)),
+    (18, 1, 'Huyện Gia Lâm', ('gia lam',)),
+    (19, 1, 'Quận Nam Từ Liêm', ('nam tu liem',)),
+    (20, 1, 'Huyện Thanh Trì', ('thanh tri',)),
+    (21, 1, 'Quận Bắc Từ Liêm', ('bac tu liem',)),
+    (250, 1, 'Huyện Mê Linh', ('me linh',)),
+    (268, 1, 'Quận Hà Đông', ('ha dong',)),
+    (269, 1, 'Thị xã Sơn Tây', ('son tay',)),
+    (271, 1, 'Huyện Ba Vì', ('ba vi',)),
+    (272, 1, 'Huyện Phúc Thọ', ('phuc tho',)),
+    (273, 1, 'Huyện Đan Phượng', ('dan phuong',)),
+    (274, 1, 'Huyện Hoài Đức', ('hoai duc',)),
+    (275, 1, 'Huyện Quốc Oai', ('quoc oai',)),
+    (276, 1, 'Huyện Thạch Thất', ('thach that',)),
+    (277, 1, 'Huyện Chương Mỹ', ('chuong my',)),
+    (278, 1, 'Huyện Thanh Oai', ('thanh oai',)),
+    (279, 1, 'Huyện Thường Tín', ('thuong tin',)),
+    (280, 1, 'Huyện Phú Xuyên', ('phu xuyen',)),
+    (281, 1, 'Huyện Ứng Hòa', ('ung hoa',)),
+    (282, 1, 'Huyện Mỹ Đức', ('my duc',)),
+    # Đà Nẵng
+    (490, 48, 'Quận Liên Chiểu', ('lien chieu',)),
+    (491, 48, 'Quận Thanh Khê', ('thanh khe',)),
+    (492, 48, 'Quận Hải Châu', ('hai chau',)),
+    (493, 48, 'Quận Sơn Trà', ('son tra',)),
+    (494, 48, 'Quận Ngũ Hành Sơn', ('ngu hanh son',)),
+    (495, 48, 'Quận Cẩm Lệ', ('cam le',)),
+    (497, 48, 'Huyện Hòa Vang', ('hoa vang',)),
+    (498, 48, 'Huyện Hoàng Sa', ('hoang sa',)),
+)
+
+PROVINCE_NAMES = {code: name for code, name, _ in PROVINCES}
+DISTRICT_NAMES = {code: name for code, _, name, _ in DISTRICTS}
+DISTRICT_PROVINCE = {code: province for code, province, _, _ in DISTRICTS}
+
+# Viết tắt thường gặp, áp dụng trên văn bản đã fold_words()
+_ABBREVIATIONS = (
+    (re.compile(r'\b(?:q|quan)\s*(\d{1,2})\b'), r'quan \1'),
+    (re.compile(r'\b(?:h|huyen)\s+(?=[a-z])'), 'huyen '),
+    (re.compile(r'\btp\b|\btph\b'), 'thanh pho'),
+    (re.compile(r'\btx\b'), 'thi xa'),
+)
+
+# Tiền tố cấp hành chính được bỏ khi so khớp tên
+_PREFIX = re.compile(r'^(?:thanh pho|tp|tinh|quan|huyen|thi xa)\s+')
+
+
+def expand(text):
+    """fold_words() rồi mở rộng viết tắt: "Q1, TP.HCM" -> "quan 1 thanh pho hcm" """
+    text = fold_words(text)
+    for pattern, replacement in _ABBREVIATIONS:
+        text = pattern.sub(replacement, text)
+    return text
+
+
+def _alias_pattern(entries):
+    """
+    Biên dịch bảng {bí danh: mã} thành một regex (bí danh dài trước)
+    để tìm mọi lần xuất hiện trong một lượt quét.
+    """
+    aliases = sorted(entries, key=len, reverse=True)
+    return re.compile(r'\b(' + '|'.join(re.escape(alias) for alias in aliases) + r')\b')
+
+
+def _build_aliases(rows):
+    aliases = {}
+    for code, name, extra in rows:
+        folded = expand(name)
+        aliases[folded] = code
+        short = _PREFIX.sub('', folded)
+        if not short.isdigit():
+            # "Quận 1" không được rút gọn thành "1"
+            aliases[short] = code
+        for alias in extra:
+            aliases[expand(alias)] = code
+    return aliases
+
+
+_PROVINCE_ALIASES = _build_aliases(PROVINCES)
+_PROVINCE_PATTERN = _alias_pattern(_PROVINCE_ALIASES)
+_DISTRICT_ALIASES = _build_aliases((code, name, extra) for code, _, name, extra in DISTRICTS)
+_DISTRICT_PATTERN = _alias_pattern(_DISTRICT_ALIASES)
+
+
+def _last_match(pattern, aliases, text, accept=None):
+    """Mã của lần khớp cuối cùng (địa chỉ viết từ nhỏ đến lớn nên cấp hành chính ở cuối)"""
+    found = None
+    for match in pattern.finditer(text):
+        code = aliases[match.group(1)]
+        if accept is None or accept(code):
+            found = code
+    return found
+
+
+def resolve(text):
+    """
+    Chuẩn hóa địa điểm tự do thành (province_id, district_id).
+    Phần nào không xác định được trả về None.
+    """
+    text = expand(text)
+    if not text:
+        return None, None
+    province_id = _last_match(_PROVINCE_PATTERN, _PROVINCE_ALIASES, text)
+    district_id = _last_match(
+        _DISTRICT_PATTERN, _DISTRICT_ALIASES, text,
+        accept=lambda code: province_id is None or DISTRICT_PROVINCE[code] == province_id,
+    )
+    if district_id is not None and province_id is None:
+        province_id = DISTRICT_PROVINCE[district_id]
+    return province_id, district_id
+
+
+def display_name(province_id, district_id=None):
+    """Tên hiển thị: "Quận 1, TP. Hồ Chí Minh" """
+    parts = [DISTRICT_NAMES.get(district_id), PROVINCE_NAMES.get(province_id)]
+    return ', '.join(part for part in parts if part)
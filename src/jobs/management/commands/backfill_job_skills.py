@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand
+
+from jobs.models import JobPost
+from jobs.skills import index_jobs
+
+
+class Command(BaseCommand):
+    help = 'Tách required_skills của các bài đăng cũ thành liên kết kỹ năng (chạy lại được, tiếp tục từ chỗ dừng)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+        parser.add_argument('--all', action='store_true',
+                            help='Tách lại cả các bài đã được đánh dấu skills_indexed')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        jobs = JobPost.objects.only('pk', 'required_skills').order_by('pk')
+        if not options['all']:
+            # Mỗi lô được đánh dấu skills_indexed trong cùng transaction,
+            # nên chạy lại sau khi bị ngắt sẽ bỏ qua các lô đã xong
+            jobs = jobs.filter(skills_indexed=False)
+        
+        processed = 0
+        last_id = 0
+        while True:
+            batch = list(jobs.filter(pk__gt=last_id)[:batch_size])
+            if not batch:
+                break
+            index_jobs(batch)
+            processed += len(batch)
+            last_id = batch[-1].pk
+            self.stdout.write(f'Đã xử lý {processed} bài đăng (đến #{last_id})')
+        
+        self.stdout.write(self.style.SUCCESS(f'Hoàn tất: {processed} bài đăng'))
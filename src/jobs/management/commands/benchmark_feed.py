@@ -0,0 +1,112 @@
+import random
+import statistics
+import time
+from datetime import time as dtime, timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from accounts.models import UserProfile
+from jobs import feed
+from jobs.management.commands.benchmark_matching import SKILLS
+from jobs.models import JobCategory, JobPost, WorkerJobFeed
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = 'Đo chi phí fan-out feed "Việc làm cho bạn" cho mỗi lần đăng job trên dữ liệu giả lập'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=20000,
+                            help='Số người tìm việc giả lập (mặc định 20000)')
+        parser.add_argument('--jobs', type=int, default=200,
+                            help='Số job được đăng (mỗi job là một lần fan-out)')
+        parser.add_argument('--custom-skills', type=int, default=500,
+                            help='Số kỹ năng tự do ngoài danh mục')
+
+    def handle(self, *args, **options):
+        rng = random.Random(42)
+        vocabulary = SKILLS + [f'kỹ năng {index}' for index in range(options['custom_skills'])]
+        weights = [1 / (rank + 1) for rank in range(len(vocabulary))]
+
+        # Toàn bộ dữ liệu giả lập được rollback khi kết thúc
+        with transaction.atomic():
+            worker_ids = self.populate_workers(rng, vocabulary, weights, options['workers'])
+
+            started = time.perf_counter()
+            feed.worker_index.invalidate()
+            feed.worker_index.get()
+            self.stdout.write(f'Dựng chỉ mục worker: {(time.perf_counter() - started) * 1000:.0f} ms')
+
+            jobs = self.populate_jobs(rng, vocabulary, weights, options['jobs'])
+            timings, written = [], []
+            for job in jobs:
+                started = time.perf_counter()
+                written.append(feed.fan_out_job(job))
+                timings.append((time.perf_counter() - started) * 1000)
+            self.report('fan-out / job', timings)
+            self.stdout.write(
+                f'{"":<16} trung bình {statistics.mean(written):.0f} dòng ghi/job, '
+                f'tổng {WorkerJobFeed.objects.count()} dòng feed'
+            )
+
+            timings = []
+            for worker_id in rng.sample(worker_ids, min(500, len(worker_ids))):
+                started = time.perf_counter()
+                feed.get_feed(worker_id)
+                timings.append((time.perf_counter() - started) * 1000)
+            self.report('đọc feed', timings)
+
+            transaction.set_rollback(True)
+        feed.worker_index.invalidate()
+
+    def populate_workers(self, rng, vocabulary, weights, count):
+        users = User.objects.bulk_create([
+            User(username=f'benchmark_worker_{index}', email=f'benchmark_worker_{index}@example.com',
+                 user_type='worker')
+            for index in range(count)
+        ], batch_size=2000)
+        if users[0].pk is None:
+            users = list(User.objects.filter(username__startswith='benchmark_worker_'))
+        UserProfile.objects.bulk_create([
+            UserProfile(user=user, normalized_skills=sorted(set(rng.choices(vocabulary, weights, k=rng.randint(1, 8)))))
+            for user in users
+        ], batch_size=2000)
+        return [user.pk for user in users]
+
+    def populate_jobs(self, rng, vocabulary, weights, count):
+        category, _ = JobCategory.objects.get_or_create(name='Benchmark')
+        employer = User.objects.create(
+            username='benchmark_employer', email='benchmark@example.com', user_type='employer'
+        )
+        start_at = timezone.now() + timedelta(days=1)
+        jobs = [
+            JobPost(
+                title=f'Benchmark {index}',
+                description='Benchmark',
+                required_skills=', '.join(set(rng.choices(vocabulary, weights, k=rng.randint(1, 5)))),
+                employer=employer,
+                category=category,
+                location='TP.HCM',
+                work_date=start_at.date(),
+                work_time_start=dtime(8, 0),
+                work_time_end=dtime(17, 0),
+                duration_hours=8,
+                payment_amount=50000,
+                status='published',
+                start_at=start_at,
+            )
+            for index in range(count)
+        ]
+        # bulk_create không gửi post_save: fan-out được gọi và đo trực tiếp
+        return JobPost.objects.bulk_create(jobs)
+
+    def report(self, label, timings):
+        timings.sort()
+        p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+        self.stdout.write(
+            f'{label:<16} median {statistics.median(timings):8.2f} ms  p95 {p95:8.2f} ms'
+        )
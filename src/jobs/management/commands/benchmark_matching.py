@@ -0,0 +1,67 @@
+import random
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+
+from jobs.matching import MatchingEngine, SkillVocabulary
+
+SKILLS = [
+    'pha chế', 'phục vụ', 'bảo vệ', 'lễ tân', 'giao hàng', 'bán hàng', 'dọn dẹp',
+    'thu ngân', 'kho hàng', 'tiếng anh', 'tiếng trung', 'tiếng nhật', 'lái xe máy',
+    'lái ô tô', 'nấu ăn', 'phụ bếp', 'rửa bát', 'trông trẻ', 'gia sư', 'chụp ảnh',
+    'quay phim', 'thiết kế', 'tin học văn phòng', 'excel', 'chăm sóc khách hàng',
+    'tư vấn', 'telesale', 'pg', 'mc', 'sự kiện', 'bốc xếp', 'may mặc', 'điện nước',
+]
+
+
+class Command(BaseCommand):
+    help = 'Đo thời gian dựng và truy vấn top-k của engine ghép kỹ năng trên dữ liệu giả lập (trong bộ nhớ)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=100000,
+                            help='Số người tìm việc giả lập (mặc định 100000)')
+        parser.add_argument('--jobs', type=int, default=20000,
+                            help='Số bài đăng giả lập (mặc định 20000)')
+        parser.add_argument('--custom-skills', type=int, default=2000,
+                            help='Số kỹ năng tự do ngoài danh mục')
+        parser.add_argument('--top', type=int, default=10, help='k trong top-k')
+        parser.add_argument('--sample', type=int, default=1000,
+                            help='Số truy vấn đo cho mỗi chiều')
+
+    def handle(self, *args, **options):
+        rng = random.Random(42)
+        # Phân bố lệch (Zipf): vài kỹ năng rất phổ biến, phần đuôi là kỹ năng tự do
+        vocabulary = SKILLS + [f'kỹ năng {index}' for index in range(options['custom_skills'])]
+        weights = [1 / (rank + 1) for rank in range(len(vocabulary))]
+
+        def sample_skills(low, high):
+            return set(rng.choices(vocabulary, weights, k=rng.randint(low, high)))
+
+        worker_skills = {pk: sample_skills(1, 8) for pk in range(1, options['workers'] + 1)}
+        job_skills = {pk: sample_skills(1, 5) for pk in range(1, options['jobs'] + 1)}
+
+        started = time.perf_counter()
+        engine = MatchingEngine(worker_skills, job_skills, vocabulary=SkillVocabulary(SKILLS))
+        self.stdout.write(
+            f'Dựng engine: {(time.perf_counter() - started) * 1000:.0f} ms '
+            f'({len(engine.vocabulary)} kỹ năng, {len(engine.workers.rows)} worker, '
+            f'{len(engine.jobs.rows)} job)'
+        )
+
+        k = options['top']
+        for label, keys, query, total in (
+            ('top-k job / worker', list(worker_skills), engine.top_jobs_for_worker, options['workers']),
+            ('top-k worker / job', list(job_skills), engine.top_workers_for_job, options['jobs']),
+        ):
+            timings = []
+            for key in rng.sample(keys, min(options['sample'], len(keys))):
+                started = time.perf_counter()
+                query(key, k)
+                timings.append((time.perf_counter() - started) * 1000)
+            timings.sort()
+            self.stdout.write(
+                f'{label:<20} median {statistics.median(timings):7.2f} ms  '
+                f'p95 {timings[int(len(timings) * 0.95) - 1]:7.2f} ms  '
+                f'ước tính toàn bộ {statistics.mean(timings) * total / 1000:7.1f} s'
+            )
@@ -0,0 +1,112 @@
+import random
+import statistics
+import time
+from datetime import time as dtime, timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from jobs import search
+from jobs.models import JobCategory, JobPost
+
+User = get_user_model()
+
+WORDS = [
+    'pha chế', 'phục vụ', 'bảo vệ', 'lễ tân', 'giao hàng', 'bán hàng', 'dọn dẹp',
+    'sự kiện', 'cà phê', 'nhà hàng', 'khách sạn', 'siêu thị', 'ca sáng', 'ca tối',
+    'cuối tuần', 'part-time', 'sinh viên', 'tiếng anh', 'thu ngân', 'kho hàng',
+]
+
+SYLLABLES = ['an', 'bao', 'cam', 'dan', 'giang', 'hoa', 'khanh', 'lam', 'minh', 'nam',
+             'phuc', 'quang', 'son', 'thanh', 'uyen', 'vinh', 'xuan', 'yen']
+
+KEYWORDS = ['pha chế', 'bảo vệ ca tối', 'tiếng anh', 'giao', 'khách sạn lễ tân', 'kho',
+            'minhson', 'xuanyenthanh']
+
+
+class Command(BaseCommand):
+    help = 'Đo độ trễ tìm kiếm từ khóa (FTS5 so với icontains) trên dữ liệu giả lập'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--posts', type=int, default=100000,
+                            help='Số bài đăng giả lập (mặc định 100000)')
+        parser.add_argument('--repeat', type=int, default=20,
+                            help='Số lần lặp cho mỗi từ khóa')
+
+    def handle(self, *args, **options):
+        if not search.is_available():
+            self.stdout.write(self.style.WARNING('CSDL hiện tại không hỗ trợ FTS5, chỉ đo icontains'))
+
+        # Toàn bộ dữ liệu giả lập được rollback khi kết thúc
+        with transaction.atomic():
+            self.populate(options['posts'])
+            self.run(options['repeat'])
+            transaction.set_rollback(True)
+
+    def populate(self, count):
+        """Tạo `count` bài đăng giả lập và đánh chỉ mục"""
+        rng = random.Random(42)
+        category, _ = JobCategory.objects.get_or_create(name='Benchmark')
+        employer = User.objects.create(
+            username='benchmark_employer', email='benchmark@example.com', user_type='employer'
+        )
+        today = timezone.now().date()
+        # Từ vựng phân bố lệch (Zipf): vài từ phổ biến, còn lại là từ hiếm
+        vocabulary = WORDS + [a + b + c for a in SYLLABLES for b in SYLLABLES for c in SYLLABLES]
+        weights = [1 / (rank + 1) for rank in range(len(vocabulary))]
+
+        started = time.perf_counter()
+        batch = []
+        for i in range(count):
+            batch.append(JobPost(
+                title=' '.join(rng.choices(vocabulary, weights, k=4)),
+                description=' '.join(rng.choices(vocabulary, weights, k=30)),
+                required_skills=', '.join(rng.choices(vocabulary, weights, k=3)),
+                employer=employer,
+                category=category,
+                location='TP.HCM',
+                work_date=today + timedelta(days=i % 30),
+                work_time_start=dtime(8, 0),
+                work_time_end=dtime(17, 0),
+                duration_hours=8,
+                payment_amount=50000,
+                status='published',
+            ))
+            if len(batch) == 5000:
+                JobPost.objects.bulk_create(batch)
+                batch = []
+        JobPost.objects.bulk_create(batch)
+        indexed = search.rebuild_index()
+        self.stdout.write(
+            f'Đã tạo {count} bài đăng, đánh chỉ mục {indexed} tài liệu '
+            f'trong {time.perf_counter() - started:.1f}s'
+        )
+
+    def run(self, repeat):
+        base = JobPost.objects.filter(status='published')
+        for keyword in KEYWORDS:
+            like_qs = base.filter(
+                Q(title__icontains=keyword) |
+                Q(description__icontains=keyword) |
+                Q(required_skills__icontains=keyword)
+            ).order_by('-created_at')
+            line = f'{keyword!r:22} icontains {self.measure(like_qs, repeat)}'
+            if search.is_available():
+                fts_qs = search.filter_jobs(base, keyword)
+                line += f' | fts5 {self.measure(fts_qs, repeat)}'
+            self.stdout.write(line)
+
+    def measure(self, queryset, repeat):
+        """Thời gian lấy trang đầu (12 dòng) + đếm tổng, trả về median/p95 (ms)"""
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            list(queryset.values_list('id', flat=True)[:12])
+            queryset.count()
+            timings.append((time.perf_counter() - started) * 1000)
+        timings.sort()
+        p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+        return f'median {statistics.median(timings):7.2f}ms p95 {p95:7.2f}ms'
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from jobs import facets
+
+
+class Command(BaseCommand):
+    help = 'Tính lại bảng đếm facet (JobFacetCount) từ các job đang đăng'
+
+    def handle(self, *args, **options):
+        total = facets.rebuild()
+        self.stdout.write(self.style.SUCCESS(f'Đã tính lại facet cho {total} công việc đang đăng'))
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from jobs import search
+
+
+class Command(BaseCommand):
+    help = 'Xây dựng lại chỉ mục tìm kiếm toàn văn cho bài đăng việc làm'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        if not search.is_available():
+            self.stdout.write(self.style.WARNING('CSDL hiện tại không hỗ trợ chỉ mục FTS5'))
+            return
+
+        total = search.rebuild_index(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Đã đánh chỉ mục {total} bài đăng'))
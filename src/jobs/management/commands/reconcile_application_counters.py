@@ -0,0 +1,53 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Count, Q
+from jobs.models import JobPost, JobApplication
+
+COUNTER_FIELDS = ('applications_count',) + tuple(JobApplication.STATUS_COUNTER_FIELDS.values())
+
+
+def counted_jobs(queryset):
+    """Annotate số đơn thực tế (tổng và theo trạng thái) cho từng JobPost"""
+    annotations = {'actual_applications_count': Count('applications')}
+    for status, field in JobApplication.STATUS_COUNTER_FIELDS.items():
+        annotations[f'actual_{field}'] = Count('applications', filter=Q(applications__status=status))
+    return queryset.annotate(**annotations)
+
+
+class Command(BaseCommand):
+    help = 'Đối soát bộ đếm đơn ứng tuyển trên JobPost với bảng JobApplication'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--dry-run', action='store_true',
+                            help='Chỉ báo cáo các job bị lệch, không sửa')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        checked = fixed = 0
+        last_id = 0
+        
+        while True:
+            rows = list(
+                counted_jobs(JobPost.objects.filter(pk__gt=last_id))
+                .order_by('pk')
+                .values('pk', *COUNTER_FIELDS, *(f'actual_{field}' for field in COUNTER_FIELDS))[:batch_size]
+            )
+            if not rows:
+                break
+            
+            for row in rows:
+                actual = {field: row[f'actual_{field}'] for field in COUNTER_FIELDS}
+                if any(row[field] != value for field, value in actual.items()):
+                    fixed += 1
+                    self.stdout.write(f'Job #{row["pk"]}: ' + ', '.join(
+                        f'{field} {row[field]} -> {value}' for field, value in actual.items()
+                        if row[field] != value
+                    ))
+                    if not options['dry_run']:
+                        JobPost.objects.filter(pk=row['pk']).update(**actual)
+            
+            checked += len(rows)
+            last_id = rows[-1]['pk']
+        
+        verb = 'lệch' if options['dry_run'] else 'đã sửa'
+        self.stdout.write(self.style.SUCCESS(f'Đã kiểm tra {checked} công việc, {fixed} công việc {verb}'))
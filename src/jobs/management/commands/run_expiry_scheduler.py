@@ -0,0 +1,47 @@
+import datetime
+import time
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from jobs.expiry import ExpiryScheduler
+
+
+class Command(BaseCommand):
+    help = 'Tiến trình chạy nền: đóng mỗi công việc đúng thời điểm bắt đầu làm việc'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--horizon-hours', type=float, default=6,
+                            help='Chỉ giữ trong bộ nhớ các job bắt đầu trong N giờ tới (mặc định 6)')
+        parser.add_argument('--refresh-seconds', type=float, default=30,
+                            help='Chu kỳ đọc các job mới tạo/sửa từ CSDL (mặc định 30 giây)')
+
+    def handle(self, *args, **options):
+        scheduler = ExpiryScheduler(horizon=datetime.timedelta(hours=options['horizon_hours']))
+        refresh_every = options['refresh_seconds']
+
+        stats = scheduler.load(timezone.now())
+        self.stdout.write(
+            f'Khởi động: đóng {stats.rows_closed} job quá hạn, '
+            f'theo dõi {len(scheduler.heap)} job trong {options["horizon_hours"]} giờ tới'
+        )
+
+        next_refresh = time.monotonic() + refresh_every
+        try:
+            while True:
+                now = timezone.now()
+                closed = scheduler.run_due(now)
+                if closed:
+                    self.stdout.write(f'{now:%H:%M:%S} đóng {closed} job đến giờ bắt đầu')
+
+                if time.monotonic() >= next_refresh:
+                    scheduler.refresh(now)
+                    next_refresh = time.monotonic() + refresh_every
+
+                wait = min(
+                    scheduler.seconds_until_next(timezone.now(), refresh_every),
+                    max(0.0, next_refresh - time.monotonic()),
+                )
+                time.sleep(wait)
+        except KeyboardInterrupt:
+            self.stdout.write('Dừng lịch đóng job.')
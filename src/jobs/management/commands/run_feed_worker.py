@@ -0,0 +1,33 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from jobs import feed
+
+
+class Command(BaseCommand):
+    help = 'Tiến trình chạy nền: xử lý hàng đợi fan-out/tính lại feed "Việc làm cho bạn"'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=feed.QUEUE_BATCH_SIZE,
+                            help=f'Số dòng hàng đợi xử lý mỗi lượt (mặc định {feed.QUEUE_BATCH_SIZE})')
+        parser.add_argument('--poll-seconds', type=float, default=2,
+                            help='Thời gian chờ khi hàng đợi trống (mặc định 2 giây)')
+        parser.add_argument('--once', action='store_true',
+                            help='Xử lý hết hàng đợi hiện tại rồi thoát (dùng cho cron)')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        total = 0
+        try:
+            while True:
+                processed = feed.process_pending(batch_size)
+                total += processed
+                if processed:
+                    continue
+                if options['once']:
+                    break
+                time.sleep(options['poll_seconds'])
+        except KeyboardInterrupt:
+            self.stdout.write('Dừng xử lý hàng đợi feed.')
+        self.stdout.write(self.style.SUCCESS(f'Đã xử lý {total} cập nhật feed'))
@@ -1,30 +1,46 @@
 from django.core.management.base import BaseCommand
 from django.utils import timezone
-import datetime
-from jobs.models import JobPost
+from jobs.expiry import close_expired_jobs, record_run
+from jobs.models import ExpiryRun
 
 class Command(BaseCommand):
     help = 'Cập nhật trạng thái công việc quá hạn ứng tuyển (quá thời gian bắt đầu làm việc)'
 
-    def handle(self, *args, **kwargs):
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500,
+                            help='Số job xử lý trong mỗi lệnh UPDATE (mặc định 500)')
+        parser.add_argument('--dry-run', action='store_true',
+                            help='Chỉ đếm số job sẽ bị đóng, không ghi vào CSDL')
+        parser.add_argument('--incremental', action='store_true',
+                            help='Chỉ xét các job bắt đầu hoặc được sửa sau lần chạy trước (phù hợp chạy mỗi phút)')
+
+    def handle(self, *args, **options):
         now = timezone.now()
         
-        # Lấy các công việc đã đăng nhưng chưa đóng
-        active_jobs = JobPost.objects.filter(status='published')
+        since = None
+        if options['incremental']:
+            last_run = ExpiryRun.objects.order_by('-cutoff').first()
+            if last_run:
+                since = last_run.cutoff
+        
+        stats = close_expired_jobs(
+            now=now,
+            since=since,
+            batch_size=options['batch_size'],
+            dry_run=options['dry_run'],
+        )
         
-        updated_count = 0
-        for job in active_jobs:
-            # Tạo datetime từ ngày làm việc và giờ bắt đầu
-            work_datetime = timezone.make_aware(
-                datetime.datetime.combine(job.work_date, job.work_time_start)
+        if options['dry_run']:
+            self.stdout.write(
+                f'[dry-run] {stats.rows_scanned} công việc sẽ bị đóng ({stats.elapsed_ms}ms)'
             )
-            
-            # Nếu đã quá thời gian bắt đầu, cập nhật trạng thái
-            if now >= work_datetime:
-                job.status = 'closed'
-                job.save(update_fields=['status'])
-                updated_count += 1
+            return
         
+        record_run(now, stats, incremental=since is not None)
         self.stdout.write(
-            self.style.SUCCESS(f'Đã đóng {updated_count} công việc quá hạn ứng tuyển')
-        )
\ No newline at end of file
+            self.style.SUCCESS(
+                f'Đã đóng {stats.rows_closed} công việc quá hạn ứng tuyển '
+                f'(quét {stats.rows_scanned} dòng, {stats.elapsed_ms}ms'
+                f'{", từ " + since.isoformat() if since else ""})'
+            )
+        )
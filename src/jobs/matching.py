@@ -0,0 +1,179 @@
+"""
+Ghép kỹ năng giữa người tìm việc và bài đăng việc làm.
+
+Mỗi worker/job được mã hóa thành vector thưa trên từ vựng kỹ năng
+(Skill.normalized_name + kỹ năng tự do đã chuẩn hóa), trọng số tf-idf nhị phân
+chuẩn hóa L2. Điểm ghép là tích vô hướng (cosine). Tích ma trận thưa được tính
+theo từng hàng qua chỉ mục ngược kỹ năng -> danh sách (hàng, trọng số), nên chi
+phí chỉ tỉ lệ với số cặp thực sự có chung kỹ năng.
+"""
+import heapq
+import math
+from collections import defaultdict
+
+from .skills import normalize_skill
+
+
+class SkillVocabulary:
+    """Ánh xạ tên kỹ năng đã chuẩn hóa -> chỉ số cột"""
+
+    def __init__(self, names=()):
+        self.index = {}
+        for name in names:
+            self.add(name)
+
+    def add(self, name):
+        name = normalize_skill(name)
+        if name and name not in self.index:
+            self.index[name] = len(self.index)
+        return self.index.get(name)
+
+    def encode(self, names):
+        """Tập tên kỹ năng -> tập chỉ số cột (thêm từ mới vào từ vựng)"""
+        return {term for term in (self.add(name) for name in names) if term is not None}
+
+    def __len__(self):
+        return len(self.index)
+
+
+class SparseSkillMatrix:
+    """
+    Ma trận thưa: mỗi hàng là một thực thể (worker hoặc job) với {cột: trọng số}.
+    Giữ thêm chỉ mục ngược theo cột để nhân ma trận mà không duyệt toàn bộ hàng.
+    """
+
+    def __init__(self):
+        self.rows = {}
+        self.postings = defaultdict(list)
+
+    def add_row(self, key, weights):
+        self.rows[key] = weights
+        for term, weight in weights.items():
+            self.postings[term].append((key, weight))
+
+    def dot(self, weights):
+        """Tích vô hướng của vector `weights` với mọi hàng, trả về {key: điểm} (chỉ điểm > 0)"""
+        scores = defaultdict(float)
+        for term, weight in weights.items():
+            for key, other in self.postings.get(term, ()):
+                scores[key] += weight * other
+        return scores
+
+
+class MatchingEngine:
+    """
+    Tìm top-k job cho một worker và top-k worker cho một job.
+
+    `worker_skills` và `job_skills` là dict {id: iterable tên kỹ năng}.
+    """
+
+    def __init__(self, worker_skills, job_skills, vocabulary=None):
+        self.vocabulary = vocabulary or SkillVocabulary()
+        worker_terms = {key: self.vocabulary.encode(names) for key, names in worker_skills.items()}
+        job_terms = {key: self.vocabulary.encode(names) for key, names in job_skills.items()}
+
+        # idf tính trên toàn bộ tập worker + job
+        document_frequency = defaultdict(int)
+        for terms in list(worker_terms.values()) + list(job_terms.values()):
+            for term in terms:
+                document_frequency[term] += 1
+        total = len(worker_terms) + len(job_terms)
+        self.idf = {
+            term: math.log((1 + total) / (1 + frequency)) + 1
+            for term, frequency in document_frequency.items()
+        }
+        # idf của kỹ năng không có trong tập (df = 0)
+        self.default_idf = math.log(1 + total) + 1
+
+        self.workers = SparseSkillMatrix()
+        for key, terms in worker_terms.items():
+            if terms:
+                self.workers.add_row(key, self._weigh(terms))
+        self.jobs = SparseSkillMatrix()
+        for key, terms in job_terms.items():
+            if terms:
+                self.jobs.add_row(key, self._weigh(terms))
+
+    def _weigh(self, terms):
+        weights = {term: self.idf.get(term, self.default_idf) for term in terms}
+        norm = math.sqrt(sum(weight * weight for weight in weights.values()))
+        return {term: weight / norm for term, weight in weights.items()}
+
+    def encode(self, names):
+        """
+        Vector trọng số cho một tập kỹ năng bất kỳ theo idf của engine. Kỹ năng ngoài từ
+        vựng vẫn được tính (khóa theo tên, idf mặc định) để vector chuẩn hóa trên đủ tập
+        kỹ năng: chúng không khớp hàng nào nên chỉ làm giảm điểm, không bị bỏ qua.
+        """
+        terms = {self.vocabulary.index.get(name, name) for name in map(normalize_skill, names) if name}
+        return self._weigh(terms) if terms else {}
+
+    @staticmethod
+    def similarity(weights, other):
+        """Cosine của hai vector đã chuẩn hóa"""
+        if len(other) < len(weights):
+            weights, other = other, weights
+        return sum(weight * other.get(term, 0.0) for term, weight in weights.items())
+
+    @staticmethod
+    def _top(scores, k):
+        return heapq.nlargest(k, scores.items(), key=lambda item: (item[1], -item[0]))
+
+    def top_jobs_for_worker(self, worker_id, k=10):
+        """[(job_id, điểm)] của k job phù hợp nhất với worker"""
+        weights = self.workers.rows.get(worker_id)
+        if not weights:
+            return []
+        return self._top(self.jobs.dot(weights), k)
+
+    def top_workers_for_job(self, job_id, k=10):
+        """[(worker_id, điểm)] của k worker phù hợp nhất với job"""
+        weights = self.jobs.rows.get(job_id)
+        if not weights:
+            return []
+        return self._top(self.workers.dot(weights), k)
+
+    def _top_batch(self, rows, others, keys, k):
+        """
+        top-k cho nhiều hàng: các hàng có cùng tập kỹ năng (cùng vector trọng số) được
+        gộp lại, mỗi tập kỹ năng khác nhau chỉ nhân ma trận và chọn top-k một lần.
+        """
+        groups = defaultdict(list)
+        for key in keys:
+            weights = rows.get(key)
+            if weights:
+                groups[frozenset(weights)].append(key)
+        results = {key: [] for key in keys}
+        for members in groups.values():
+            top = self._top(others.dot(rows[members[0]]), k)
+            for key in members:
+                results[key] = list(top)
+        return results
+
+    def top_jobs_for_workers(self, worker_ids, k=10):
+        """Theo lô: {worker_id: top-k job}, một lần tính cho mỗi tập kỹ năng khác nhau"""
+        return self._top_batch(self.workers.rows, self.jobs, worker_ids, k)
+
+    def top_workers_for_jobs(self, job_ids, k=10):
+        """Theo lô: {job_id: top-k worker}, một lần tính cho mỗi tập kỹ năng khác nhau"""
+        return self._top_batch(self.jobs.rows, self.workers, job_ids, k)
+
+    @classmethod
+    def from_database(cls):
+        """Dựng engine từ các worker đang tìm việc và các job đang đăng"""
+        from accounts.models import Skill, UserProfile
+        from .models import JobPost
+
+        vocabulary = SkillVocabulary(
+            Skill.objects.filter(is_active=True).values_list('normalized_name', flat=True)
+        )
+        # Kỹ năng đã chuẩn hóa được lưu sẵn trên hồ sơ: một truy vấn cho mọi worker
+        worker_skills = dict(
+            UserProfile.objects.filter(user__user_type='worker', is_available=True)
+            .values_list('user_id', 'normalized_skills')
+        )
+        job_skills = {
+            job.pk: job.get_required_skills_list()
+            for job in JobPost.objects.filter(status='published').only('pk', 'required_skills')
+        }
+        return cls(worker_skills, job_skills, vocabulary=vocabulary)
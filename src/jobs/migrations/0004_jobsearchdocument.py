@@ -0,0 +1,57 @@
+# Generated by Django 5.2.6 on 2026-10-17 19:40
+
+import django.db.models.deletion
+import jobs.fields
+from django.db import migrations, models
+
+
+def create_search_table(apps, schema_editor):
+    """Tạo bảng ảo FTS5 và đánh chỉ mục các bài đăng hiện có (chỉ trên SQLite)"""
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute(
+        "CREATE VIRTUAL TABLE IF NOT EXISTS jobs_jobsearchdocument "
+        "USING fts5(title, description, required_skills, "
+        "tokenize = 'unicode61 remove_diacritics 2')"
+    )
+    # Trọng số bm25 mặc định cho cột ẩn `rank`: tiêu đề > kỹ năng > mô tả
+    schema_editor.execute(
+        "INSERT INTO jobs_jobsearchdocument (jobs_jobsearchdocument, rank) "
+        "VALUES ('rank', 'bm25(10.0, 1.0, 5.0)')"
+    )
+    schema_editor.execute(
+        "INSERT INTO jobs_jobsearchdocument (rowid, title, description, required_skills) "
+        "SELECT id, title, description, required_skills FROM jobs_jobpost"
+    )
+
+
+def drop_search_table(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute("DROP TABLE IF EXISTS jobs_jobsearchdocument")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0003_remove_experience_required'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobSearchDocument',
+            fields=[
+                ('job', models.OneToOneField(db_column='rowid', on_delete=django.db.models.deletion.DO_NOTHING, primary_key=True, related_name='search_document', serialize=False, to='jobs.jobpost')),
+                ('title', models.TextField()),
+                ('description', models.TextField()),
+                ('required_skills', models.TextField()),
+                ('document', jobs.fields.FullTextSearchField(db_column='jobs_jobsearchdocument')),
+                ('rank', models.FloatField()),
+            ],
+            options={
+                'db_table': 'jobs_jobsearchdocument',
+                'managed': False,
+            },
+        ),
+        migrations.RunPython(create_search_table, drop_search_table),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.6 on 2026-10-17 19:44
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0004_jobsearchdocument'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='jobpost',
+            index=models.Index(fields=['status', '-created_at', '-id'], name='jobpost_status_created_idx'),
+        ),
+    ]
@@ -0,0 +1,56 @@
+# Generated by Django 5.2.6 on 2026-10-17 19:46
+
+from django.conf import settings
+import datetime
+
+from django.db import migrations, models
+from django.utils import timezone
+
+BATCH_SIZE = 500
+
+
+def backfill_work_window(apps, schema_editor):
+    """Tính start_at/end_at cho các bài đăng cũ theo từng lô (chạy lại được)"""
+    JobPost = apps.get_model('jobs', 'JobPost')
+    last_id = 0
+    while True:
+        batch = list(
+            JobPost.objects.filter(pk__gt=last_id, start_at__isnull=True)
+            .order_by('pk')
+            .only('pk', 'work_date', 'work_time_start', 'work_time_end')[:BATCH_SIZE]
+        )
+        if not batch:
+            break
+        for job in batch:
+            job.start_at = timezone.make_aware(datetime.datetime.combine(job.work_date, job.work_time_start))
+            job.end_at = timezone.make_aware(datetime.datetime.combine(job.work_date, job.work_time_end))
+            if job.end_at < job.start_at:
+                job.end_at += datetime.timedelta(days=1)
+        JobPost.objects.bulk_update(batch, ['start_at', 'end_at'])
+        last_id = batch[-1].pk
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0006_hot_path_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='jobpost',
+            name='end_at',
+            field=models.DateTimeField(blank=True, editable=False, help_text='Thời điểm kết thúc làm việc (tự động)', null=True),
+        ),
+        migrations.AddField(
+            model_name='jobpost',
+            name='start_at',
+            field=models.DateTimeField(blank=True, editable=False, help_text='Thời điểm bắt đầu làm việc (tự động)', null=True),
+        ),
+        migrations.AddIndex(
+            model_name='jobpost',
+            index=models.Index(fields=['status', 'start_at'], name='jobpost_status_start_idx'),
+        ),
+        migrations.RunPython(backfill_work_window, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.6 on 2026-10-17 19:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0007_jobpost_start_end_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExpiryRun',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('cutoff', models.DateTimeField(db_index=True, help_text='Các job bắt đầu trước mốc này đã được xử lý')),
+                ('incremental', models.BooleanField(default=False)),
+                ('rows_scanned', models.PositiveIntegerField(default=0)),
+                ('rows_closed', models.PositiveIntegerField(default=0)),
+                ('elapsed_ms', models.PositiveIntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': 'Lần đóng job quá hạn',
+                'verbose_name_plural': 'Lần đóng job quá hạn',
+                'ordering': ['-cutoff'],
+            },
+        ),
+    ]
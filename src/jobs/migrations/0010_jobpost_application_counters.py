@@ -0,0 +1,70 @@
+# Generated by Django 5.2.6 on 2026-10-17 19:49
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Q
+
+BATCH_SIZE = 500
+
+
+def backfill_application_counters(apps, schema_editor):
+    """Tính bộ đếm đơn ứng tuyển cho các bài đăng hiện có theo từng lô"""
+    JobPost = apps.get_model('jobs', 'JobPost')
+    last_id = 0
+    while True:
+        batch = list(
+            JobPost.objects.filter(pk__gt=last_id).order_by('pk').annotate(
+                total=Count('applications'),
+                pending=Count('applications', filter=Q(applications__status='pending')),
+                accepted=Count('applications', filter=Q(applications__status='accepted')),
+                rejected=Count('applications', filter=Q(applications__status='rejected')),
+            )[:BATCH_SIZE]
+        )
+        if not batch:
+            break
+        for job in batch:
+            job.applications_count = job.total
+            job.pending_applications_count = job.pending
+            job.accepted_applications_count = job.accepted
+            job.rejected_applications_count = job.rejected
+        JobPost.objects.bulk_update(batch, [
+            'applications_count', 'pending_applications_count',
+            'accepted_applications_count', 'rejected_applications_count',
+        ])
+        last_id = batch[-1].pk
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0009_jobpost_updated_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='jobpost',
+            name='accepted_applications_count',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='jobpost',
+            name='applications_count',
+            field=models.IntegerField(default=0, editable=False, help_text='Tổng số đơn ứng tuyển'),
+        ),
+        migrations.AddField(
+            model_name='jobpost',
+            name='pending_applications_count',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='jobpost',
+            name='rejected_applications_count',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name='jobpost',
+            index=models.Index(fields=['employer', '-applications_count'], name='jobpost_employer_apps_idx'),
+        ),
+        migrations.RunPython(backfill_application_counters, migrations.RunPython.noop),
+    ]
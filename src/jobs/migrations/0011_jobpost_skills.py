@@ -0,0 +1,38 @@
+# Generated by Django 5.2.6 on 2026-10-17 19:54
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0004_alter_user_email_alter_user_phone_number'),
+        ('jobs', '0010_jobpost_application_counters'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='jobpost',
+            name='skills',
+            field=models.ManyToManyField(blank=True, editable=False, related_name='job_posts', to='accounts.skill'),
+        ),
+        migrations.AddField(
+            model_name='jobpost',
+            name='skills_indexed',
+            field=models.BooleanField(default=False, editable=False, help_text='required_skills đã được tách thành liên kết kỹ năng'),
+        ),
+        migrations.CreateModel(
+            name='JobSkillTag',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(db_index=True, help_text='Tên kỹ năng đã chuẩn hóa', max_length=100)),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='skill_tags', to='jobs.jobpost')),
+            ],
+            options={
+                'verbose_name': 'Kỹ năng tự do',
+                'verbose_name_plural': 'Kỹ năng tự do',
+                'unique_together': {('job', 'name')},
+            },
+        ),
+    ]
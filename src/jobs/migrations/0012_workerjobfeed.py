@@ -0,0 +1,32 @@
+# Generated by Django 5.2.6 on 2026-10-17 19:56
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0011_jobpost_skills'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WorkerJobFeed',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.FloatField(help_text='Độ phù hợp kỹ năng (cosine)')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='feed_entries', to='jobs.jobpost')),
+                ('worker', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='job_feed', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Việc làm gợi ý',
+                'verbose_name_plural': 'Việc làm gợi ý',
+                'indexes': [models.Index(fields=['worker', '-score'], name='workerfeed_worker_score_idx')],
+                'unique_together': {('worker', 'job')},
+            },
+        ),
+    ]
@@ -0,0 +1,57 @@
+# Generated by Django 5.2.6 on 2026-10-17 20:01
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import ExpressionWrapper, F
+from django.db.models.functions import Cast, Round
+
+
+def backfill_pay_columns(apps, schema_editor):
+    """Tính lương quy đổi theo giờ và tổng tiền bằng các lệnh UPDATE theo tập"""
+    JobPost = apps.get_model('jobs', 'JobPost')
+    decimal = models.DecimalField(max_digits=14, decimal_places=2)
+    JobPost.objects.filter(payment_type='hourly').update(
+        hourly_equivalent=F('payment_amount'),
+        total_payment=ExpressionWrapper(F('payment_amount') * F('duration_hours'), output_field=decimal),
+    )
+    JobPost.objects.exclude(payment_type='hourly').filter(duration_hours__gt=0).update(
+        # Cast sang số thực để SQLite không chia nguyên
+        hourly_equivalent=Round(
+            Cast('payment_amount', models.FloatField()) / F('duration_hours'), 2, output_field=decimal
+        ),
+        total_payment=F('payment_amount'),
+    )
+    JobPost.objects.exclude(payment_type='hourly').exclude(duration_hours__gt=0).update(
+        total_payment=F('payment_amount'),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0006_location_ids'),
+        ('jobs', '0013_location_ids'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='jobpost',
+            name='hourly_equivalent',
+            field=models.DecimalField(blank=True, decimal_places=2, editable=False, help_text='Lương quy đổi theo giờ (VND)', max_digits=12, null=True),
+        ),
+        migrations.AddField(
+            model_name='jobpost',
+            name='total_payment',
+            field=models.DecimalField(blank=True, decimal_places=2, editable=False, help_text='Tổng tiền cho công việc (VND)', max_digits=14, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='jobpost',
+            index=models.Index(fields=['status', 'hourly_equivalent'], name='jobpost_status_hourly_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobpost',
+            index=models.Index(fields=['status', 'total_payment'], name='jobpost_status_total_pay_idx'),
+        ),
+        migrations.RunPython(backfill_pay_columns, migrations.RunPython.noop),
+    ]
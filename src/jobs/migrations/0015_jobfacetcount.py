@@ -0,0 +1,75 @@
+# Generated by Django 5.2.6 on 2026-10-17 20:03
+
+from collections import Counter
+
+from django.db import migrations, models
+
+
+# Bản sao cố định của jobs.facets.facet_keys() tại thời điểm viết migration
+# (cận trên của các khoảng lương: lt25k, 25-40k, 40-60k, 60-100k, còn lại gte100k)
+PAY_BUCKET_LIMITS = (
+    ('lt25k', 25000),
+    ('25-40k', 40000),
+    ('40-60k', 60000),
+    ('60-100k', 100000),
+)
+
+
+def pay_bucket(hourly_equivalent):
+    if hourly_equivalent is None:
+        return None
+    for key, high in PAY_BUCKET_LIMITS:
+        if hourly_equivalent < high:
+            return key
+    return 'gte100k'
+
+
+def facet_keys(category_id, district_id, hourly_equivalent, work_date):
+    values = (
+        ('category', category_id),
+        ('district', district_id),
+        ('pay', pay_bucket(hourly_equivalent)),
+        ('date', work_date.isoformat() if work_date else None),
+    )
+    return [(dimension, str(value)) for dimension, value in values if value is not None]
+
+
+def populate_facet_counts(apps, schema_editor):
+    """Đếm facet ban đầu cho các job đang đăng"""
+    JobPost = apps.get_model('jobs', 'JobPost')
+    JobFacetCount = apps.get_model('jobs', 'JobFacetCount')
+    counts = Counter()
+    rows = JobPost.objects.filter(status='published').values_list(
+        'category_id', 'district_id', 'hourly_equivalent', 'work_date'
+    )
+    for row in rows.iterator(chunk_size=2000):
+        counts.update(facet_keys(*row))
+    JobFacetCount.objects.bulk_create([
+        JobFacetCount(dimension=dimension, value=value, count=count)
+        for (dimension, value), count in counts.items()
+    ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0014_jobpost_pay_columns'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobFacetCount',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('dimension', models.CharField(max_length=20)),
+                ('value', models.CharField(max_length=50)),
+                ('count', models.IntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'Số lượng theo facet',
+                'verbose_name_plural': 'Số lượng theo facet',
+                'unique_together': {('dimension', 'value')},
+            },
+        ),
+        migrations.RunPython(populate_facet_counts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,83 @@
+# Generated by Django 5.2.6 on 2026-10-17 20:08
+
+import re
+import unicodedata
+
+from django.db import migrations, models
+
+BATCH_SIZE = 500
+SEARCH_TABLE = 'jobs_jobsearchdocument'
+
+
+# Bản sao cố định của jobs.text.fold_words tại thời điểm viết migration
+_NON_WORD = re.compile(r'[^\w]+')
+
+
+def fold_words(text):
+    if not text:
+        return ''
+    text = text.lower().replace('đ', 'd')
+    text = unicodedata.normalize('NFD', text)
+    text = ''.join(char for char in text if not unicodedata.combining(char))
+    return ' '.join(_NON_WORD.sub(' ', text).replace('_', ' ').split())
+
+
+def backfill_search_columns(apps, schema_editor):
+    """
+    Ghi các cột tìm kiếm bỏ dấu cho bài đăng hiện có theo từng lô và đánh chỉ mục
+    lại tài liệu FTS5 (nếu có) trên văn bản đã bỏ dấu.
+    """
+    JobPost = apps.get_model('jobs', 'JobPost')
+    connection = schema_editor.connection
+    has_fts = connection.vendor == 'sqlite' and SEARCH_TABLE in connection.introspection.table_names()
+    last_id = 0
+    while True:
+        batch = list(
+            JobPost.objects.filter(pk__gt=last_id).order_by('pk')
+            .only('pk', 'title', 'location', 'required_skills', 'description')[:BATCH_SIZE]
+        )
+        if not batch:
+            break
+        for row in batch:
+            row.search_title = fold_words(row.title)
+            row.search_location = fold_words(row.location)
+            row.search_skills = fold_words(row.required_skills)
+        JobPost.objects.bulk_update(batch, ['search_title', 'search_location', 'search_skills'])
+        if has_fts:
+            with connection.cursor() as cursor:
+                cursor.executemany(
+                    f'DELETE FROM {SEARCH_TABLE} WHERE rowid = %s', [[row.pk] for row in batch]
+                )
+                cursor.executemany(
+                    f'INSERT INTO {SEARCH_TABLE} (rowid, title, description, required_skills) '
+                    f'VALUES (%s, %s, %s, %s)',
+                    [[row.pk, row.search_title, fold_words(row.description), row.search_skills]
+                     for row in batch]
+                )
+        last_id = batch[-1].pk
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0015_jobfacetcount'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='jobpost',
+            name='search_location',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=200),
+        ),
+        migrations.AddField(
+            model_name='jobpost',
+            name='search_skills',
+            field=models.TextField(blank=True, editable=False),
+        ),
+        migrations.AddField(
+            model_name='jobpost',
+            name='search_title',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=200),
+        ),
+        migrations.RunPython(backfill_search_columns, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.6 on 2026-10-17 20:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0016_search_columns'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FeedUpdate',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('job', 'Fan-out job'), ('worker', 'Tính lại feed worker')], max_length=10)),
+                ('target_id', models.PositiveIntegerField(help_text='ID job hoặc ID người dùng (worker)')),
+                ('queued_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': 'Cập nhật feed chờ xử lý',
+                'verbose_name_plural': 'Cập nhật feed chờ xử lý',
+                'ordering': ['queued_at'],
+                'unique_together': {('kind', 'target_id')},
+            },
+        ),
+    ]
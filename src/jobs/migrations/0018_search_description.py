@@ -0,0 +1,60 @@
+# Generated by Django 5.2.6 on 2026-10-17 20:24
+
+import re
+import unicodedata
+
+from django.db import migrations, models
+
+BATCH_SIZE = 500
+
+# Bản sao cố định của jobs.text.fold_words tại thời điểm viết migration
+_NON_WORD = re.compile(r'[^\w]+')
+
+
+def fold_words(text):
+    if not text:
+        return ''
+    text = text.lower().replace('đ', 'd')
+    text = unicodedata.normalize('NFD', text)
+    text = ''.join(char for char in text if not unicodedata.combining(char))
+    return ' '.join(_NON_WORD.sub(' ', text).replace('_', ' ').split())
+
+
+def backfill_search_description(apps, schema_editor):
+    """Ghi cột search_description (mô tả bỏ dấu) cho bài đăng hiện có theo từng lô"""
+    JobPost = apps.get_model('jobs', 'JobPost')
+    last_id = 0
+    while True:
+        batch = list(JobPost.objects.filter(pk__gt=last_id).order_by('pk').only('pk', 'description')[:BATCH_SIZE])
+        if not batch:
+            break
+        for row in batch:
+            row.search_description = fold_words(row.description)
+        JobPost.objects.bulk_update(batch, ['search_description'])
+        last_id = batch[-1].pk
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0017_feedupdate'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='jobpost',
+            name='search_description',
+            field=models.TextField(blank=True, editable=False),
+        ),
+        migrations.AlterField(
+            model_name='jobpost',
+            name='search_location',
+            field=models.CharField(blank=True, editable=False, max_length=200),
+        ),
+        migrations.AlterField(
+            model_name='jobpost',
+            name='search_title',
+            field=models.CharField(blank=True, editable=False, max_length=200),
+        ),
+        migrations.RunPython(backfill_search_description, migrations.RunPython.noop),
+    ]
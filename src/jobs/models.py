@@ -1,7 +1,12 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models import F
 from django.conf import settings
 from django.utils import timezone
 import datetime
+from decimal import Decimal
+from .fields import FullTextSearchField
+from .locations import resolve as resolve_location
+from .text import fold_words
 
 class JobCategory(models.Model):
     """
@@ -55,6 +60,18 @@ class JobPost(models.Model):
     
     # Địa điểm và thời gian
     location = models.CharField(max_length=200, help_text='Địa điểm làm việc')
+    # Mã tỉnh/thành và quận/huyện (GSO) chuẩn hóa từ location khi lưu, xem jobs.locations
+    province_id = models.PositiveSmallIntegerField(null=True, blank=True, editable=False,
+                                                   help_text='Mã tỉnh/thành (tự động)')
+    district_id = models.PositiveSmallIntegerField(null=True, blank=True, editable=False,
+                                                   help_text='Mã quận/huyện (tự động)')
+    # Bản bỏ dấu, chữ thường của title/location/description/required_skills (jobs.text.fold_words),
+    # ghi khi lưu. Lọc bằng LIKE '%...%' nên không đánh chỉ mục B-tree; trên SQLite từ khóa
+    # đi qua chỉ mục FTS5 (jobs.search) được dựng từ chính các cột này.
+    search_title = models.CharField(max_length=200, blank=True, editable=False)
+    search_location = models.CharField(max_length=200, blank=True, editable=False)
+    search_description = models.TextField(blank=True, editable=False)
+    search_skills = models.TextField(blank=True, editable=False)
     work_date = models.DateField(help_text='Ngày làm việc')
     work_time_start = models.TimeField(help_text='Giờ bắt đầu')
     work_time_end = models.TimeField(help_text='Giờ kết thúc')
@@ -65,10 +82,20 @@ class JobPost(models.Model):
     payment_type = models.CharField(max_length=10, choices=PAYMENT_TYPES, default='hourly')
     payment_amount = models.DecimalField(max_digits=10, decimal_places=2, 
                                         help_text='Số tiền (VND)')
+    # Quy đổi khi lưu để lọc/sắp xếp theo lương bằng truy vấn range trên chỉ mục
+    hourly_equivalent = models.DecimalField(max_digits=12, decimal_places=2, null=True, blank=True,
+                                            editable=False, help_text='Lương quy đổi theo giờ (VND)')
+    total_payment = models.DecimalField(max_digits=14, decimal_places=2, null=True, blank=True,
+                                        editable=False, help_text='Tổng tiền cho công việc (VND)')
     
     # Yêu cầu
     required_skills = models.TextField(blank=True, 
                                       help_text='Kỹ năng yêu cầu (cách nhau bởi dấu phẩy)')
+    # Kỹ năng tách từ required_skills khi lưu (phần không khớp Skill nằm ở JobSkillTag)
+    skills = models.ManyToManyField('accounts.Skill', blank=True, related_name='job_posts',
+                                    editable=False)
+    skills_indexed = models.BooleanField(default=False, editable=False,
+                                         help_text='required_skills đã được tách thành liên kết kỹ năng')
     # Trường experience_required đã bị loại bỏ
     number_of_workers = models.PositiveIntegerField(default=1, 
                                                    help_text='Số lượng người cần tuyển')
@@ -82,6 +109,18 @@ class JobPost(models.Model):
                                               help_text='Không sử dụng - Sẽ tự động lấy theo thời gian bắt đầu')
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    # Thời điểm bắt đầu/kết thúc công việc, tự tính từ work_date + giờ làm khi lưu
+    start_at = models.DateTimeField(null=True, blank=True, editable=False,
+                                    help_text='Thời điểm bắt đầu làm việc (tự động)')
+    end_at = models.DateTimeField(null=True, blank=True, editable=False,
+                                  help_text='Thời điểm kết thúc làm việc (tự động)')
+    
+    # Bộ đếm đơn ứng tuyển, cập nhật nguyên tử bằng F() khi JobApplication thay đổi
+    applications_count = models.IntegerField(default=0, editable=False,
+                                             help_text='Tổng số đơn ứng tuyển')
+    pending_applications_count = models.IntegerField(default=0, editable=False)
+    accepted_applications_count = models.IntegerField(default=0, editable=False)
+    rejected_applications_count = models.IntegerField(default=0, editable=False)
     
     # Contact info
     contact_phone = models.CharField(max_length=15, blank=True)
@@ -91,35 +130,147 @@ class JobPost(models.Model):
         verbose_name = 'Bài đăng việc làm'
         verbose_name_plural = 'Bài đăng việc làm'
         ordering = ['-created_at', '-priority']
+        indexes = [
+            # Danh sách công khai + phân trang keyset theo (created_at, id)
+            models.Index(fields=['status', '-created_at', '-id'], name='jobpost_status_created_idx'),
+            # Trang "Việc làm của tôi": lọc theo employer + trạng thái + ngày làm việc
+            models.Index(fields=['employer', 'status', 'work_date'], name='jobpost_employer_status_idx'),
+            models.Index(fields=['employer', '-created_at'], name='jobpost_employer_created_idx'),
+            # Tìm các job đã đến giờ bắt đầu: status = 'published' AND start_at <= now
+            models.Index(fields=['status', 'start_at'], name='jobpost_status_start_idx'),
+            # Lịch đóng job (run_expiry_scheduler) đọc các bài vừa tạo/sửa theo updated_at
+            models.Index(fields=['updated_at'], name='jobpost_updated_idx'),
+            # Lọc/sắp xếp theo số ứng viên trong "Việc làm của tôi"
+            models.Index(fields=['employer', '-applications_count'], name='jobpost_employer_apps_idx'),
+            # Lọc theo địa điểm: so khớp chính xác mã tỉnh/quận trên danh sách công khai
+            models.Index(fields=['province_id', 'status', '-created_at'], name='jobpost_province_idx'),
+            models.Index(fields=['district_id', 'status', '-created_at'], name='jobpost_district_idx'),
+            # Lọc khoảng lương và sắp xếp "lương cao nhất"
+            models.Index(fields=['status', 'hourly_equivalent'], name='jobpost_status_hourly_idx'),
+            models.Index(fields=['status', 'total_payment'], name='jobpost_status_total_pay_idx'),
+        ]
     
     def __str__(self):
         return f"{self.title} - {self.category.name}"
     
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Lưu lại giá trị lúc tải từ CSDL để signals biết trường nào đã đổi"""
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
+    
+    def get_loaded_value(self, field_name, default=None):
+        """Giá trị của trường tại thời điểm tải từ CSDL (default nếu là bản ghi mới)"""
+        return getattr(self, '_loaded_values', {}).get(field_name, default)
+    
     def get_required_skills_list(self):
-        """Trả về danh sách kỹ năng yêu cầu dưới dạng list"""
-        return [skill.strip() for skill in self.required_skills.split(',') if skill.strip()]
+        """Trả về danh sách kỹ năng yêu cầu dưới dạng list (tách một lần cho mỗi giá trị)"""
+        cached = getattr(self, '_required_skills_cache', None)
+        if cached is None or cached[0] != self.required_skills:
+            skills = [skill.strip() for skill in self.required_skills.split(',') if skill.strip()]
+            cached = self._required_skills_cache = (self.required_skills, skills)
+        return cached[1]
+    
+    def get_work_window(self):
+        """Trả về (start_at, end_at) tính từ ngày và giờ làm việc"""
+        start_at = timezone.make_aware(datetime.datetime.combine(self.work_date, self.work_time_start))
+        end_at = timezone.make_aware(datetime.datetime.combine(self.work_date, self.work_time_end))
+        # Giờ kết thúc nhỏ hơn giờ bắt đầu: ca làm kết thúc vào ngày hôm sau
+        if end_at < start_at:
+            end_at += datetime.timedelta(days=1)
+        return start_at, end_at
     
     def is_expired(self):
         """Kiểm tra xem bài đăng có hết hạn không (quá thời gian bắt đầu làm việc)"""
-        now = timezone.now()
-        work_datetime = timezone.make_aware(datetime.datetime.combine(self.work_date, self.work_time_start))
-        return now >= work_datetime
+        start_at = self.start_at or self.get_work_window()[0]
+        return timezone.now() >= start_at
+    
+    @property
+    def effective_status(self):
+        """Trạng thái thực tế tại thời điểm đọc: job đã đến giờ bắt đầu coi như 'closed'"""
+        if self.status == 'published' and self.is_expired():
+            return 'closed'
+        return self.status
+    
+    @staticmethod
+    def _as_decimal(value):
+        """Giá trị gán trực tiếp có thể là int/float (chưa qua to_python): quy về Decimal"""
+        return value if isinstance(value, Decimal) else Decimal(str(value))
     
     def calculate_total_payment(self):
         """Tính tổng tiền cho công việc"""
         if self.payment_type == 'hourly':
-            return self.payment_amount * self.duration_hours
+            return self._as_decimal(self.payment_amount) * self._as_decimal(self.duration_hours)
         else:
             return self.payment_amount
+    
+    def calculate_hourly_equivalent(self):
+        """Lương quy đổi theo giờ: lương ngày/cố định chia cho số giờ làm việc"""
+        if self.payment_type == 'hourly':
+            return self.payment_amount
+        if not self.duration_hours:
+            return None
+        hourly = self._as_decimal(self.payment_amount) / self._as_decimal(self.duration_hours)
+        return hourly.quantize(Decimal('0.01'))
+    
+    PAYMENT_FIELDS = ('payment_type', 'payment_amount', 'duration_hours')
             
+    # Cột tìm kiếm đã chuẩn hóa -> trường gốc
+    SEARCH_FIELDS = {
+        'search_title': 'title',
+        'search_location': 'location',
+        'search_description': 'description',
+        'search_skills': 'required_skills',
+    }
+    
+    def _field_changed(self, field_name, update_fields):
+        """Trường có thể đã đổi và sẽ được ghi trong lần save() này"""
+        if self._state.adding:
+            return True
+        if update_fields is not None:
+            return field_name in update_fields
+        loaded = getattr(self, '_loaded_values', {})
+        return loaded.get(field_name) != getattr(self, field_name)
+    
     def save(self, *args, **kwargs):
-        """Tự động cập nhật application_deadline theo thời gian bắt đầu công việc"""
-        # Nếu đã có ngày làm việc và giờ bắt đầu, cập nhật application_deadline
-        if self.work_date and self.work_time_start:
-            self.application_deadline = timezone.make_aware(
-                datetime.datetime.combine(self.work_date, self.work_time_start)
-            )
+        """
+        Tự động cập nhật start_at/end_at và application_deadline theo thời gian làm việc,
+        chuẩn hóa địa điểm, cột tìm kiếm không dấu và tách lại liên kết kỹ năng khi
+        location/required_skills thay đổi
+        """
+        update_fields = kwargs.get('update_fields')
+        skills_changed = self._field_changed('required_skills', update_fields)
+        for search_field, source in self.SEARCH_FIELDS.items():
+            if self._field_changed(source, update_fields):
+                setattr(self, search_field, fold_words(getattr(self, source)))
+                if update_fields is not None:
+                    kwargs['update_fields'] = set(kwargs['update_fields']) | {search_field}
+        if self._field_changed('location', update_fields):
+            self.province_id, self.district_id = resolve_location(self.location)
+            if update_fields is not None:
+                kwargs['update_fields'] = set(kwargs['update_fields']) | {'province_id', 'district_id'}
+        if self.payment_amount is not None and self.duration_hours is not None:
+            self.hourly_equivalent = self.calculate_hourly_equivalent()
+            self.total_payment = self.calculate_total_payment()
+            if update_fields is not None and set(self.PAYMENT_FIELDS) & set(update_fields):
+                kwargs['update_fields'] = set(kwargs['update_fields']) | {'hourly_equivalent', 'total_payment'}
+        # Nếu đã có ngày và giờ làm việc, cập nhật các mốc thời gian
+        if self.work_date and self.work_time_start and self.work_time_end:
+            self.start_at, self.end_at = self.get_work_window()
+            self.application_deadline = self.start_at
+            
+            update_fields = kwargs.get('update_fields')
+            if update_fields is not None and {'work_date', 'work_time_start', 'work_time_end'} & set(update_fields):
+                kwargs['update_fields'] = set(update_fields) | {'start_at', 'end_at', 'application_deadline'}
         super().save(*args, **kwargs)
+        if skills_changed:
+            from .skills import sync_job_skills
+            sync_job_skills(self)
+        # Signals đã xử lý xong, cập nhật lại ảnh chụp giá trị đã lưu
+        self._loaded_values = {
+            field.attname: getattr(self, field.attname) for field in self._meta.concrete_fields
+        }
 
 class JobApplication(models.Model):
     """
@@ -149,6 +300,175 @@ class JobApplication(models.Model):
         verbose_name_plural = 'Đơn ứng tuyển'
         unique_together = ['job', 'applicant']  # Mỗi người chỉ được ứng tuyển 1 lần cho 1 job
         ordering = ['-applied_at']
+        indexes = [
+            # "Đơn ứng tuyển của tôi" và danh sách ứng viên của một job, mới nhất trước
+            models.Index(fields=['applicant', '-applied_at'], name='jobapp_applicant_applied_idx'),
+            models.Index(fields=['job', '-applied_at'], name='jobapp_job_applied_idx'),
+        ]
+    
+    # Bộ đếm trên JobPost ứng với từng trạng thái đơn
+    STATUS_COUNTER_FIELDS = {
+        'pending': 'pending_applications_count',
+        'accepted': 'accepted_applications_count',
+        'rejected': 'rejected_applications_count',
+    }
     
     def __str__(self):
         return f"{self.applicant.username} ứng tuyển {self.job.title}"
+    
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_status = dict(zip(field_names, values)).get('status')
+        return instance
+    
+    def get_counter_changes(self, old_status, new_status):
+        """Độ thay đổi của các bộ đếm trên JobPost khi đơn chuyển trạng thái"""
+        changes = {}
+        if old_status in self.STATUS_COUNTER_FIELDS:
+            changes[self.STATUS_COUNTER_FIELDS[old_status]] = -1
+        if new_status in self.STATUS_COUNTER_FIELDS:
+            field = self.STATUS_COUNTER_FIELDS[new_status]
+            changes[field] = changes.get(field, 0) + 1
+        return {field: delta for field, delta in changes.items() if delta}
+    
+    def save(self, *args, **kwargs):
+        """Lưu đơn và cập nhật bộ đếm của JobPost trong cùng transaction"""
+        adding = self._state.adding
+        old_status = getattr(self, '_loaded_status', None)
+        
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            if adding:
+                changes = self.get_counter_changes(None, self.status)
+                changes['applications_count'] = 1
+            elif old_status is not None and old_status != self.status:
+                changes = self.get_counter_changes(old_status, self.status)
+            else:
+                changes = {}
+            if changes:
+                JobPost.objects.filter(pk=self.job_id).update(
+                    **{field: F(field) + delta for field, delta in changes.items()}
+                )
+        self._loaded_status = self.status
+
+
+class JobSkillTag(models.Model):
+    """
+    Kỹ năng yêu cầu không có trong danh sách Skill, lưu dạng đã chuẩn hóa
+    """
+    job = models.ForeignKey(JobPost, on_delete=models.CASCADE, related_name='skill_tags')
+    name = models.CharField(max_length=100, db_index=True, help_text='Tên kỹ năng đã chuẩn hóa')
+    
+    class Meta:
+        verbose_name = 'Kỹ năng tự do'
+        verbose_name_plural = 'Kỹ năng tự do'
+        unique_together = ['job', 'name']
+    
+    def __str__(self):
+        return self.name
+
+
+class WorkerJobFeed(models.Model):
+    """
+    Danh sách việc làm phù hợp được tính sẵn cho từng người tìm việc ("Việc làm cho bạn").
+    Ghi khi job được đăng (fan-out), xóa khi job đóng; mỗi worker giữ tối đa JOB_FEED_SIZE dòng.
+    """
+    worker = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE,
+                               related_name='job_feed')
+    job = models.ForeignKey(JobPost, on_delete=models.CASCADE, related_name='feed_entries')
+    score = models.FloatField(help_text='Độ phù hợp kỹ năng (cosine)')
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        verbose_name = 'Việc làm gợi ý'
+        verbose_name_plural = 'Việc làm gợi ý'
+        unique_together = ['worker', 'job']
+        indexes = [
+            # Đọc feed: một lần quét chỉ mục theo worker, điểm cao nhất trước
+            models.Index(fields=['worker', '-score'], name='workerfeed_worker_score_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.worker_id} - {self.job_id} ({self.score:.2f})"
+
+
+class FeedUpdate(models.Model):
+    """
+    Hàng đợi cập nhật feed: job cần fan-out hoặc worker cần tính lại feed.
+    Ghi từ signals (ngoài request chỉ tốn một INSERT), xử lý bởi lệnh run_feed_worker.
+    Mỗi đối tượng chỉ có một dòng chờ nên nhiều thay đổi liên tiếp được gộp làm một.
+    """
+    KIND_CHOICES = [
+        ('job', 'Fan-out job'),
+        ('worker', 'Tính lại feed worker'),
+    ]
+
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    target_id = models.PositiveIntegerField(help_text='ID job hoặc ID người dùng (worker)')
+    queued_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = 'Cập nhật feed chờ xử lý'
+        verbose_name_plural = 'Cập nhật feed chờ xử lý'
+        unique_together = ['kind', 'target_id']
+        ordering = ['queued_at']
+
+    def __str__(self):
+        return f"{self.kind} {self.target_id}"
+
+
+class JobFacetCount(models.Model):
+    """
+    Số job 'published' theo từng giá trị facet (danh mục, quận/huyện, khoảng lương, ngày).
+    Cập nhật tăng/giảm qua signals, dựng lại bằng lệnh rebuild_job_facets.
+    """
+    dimension = models.CharField(max_length=20)
+    value = models.CharField(max_length=50)
+    count = models.IntegerField(default=0)
+    
+    class Meta:
+        verbose_name = 'Số lượng theo facet'
+        verbose_name_plural = 'Số lượng theo facet'
+        unique_together = ['dimension', 'value']
+    
+    def __str__(self):
+        return f"{self.dimension}={self.value}: {self.count}"
+
+
+class ExpiryRun(models.Model):
+    """
+    Nhật ký mỗi lần chạy đóng job quá hạn (update_expired_jobs), giữ JOB_EXPIRY_RUN_RETENTION_DAYS ngày.
+    Mốc `cutoff` của lần chạy gần nhất là điểm bắt đầu cho chế độ incremental.
+    """
+    cutoff = models.DateTimeField(db_index=True, help_text='Các job bắt đầu trước mốc này đã được xử lý')
+    incremental = models.BooleanField(default=False)
+    rows_scanned = models.PositiveIntegerField(default=0)
+    rows_closed = models.PositiveIntegerField(default=0)
+    elapsed_ms = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        verbose_name = 'Lần đóng job quá hạn'
+        verbose_name_plural = 'Lần đóng job quá hạn'
+        ordering = ['-cutoff']
+    
+    def __str__(self):
+        return f"{self.cutoff:%d/%m/%Y %H:%M} - đóng {self.rows_closed}/{self.rows_scanned}"
+
+class JobSearchDocument(models.Model):
+    """
+    Chỉ mục toàn văn (SQLite FTS5) cho bài đăng việc làm.
+    Bảng ảo được tạo trong migration, đồng bộ qua signals của JobPost.
+    """
+    job = models.OneToOneField(JobPost, on_delete=models.DO_NOTHING, primary_key=True,
+                               db_column='rowid', related_name='search_document')
+    title = models.TextField()
+    description = models.TextField()
+    required_skills = models.TextField()
+    document = FullTextSearchField(db_column='jobs_jobsearchdocument')
+    rank = models.FloatField()
+
+    class Meta:
+        managed = False
+        db_table = 'jobs_jobsearchdocument'
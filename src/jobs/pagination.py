@@ -0,0 +1,110 @@
+from django.core import signing
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+
+CURSOR_SALT = 'jobs.pagination.cursor'
+
+
+def _key(row):
+    """Lấy khóa (created_at, id) từ model instance hoặc dict của values()"""
+    if isinstance(row, dict):
+        return row['created_at'], row['id']
+    return row.created_at, row.id
+
+
+class CursorPage:
+    """Một trang kết quả theo cursor, không cần biết tổng số dòng"""
+
+    def __init__(self, object_list, next_cursor=None, previous_cursor=None):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+class CursorPaginator:
+    """
+    Phân trang keyset theo (created_at, id) giảm dần.
+
+    Mỗi trang chỉ là một truy vấn range trên chỉ mục (status, created_at, id)
+    nên chi phí không phụ thuộc vào độ sâu trang và không cần COUNT.
+    Cursor là chuỗi đã ký (django.core.signing), client không đọc/sửa được.
+    """
+
+    def __init__(self, queryset, per_page):
+        self.queryset = queryset
+        self.per_page = per_page
+
+    def encode_cursor(self, row, direction):
+        created_at, pk = _key(row)
+        return signing.dumps(
+            {'c': created_at.isoformat(), 'i': pk, 'd': direction},
+            salt=CURSOR_SALT, compress=True
+        )
+
+    def decode_cursor(self, cursor):
+        """Giải mã cursor, trả về None nếu rỗng hoặc không hợp lệ"""
+        if not cursor:
+            return None
+        try:
+            data = signing.loads(cursor, salt=CURSOR_SALT)
+            created_at = parse_datetime(data['c'])
+            if created_at is None or data['d'] not in ('next', 'prev'):
+                return None
+            return created_at, int(data['i']), data['d']
+        except (signing.BadSignature, KeyError, TypeError, ValueError):
+            return None
+
+    def page(self, cursor=None):
+        """Trả về CursorPage ứng với cursor (cursor sai/thiếu -> trang đầu)"""
+        position = self.decode_cursor(cursor)
+
+        if position is None:
+            rows = list(self.queryset.order_by('-created_at', '-id')[:self.per_page + 1])
+            has_more = len(rows) > self.per_page
+            rows = rows[:self.per_page]
+            return self._build_page(rows, has_next=has_more, has_previous=False)
+
+        created_at, pk, direction = position
+        if direction == 'next':
+            rows = list(
+                self.queryset.filter(
+                    Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=pk)
+                ).order_by('-created_at', '-id')[:self.per_page + 1]
+            )
+            has_more = len(rows) > self.per_page
+            rows = rows[:self.per_page]
+            return self._build_page(rows, has_next=has_more, has_previous=True)
+
+        # Trang trước: đọc ngược theo thứ tự tăng dần rồi đảo lại
+        rows = list(
+            self.queryset.filter(
+                Q(created_at__gt=created_at) | Q(created_at=created_at, id__gt=pk)
+            ).order_by('created_at', 'id')[:self.per_page + 1]
+        )
+        has_more = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+        rows.reverse()
+        return self._build_page(rows, has_next=True, has_previous=has_more)
+
+    def _build_page(self, rows, has_next, has_previous):
+        next_cursor = previous_cursor = None
+        if rows and has_next:
+            next_cursor = self.encode_cursor(rows[-1], 'next')
+        if rows and has_previous:
+            previous_cursor = self.encode_cursor(rows[0], 'prev')
+        return CursorPage(rows, next_cursor, previous_cursor)
@@ -0,0 +1,103 @@
+"""
+Cache danh sách id kết quả tìm việc theo bộ lọc đã chuẩn hóa.
+
+Khóa cache gồm thế hệ 'jobs' (tăng khi job đăng/đóng/sửa, xem jobs.signals) và
+bản băm của `JobSearchForm.cleaned_data` đã chuẩn hóa, nên hai cách viết cùng
+một bộ lọc ("Q1" / "quận 1") dùng chung kết quả. Lần truy cập trúng cache chỉ
+cần lấy các dòng của trang hiện tại theo khóa chính.
+"""
+import datetime
+import hashlib
+import json
+from decimal import Decimal
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Model
+
+from .caching import get_generation
+from .locations import resolve as resolve_location
+from .skills import normalize_skill
+
+SEARCH_CACHE_TIMEOUT = getattr(settings, 'JOB_SEARCH_CACHE_TIMEOUT', 300)
+# Kết quả lớn hơn ngưỡng này không được cache (trang không lọc đã có đường nhanh riêng)
+SEARCH_CACHE_MAX_IDS = getattr(settings, 'JOB_SEARCH_CACHE_MAX_IDS', 2000)
+
+HITS_KEY = 'jobs:search_cache:hits'
+MISSES_KEY = 'jobs:search_cache:misses'
+
+
+# Chuẩn hóa theo đúng cách bộ lọc tương ứng so khớp (xem jobs.views._filter_jobs):
+# kỹ năng chỉ hạ chữ thường (giữ dấu như Skill.normalized_name); keyword/location đã
+# được SearchQueryField bỏ dấu, các trường còn lại dùng nguyên giá trị đã làm sạch.
+FIELD_NORMALIZERS = {
+    'skill': normalize_skill,
+}
+
+
+def _normalize_value(name, value):
+    if isinstance(value, Model):
+        return value.pk
+    if isinstance(value, Decimal):
+        return str(value.normalize())
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        return value.isoformat()
+    if name == 'location':
+        province_id, district_id = resolve_location(value)
+        if province_id is not None:
+            return [province_id, district_id]
+    if name in FIELD_NORMALIZERS:
+        return FIELD_NORMALIZERS[name](value)
+    return value
+
+
+def normalize_query(cleaned_data):
+    """Bộ lọc đã chuẩn hóa (bỏ giá trị rỗng), dùng làm khóa cache"""
+    return {
+        name: _normalize_value(name, value)
+        for name, value in sorted(cleaned_data.items())
+        if value not in (None, '', [])
+    }
+
+
+def cache_key(cleaned_data):
+    digest = hashlib.md5(
+        json.dumps(normalize_query(cleaned_data), sort_keys=True).encode()
+    ).hexdigest()
+    return f"jobs:search:{get_generation('jobs')}:{digest}"
+
+
+def _count(key):
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, 0, None)
+        cache.incr(key)
+
+
+def lookup(key):
+    """Kết quả đã cache ({'ids', 'facets'}) hoặc None; cập nhật bộ đếm hit/miss"""
+    value = cache.get(key)
+    _count(HITS_KEY if value is not None else MISSES_KEY)
+    return value
+
+
+def store(key, ids, facet_counts):
+    """Cache kết quả nếu đủ nhỏ, trả về giá trị đã cache hoặc None"""
+    if len(ids) > SEARCH_CACHE_MAX_IDS:
+        return None
+    value = {'ids': list(ids), 'facets': facet_counts}
+    cache.set(key, value, SEARCH_CACHE_TIMEOUT)
+    return value
+
+
+def stats():
+    """Bộ đếm hit/miss và tỉ lệ trúng cache (%)"""
+    hits = cache.get(HITS_KEY, 0)
+    misses = cache.get(MISSES_KEY, 0)
+    total = hits + misses
+    return {
+        'hits': hits,
+        'misses': misses,
+        'hit_ratio': round(hits * 100 / total, 1) if total else None,
+    }
@@ -0,0 +1,138 @@
+"""
+Tìm kiếm toàn văn cho bài đăng việc làm.
+
+Trên SQLite dùng bảng ảo FTS5 `jobs_jobsearchdocument` (tạo trong migration 0004),
+các CSDL khác quay về lọc LIKE trên các cột tìm kiếm bỏ dấu search_* của JobPost
+(quét bảng, không dùng được chỉ mục B-tree).
+
+Tài liệu được đánh chỉ mục và từ khóa đều ở dạng bỏ dấu (jobs.text.fold_words),
+nên "pha che", "do uong" khớp "Pha chế", "Đồ uống" (tokenizer unicode61 không
+chuyển đ -> d).
+"""
+import re
+
+from django.db import connection
+from django.db.models import F, FloatField, Func, Q, Value
+
+from .text import fold_words
+
+SEARCH_TABLE = 'jobs_jobsearchdocument'
+
+# Các cột văn bản được đánh chỉ mục, theo đúng thứ tự cột của bảng FTS5
+INDEXED_FIELDS = ('title', 'description', 'required_skills')
+
+# Nguồn của từng cột: cột tìm kiếm đã chuẩn hóa của JobPost
+SOURCE_FIELDS = ('search_title', 'search_description', 'search_skills')
+
+# Trọng số bm25 cho từng cột theo thứ tự INDEXED_FIELDS (tiêu đề > kỹ năng > mô tả),
+# dùng trực tiếp trong biểu thức xếp hạng của filter_jobs()
+RANK_WEIGHTS = (10.0, 1.0, 5.0)
+
+_TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+_available = None
+
+
+def is_available():
+    """Kiểm tra bảng FTS5 có sẵn trên CSDL hiện tại không (cache theo tiến trình)"""
+    global _available
+    if _available is None:
+        _available = (
+            connection.vendor == 'sqlite'
+            and SEARCH_TABLE in connection.introspection.table_names()
+        )
+    return _available
+
+
+def build_match_query(keyword):
+    """
+    Chuyển từ khóa người dùng thành truy vấn FTS5:
+    mỗi từ được bọc nháy kép và tìm theo tiền tố, các từ nối với nhau bằng AND.
+    """
+    tokens = _TOKEN_RE.findall(fold_words(keyword))
+    return ' '.join(f'"{token}"*' for token in tokens)
+
+
+def rank_expression():
+    """bm25() của tài liệu FTS5 theo RANK_WEIGHTS (điểm càng nhỏ càng liên quan)"""
+    return Func(
+        F('search_document__document'), *(Value(weight) for weight in RANK_WEIGHTS),
+        function='bm25', output_field=FloatField(),
+    )
+
+
+def filter_jobs(queryset, keyword, ranked=True):
+    """
+    Lọc queryset JobPost theo từ khóa.
+    Nếu `ranked` thì sắp xếp theo độ liên quan (bm25), rồi tới bài mới nhất.
+    """
+    match = build_match_query(keyword)
+    if not match:
+        return queryset
+
+    if not is_available():
+        folded = fold_words(keyword)
+        return queryset.filter(
+            Q(search_title__contains=folded) |
+            Q(search_description__contains=folded) |
+            Q(search_skills__contains=folded)
+        )
+
+    queryset = queryset.filter(search_document__document__match=match)
+    if ranked:
+        queryset = queryset.order_by(rank_expression().asc(), '-created_at')
+    return queryset
+
+
+def _document_values(values):
+    """Giá trị các cột FTS từ giá trị của SOURCE_FIELDS"""
+    return [value or '' for value in values]
+
+
+def index_job(job):
+    """Thêm hoặc cập nhật tài liệu của một bài đăng trong chỉ mục"""
+    if not is_available():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {SEARCH_TABLE} WHERE rowid = %s', [job.pk])
+        cursor.execute(
+            f'INSERT INTO {SEARCH_TABLE} (rowid, {", ".join(INDEXED_FIELDS)}) '
+            f'VALUES (%s, %s, %s, %s)',
+            [job.pk] + _document_values([getattr(job, field) for field in SOURCE_FIELDS])
+        )
+
+
+def unindex_job(job_id):
+    """Xóa tài liệu của bài đăng khỏi chỉ mục"""
+    if not is_available():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {SEARCH_TABLE} WHERE rowid = %s', [job_id])
+
+
+def rebuild_index(batch_size=1000):
+    """Xây dựng lại toàn bộ chỉ mục từ bảng JobPost, trả về số tài liệu đã ghi"""
+    from .models import JobPost
+
+    if not is_available():
+        return 0
+
+    total = 0
+    last_id = 0
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {SEARCH_TABLE}')
+        while True:
+            rows = list(
+                JobPost.objects.filter(pk__gt=last_id).order_by('pk')
+                .values_list('pk', *SOURCE_FIELDS)[:batch_size]
+            )
+            if not rows:
+                break
+            cursor.executemany(
+                f'INSERT INTO {SEARCH_TABLE} (rowid, {", ".join(INDEXED_FIELDS)}) '
+                f'VALUES (%s, %s, %s, %s)',
+                [[pk] + _document_values(values) for pk, *values in rows]
+            )
+            total += len(rows)
+            last_id = rows[-1][0]
+    return total
@@ -0,0 +1,243 @@
+from collections import Counter
+
+from django.db import transaction
+from django.db.models import F
+from django.db.models.signals import pre_save, post_save, post_delete, m2m_changed
+from django.dispatch import Signal, receiver
+
+from accounts.models import Skill, User, UserProfile
+
+from . import facets, feed, search
+from .caching import bump_generation
+from .categories import category_registry
+from .models import JobPost, JobCategory, JobApplication
+from .typeahead import split_custom_skills, typeahead_index
+
+# Các trường của JobPost quyết định facet, theo thứ tự tham số của facets.facet_keys()
+FACET_FIELDS = ('category_id', 'district_id', 'hourly_equivalent', 'work_date')
+
+# Gửi sau khi một nhóm job bị đóng hàng loạt bằng queryset.update()
+# (không qua save() nên post_save không được gửi). Tham số: job_ids.
+jobs_closed = Signal()
+
+
+@receiver(post_save, sender=JobPost)
+def update_search_document(sender, instance, update_fields=None, **kwargs):
+    """Đồng bộ chỉ mục toàn văn khi bài đăng được lưu"""
+    if update_fields is not None and not set(update_fields) & set(search.INDEXED_FIELDS):
+        # Chỉ cập nhật trạng thái/thời gian, nội dung văn bản không đổi
+        return
+    search.index_job(instance)
+
+
+@receiver(post_delete, sender=JobPost)
+def delete_search_document(sender, instance, **kwargs):
+    """Xóa bài đăng khỏi chỉ mục toàn văn"""
+    search.unindex_job(instance.pk)
+
+
+@receiver(post_save, sender=JobPost)
+def invalidate_public_job_caches(sender, instance, **kwargs):
+    """
+    Bài đăng công khai thay đổi (đăng mới, sửa, đóng, gỡ):
+    tăng thế hệ 'jobs' để các cache trang chủ/danh sách hết hiệu lực
+    """
+    if instance.status == 'published' or instance.get_loaded_value('status') == 'published':
+        # Sau khi commit: request đồng thời không dựng lại cache từ dữ liệu cũ dưới thế hệ mới
+        transaction.on_commit(lambda: bump_generation('jobs'))
+
+
+@receiver(post_delete, sender=JobPost)
+def invalidate_public_job_caches_on_delete(sender, instance, **kwargs):
+    if instance.status == 'published':
+        transaction.on_commit(lambda: bump_generation('jobs'))
+
+
+def _invalidate_categories():
+    category_registry.invalidate()
+    # Tên danh mục hiển thị kèm bài đăng trên trang chủ
+    bump_generation('jobs')
+
+
+@receiver(post_save, sender=JobCategory)
+@receiver(post_delete, sender=JobCategory)
+def invalidate_category_registry(sender, **kwargs):
+    """Danh mục thay đổi: buộc các tiến trình tải lại category_registry sau khi commit"""
+    transaction.on_commit(_invalidate_categories)
+
+
+@receiver(jobs_closed)
+def invalidate_public_job_caches_on_close(sender, job_ids, **kwargs):
+    """Các job vừa đóng không còn hiển thị công khai"""
+    bump_generation('jobs')
+
+
+@receiver(post_delete, sender=JobApplication)
+def decrement_application_counters(sender, instance, **kwargs):
+    """Đơn bị xóa (kể cả xóa theo cascade): giảm các bộ đếm của JobPost"""
+    changes = instance.get_counter_changes(instance.status, None)
+    changes['applications_count'] = -1
+    JobPost.objects.filter(pk=instance.job_id).update(
+        **{field: F(field) + delta for field, delta in changes.items()}
+    )
+
+
+@receiver(post_save, sender=JobPost)
+def update_worker_feeds(sender, instance, created, **kwargs):
+    """
+    Job vừa đăng (hoặc đổi kỹ năng khi đang đăng): đưa vào hàng đợi fan-out (run_feed_worker).
+    Job rời trạng thái 'published': gỡ khỏi các feed ngay (một lệnh DELETE theo chỉ mục).
+    """
+    was_published = not created and instance.get_loaded_value('status') == 'published'
+    if instance.status == 'published':
+        skills_changed = created or instance.get_loaded_value('required_skills') != instance.required_skills
+        if not was_published or skills_changed:
+            transaction.on_commit(lambda: feed.enqueue('job', [instance.pk]))
+    elif was_published:
+        transaction.on_commit(lambda: feed.remove_jobs([instance.pk]))
+
+
+@receiver(jobs_closed)
+def remove_closed_jobs_from_feeds(sender, job_ids, **kwargs):
+    feed.remove_jobs(job_ids)
+
+
+def _enqueue_worker_feeds(user_ids):
+    """Đưa các worker (bỏ qua tài khoản khác) vào hàng đợi tính lại feed sau khi commit"""
+    def enqueue():
+        worker_ids = User.objects.filter(pk__in=user_ids, user_type='worker').values_list('pk', flat=True)
+        feed.enqueue('worker', worker_ids)
+
+    transaction.on_commit(enqueue)
+
+
+@receiver(post_save, sender=UserProfile)
+def rebuild_feed_on_profile_save(sender, instance, created, **kwargs):
+    """Kỹ năng tự do hoặc trạng thái tìm việc của worker thay đổi: tính lại feed"""
+    if created and not instance.normalized_skills:
+        return
+    if not instance.match_fields_changed():
+        return
+    if UserProfile.user.is_cached(instance):
+        if instance.user.user_type != 'worker':
+            return
+    _enqueue_worker_feeds([instance.user_id])
+
+
+@receiver(m2m_changed, sender=UserProfile.skills.through)
+def rebuild_feed_on_skills_change(sender, instance, action, reverse, pk_set, **kwargs):
+    """
+    Danh sách kỹ năng thay đổi. Cùng một hàng đợi với post_save, nên lưu form hồ sơ
+    (save() rồi set skills) chỉ tính lại feed một lần.
+    """
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if not reverse:
+        _enqueue_worker_feeds([instance.user_id])
+        return
+    # skill.userprofile_set.add/remove/clear(): pk_set là id hồ sơ
+    profile_ids = getattr(instance, '_skill_cache_profile_ids', []) if action == 'post_clear' else pk_set
+    if profile_ids:
+        _enqueue_worker_feeds(UserProfile.objects.filter(pk__in=profile_ids).values_list('user_id', flat=True))
+
+
+@receiver(post_save, sender=JobPost)
+def update_facet_counts(sender, instance, created, **kwargs):
+    """Job vào/ra trạng thái 'published' hoặc đổi giá trị facet: cập nhật JobFacetCount"""
+    changes = Counter()
+    if not created and instance.get_loaded_value('status') == 'published':
+        for key in facets.facet_keys(*(instance.get_loaded_value(field) for field in FACET_FIELDS)):
+            changes[key] -= 1
+    if instance.status == 'published':
+        for key in facets.facet_keys(*(getattr(instance, field) for field in FACET_FIELDS)):
+            changes[key] += 1
+    facets.apply_changes(changes)
+
+
+@receiver(post_delete, sender=JobPost)
+def update_facet_counts_on_delete(sender, instance, **kwargs):
+    if instance.status == 'published':
+        facets.apply_changes(Counter({
+            key: -1 for key in facets.facet_keys(*(getattr(instance, field) for field in FACET_FIELDS))
+        }))
+
+
+@receiver(jobs_closed)
+def update_facet_counts_on_close(sender, job_ids, **kwargs):
+    facets.remove_jobs(job_ids)
+
+
+@receiver(post_save, sender=JobPost)
+def update_typeahead_titles(sender, instance, created, **kwargs):
+    """Gợi ý tiêu đề chỉ gồm các job đang đăng"""
+    removed = []
+    if not created and instance.get_loaded_value('status') == 'published':
+        removed.append(instance.get_loaded_value('title'))
+    added = [instance.title] if instance.status == 'published' else []
+    if added != removed:
+        transaction.on_commit(lambda: typeahead_index.update('title', added, removed))
+
+
+@receiver(post_delete, sender=JobPost)
+def update_typeahead_titles_on_delete(sender, instance, **kwargs):
+    if instance.status == 'published':
+        transaction.on_commit(lambda: typeahead_index.update('title', removed=[instance.title]))
+
+
+@receiver(jobs_closed)
+def update_typeahead_titles_on_close(sender, job_ids, **kwargs):
+    typeahead_index.update(
+        'title', removed=JobPost.objects.filter(pk__in=list(job_ids)).values_list('title', flat=True)
+    )
+
+
+@receiver(pre_save, sender=Skill)
+def remember_skill_name(sender, instance, **kwargs):
+    instance._typeahead_old = (
+        Skill.objects.filter(pk=instance.pk, is_active=True).values_list('name', flat=True).first()
+        if instance.pk else None
+    )
+
+
+@receiver(post_save, sender=Skill)
+def update_typeahead_skills(sender, instance, **kwargs):
+    old = getattr(instance, '_typeahead_old', None)
+    removed = [old] if old else []
+    added = [instance.name] if instance.is_active else []
+    if added != removed:
+        transaction.on_commit(lambda: typeahead_index.update('skill', added, removed))
+
+
+@receiver(post_delete, sender=Skill)
+def update_typeahead_skills_on_delete(sender, instance, **kwargs):
+    if instance.is_active:
+        transaction.on_commit(lambda: typeahead_index.update('skill', removed=[instance.name]))
+
+
+@receiver(pre_save, sender=UserProfile)
+def remember_custom_skills(sender, instance, update_fields=None, **kwargs):
+    if update_fields is not None and 'custom_skills' not in update_fields:
+        instance._typeahead_old = None
+        return
+    instance._typeahead_old = split_custom_skills(
+        UserProfile.objects.filter(pk=instance.pk).values_list('custom_skills', flat=True).first()
+        if instance.pk else ''
+    )
+
+
+@receiver(post_save, sender=UserProfile)
+def update_typeahead_custom_skills(sender, instance, **kwargs):
+    """Kỹ năng tự do của hồ sơ là một nguồn gợi ý kỹ năng"""
+    old = getattr(instance, '_typeahead_old', None)
+    if old is None:
+        return
+    new = split_custom_skills(instance.custom_skills)
+    if old != new:
+        transaction.on_commit(lambda: typeahead_index.update('skill', new, old))
+
+
+@receiver(post_delete, sender=UserProfile)
+def update_typeahead_custom_skills_on_delete(sender, instance, **kwargs):
+    removed = split_custom_skills(instance.custom_skills)
+    if removed:
+        transaction.on_commit(lambda: typeahead_index.update('skill', removed=removed))
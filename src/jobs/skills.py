@@ -0,0 +1,79 @@
+"""
+Liên kết kỹ năng của bài đăng.
+
+`JobPost.required_skills` (văn bản, cách nhau bởi dấu phẩy) được tách một lần
+khi lưu: tên khớp `Skill.normalized_name` thành liên kết many-to-many
+`JobPost.skills`, phần còn lại lưu thành `JobSkillTag` đã chuẩn hóa. Lọc theo
+kỹ năng là truy vấn trên chỉ mục của hai bảng này thay vì quét `icontains`.
+"""
+from django.db import transaction
+from django.db.models import Q
+
+
+def normalize_skill(name):
+    """Chuẩn hóa tên kỹ năng giống Skill.normalized_name"""
+    return name.lower().strip()
+
+
+def parse_skills(text):
+    """Tách chuỗi kỹ năng thành danh sách tên đã chuẩn hóa, không trùng lặp, giữ thứ tự"""
+    names = []
+    for name in (text or '').split(','):
+        name = normalize_skill(name)
+        if name and name not in names:
+            names.append(name)
+    return names
+
+
+def index_jobs(jobs):
+    """
+    Tách required_skills của một lô job thành liên kết Skill + JobSkillTag.
+    Số truy vấn cố định cho cả lô; đánh dấu `skills_indexed` khi xong.
+    """
+    from accounts.models import Skill
+    from .models import JobPost, JobSkillTag
+
+    jobs = list(jobs)
+    if not jobs:
+        return
+    names_by_job = {job.pk: parse_skills(job.required_skills) for job in jobs}
+    all_names = {name for names in names_by_job.values() for name in names}
+    skill_ids = dict(
+        Skill.objects.filter(normalized_name__in=all_names, is_active=True)
+        .values_list('normalized_name', 'pk')
+    )
+    through = JobPost.skills.through
+    job_ids = list(names_by_job)
+
+    with transaction.atomic():
+        through.objects.filter(jobpost_id__in=job_ids).delete()
+        JobSkillTag.objects.filter(job_id__in=job_ids).delete()
+        through.objects.bulk_create([
+            through(jobpost_id=job_id, skill_id=skill_ids[name])
+            for job_id, names in names_by_job.items() for name in names if name in skill_ids
+        ])
+        JobSkillTag.objects.bulk_create([
+            JobSkillTag(job_id=job_id, name=name)
+            for job_id, names in names_by_job.items() for name in names if name not in skill_ids
+        ])
+        JobPost.objects.filter(pk__in=job_ids).update(skills_indexed=True)
+    for job in jobs:
+        job.skills_indexed = True
+
+
+def sync_job_skills(job):
+    """Đồng bộ `job.skills` và các JobSkillTag theo `job.required_skills`"""
+    index_jobs([job])
+
+
+def filter_by_skill(queryset, name):
+    """Lọc các job yêu cầu kỹ năng `name` (khớp Skill hoặc thẻ tự do)"""
+    from .models import JobPost, JobSkillTag
+
+    name = normalize_skill(name)
+    return queryset.filter(
+        Q(pk__in=JobPost.skills.through.objects.filter(
+            skill__normalized_name=name
+        ).values('jobpost_id'))
+        | Q(pk__in=JobSkillTag.objects.filter(name=name).values('job_id'))
+    )
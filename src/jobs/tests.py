@@ -1,3 +1,446 @@
+import datetime
+import unittest
+from decimal import Decimal
+
+from django.db import connection
 from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from accounts.models import User, UserProfile
+
+from . import feed, result_cache
+from .caching import get_generation
+from .categories import category_registry
+from .forms import JobSearchForm
+from .models import JobCategory, JobPost, JobApplication
+from .pagination import CursorPaginator
+
+
+class JobFixturesMixin:
+    """Dữ liệu mẫu tối thiểu: danh mục, nhà tuyển dụng và bài đăng"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.category = JobCategory.objects.create(name='Pha chế')
+        cls.employer = User.objects.create(
+            username='employer', email='employer@example.com', user_type='employer'
+        )
+        cls.worker = User.objects.create(
+            username='worker', email='worker@example.com', user_type='worker'
+        )
+
+    def create_job(self, **fields):
+        values = {
+            'title': 'Pha chế cà phê',
+            'description': 'Pha chế đồ uống tại quán',
+            'employer': self.employer,
+            'category': self.category,
+            'location': 'Quận 1, TP.HCM',
+            'work_date': timezone.localdate() + datetime.timedelta(days=3),
+            'work_time_start': datetime.time(8, 0),
+            'work_time_end': datetime.time(12, 0),
+            'duration_hours': 4,
+            'payment_amount': 30000,
+            'status': 'published',
+        }
+        values.update(fields)
+        return JobPost.objects.create(**values)
+
+
+@unittest.skipUnless(connection.vendor == 'sqlite', 'EXPLAIN QUERY PLAN chỉ có trên SQLite')
+class HotPathIndexTests(TestCase):
+    """Các truy vấn nóng phải dùng chỉ mục composite, không quét toàn bảng"""
+
+    def assertUsesIndex(self, queryset, index_name):
+        plan = queryset.explain()
+        self.assertIn(f'USING INDEX {index_name}', plan, plan)
+        self.assertNotIn('USE TEMP B-TREE FOR ORDER BY', plan, plan)
+
+    def test_public_job_list(self):
+        self.assertUsesIndex(
+            JobPost.objects.filter(status='published').order_by('-created_at', '-id'),
+            'jobpost_status_created_idx',
+        )
+
+    def test_my_jobs_filtered_by_status_and_date(self):
+        self.assertUsesIndex(
+            JobPost.objects.filter(
+                employer_id=1, status='published', work_date__gte=datetime.date.today()
+            ).order_by('work_date'),
+            'jobpost_employer_status_idx',
+        )
+
+    def test_my_jobs_newest_first(self):
+        self.assertUsesIndex(
+            JobPost.objects.filter(employer_id=1).order_by('-created_at'),
+            'jobpost_employer_created_idx',
+        )
+
+    def test_my_applications(self):
+        self.assertUsesIndex(
+            JobApplication.objects.filter(applicant_id=1).order_by('-applied_at'),
+            'jobapp_applicant_applied_idx',
+        )
+
+    def test_job_applicants(self):
+        self.assertUsesIndex(
+            JobApplication.objects.filter(job_id=1).order_by('-applied_at'),
+            'jobapp_job_applied_idx',
+        )
+
+
+class SearchResultCacheKeyTests(TestCase):
+    """Khóa cache kết quả tìm việc phải chuẩn hóa mỗi trường giống bộ lọc tương ứng"""
+
+    def cache_key(self, **params):
+        form = JobSearchForm(params)
+        self.assertTrue(form.is_valid(), form.errors)
+        return result_cache.cache_key(form.cleaned_data)
+
+    def test_skill_keeps_accents(self):
+        # filter_by_skill khớp "cà phê" và "ca phe" là hai kỹ năng khác nhau
+        self.assertNotEqual(self.cache_key(skill='cà phê'), self.cache_key(skill='ca phe'))
+
+    def test_skill_ignores_case_and_whitespace(self):
+        self.assertEqual(self.cache_key(skill=' Pha Chế '), self.cache_key(skill='pha chế'))
+
+    def test_location_spellings_share_key(self):
+        self.assertEqual(self.cache_key(location='Q1'), self.cache_key(location='Quận 1, TP.HCM'))
+
+    def test_keyword_ignores_accents(self):
+        self.assertEqual(self.cache_key(keyword='Phục vụ'), self.cache_key(keyword='phuc vu'))
+
+    def test_empty_values_ignored(self):
+        self.assertEqual(self.cache_key(keyword='', skill=''), self.cache_key())
+
+    def test_different_filters_differ(self):
+        self.assertNotEqual(self.cache_key(payment_min='20000'), self.cache_key(payment_min='30000'))
+
+
+class JobListApiConditionalTests(JobFixturesMixin, TestCase):
+    """API danh sách việc làm trả 304 khi tập kết quả không đổi, 200 khi đổi"""
+
+    def setUp(self):
+        self.job = self.create_job()
+        self.other = self.create_job(title='Phục vụ bàn', location='Quận 3, TP.HCM')
+
+    def get(self, etag=None, **params):
+        headers = {'HTTP_IF_NONE_MATCH': etag} if etag else {}
+        return self.client.get(reverse('jobs:job_list_api'), params, **headers)
+
+    def assertNotModified(self, etag, **params):
+        self.assertEqual(self.get(etag, **params).status_code, 304)
+
+    def assertModified(self, etag, **params):
+        response = self.get(etag, **params)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_unchanged_set_returns_304(self):
+        response = self.get()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['count'], 2)
+        self.assertNotIn('Last-Modified', response)
+        self.assertNotModified(response['ETag'])
+
+    def test_new_job(self):
+        etag = self.get()['ETag']
+        self.create_job(title='Bảo vệ')
+        self.assertModified(etag)
+
+    def test_closed_job(self):
+        etag = self.get()['ETag']
+        self.job.status = 'closed'
+        self.job.save()
+        self.assertModified(etag)
+
+    def test_hard_delete_of_older_job(self):
+        # Job bị xóa không phải job sửa gần nhất: updated_at lớn nhất không đổi
+        etag = self.get()['ETag']
+        self.job.delete()
+        self.assertModified(etag)
+
+    def test_job_edited_out_of_filter(self):
+        etag = self.get(location='Quận 1')['ETag']
+        self.job.location = 'Quận 5, TP.HCM'
+        self.job.save()
+        self.assertModified(etag, location='Quận 1')
+
+    def test_change_outside_filter_keeps_304(self):
+        etag = self.get(location='Quận 1')['ETag']
+        self.other.title = 'Phục vụ nhà hàng'
+        self.other.save()
+        self.assertNotModified(etag, location='Quận 1')
+
+    def test_invalid_filter(self):
+        self.assertEqual(self.get(payment_min='-1').status_code, 400)
+
+
+class JobDetailConditionalTests(JobFixturesMixin, TestCase):
+    """Trang chi tiết trả 304 cho khách và worker, luôn trả trang mới cho người đăng bài"""
+
+    def setUp(self):
+        self.job = self.create_job()
+        self.url = reverse('jobs:job_detail', args=[self.job.pk])
+
+    def revalidate(self, response):
+        headers = {}
+        if response.has_header('ETag'):
+            headers['HTTP_IF_NONE_MATCH'] = response['ETag']
+        if response.has_header('Last-Modified'):
+            headers['HTTP_IF_MODIFIED_SINCE'] = response['Last-Modified']
+        return self.client.get(self.url, **headers)
+
+    def test_anonymous_304(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('public', response['Cache-Control'])
+        self.assertTrue(response.has_header('Last-Modified'))
+        self.assertEqual(self.revalidate(response).status_code, 304)
+
+    def test_anonymous_job_change(self):
+        response = self.client.get(self.url)
+        self.job.title = 'Pha chế trà sữa'
+        self.job.save()
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=response['ETag']).status_code, 200)
+
+    def test_worker_304(self):
+        self.client.force_login(self.worker)
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('private', response['Cache-Control'])
+        self.assertFalse(response.has_header('Last-Modified'))
+        self.assertEqual(self.revalidate(response).status_code, 304)
+
+    def test_worker_application_change(self):
+        self.client.force_login(self.worker)
+        response = self.client.get(self.url)
+        JobApplication.objects.create(job=self.job, applicant=self.worker, cover_letter='Xin chào')
+        self.assertEqual(self.revalidate(response).status_code, 200)
+
+    def test_etag_differs_per_viewer(self):
+        anonymous = self.client.get(self.url)
+        self.client.force_login(self.worker)
+        self.assertEqual(
+            self.client.get(self.url, HTTP_IF_NONE_MATCH=anonymous['ETag']).status_code, 200
+        )
+
+    def test_owner_never_304(self):
+        self.client.force_login(self.employer)
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.has_header('ETag'))
+        self.assertFalse(response.has_header('Last-Modified'))
+        self.assertIn('private', response['Cache-Control'])
+        self.assertEqual(self.revalidate(response).status_code, 200)
+
+
+class ApplicationCounterTests(JobFixturesMixin, TestCase):
+    """Các bộ đếm đơn trên JobPost được cập nhật nguyên tử (F()) theo vòng đời đơn"""
+
+    def setUp(self):
+        self.job = self.create_job()
+
+    def assertCounters(self, total, pending, accepted, rejected):
+        self.job.refresh_from_db()
+        self.assertEqual(
+            (self.job.applications_count, self.job.pending_applications_count,
+             self.job.accepted_applications_count, self.job.rejected_applications_count),
+            (total, pending, accepted, rejected),
+        )
+
+    def apply(self, username, **fields):
+        applicant = User.objects.create(
+            username=username, email=f'{username}@example.com', user_type='worker'
+        )
+        return JobApplication.objects.create(job=self.job, applicant=applicant, **fields)
+
+    def test_create(self):
+        self.apply('a')
+        self.apply('b', status='accepted')
+        self.assertCounters(2, 1, 1, 0)
+
+    def test_status_changes(self):
+        application = self.apply('a')
+        application.status = 'accepted'
+        application.save()
+        self.assertCounters(1, 0, 1, 0)
+        application.status = 'rejected'
+        application.save()
+        self.assertCounters(1, 0, 0, 1)
+        # 'withdrawn' không có bộ đếm riêng, vẫn tính vào tổng số đơn
+        application.status = 'withdrawn'
+        application.save()
+        self.assertCounters(1, 0, 0, 0)
+
+    def test_save_without_status_change(self):
+        application = self.apply('a')
+        application.cover_letter = 'Đã cập nhật'
+        application.save()
+        application.save()
+        self.assertCounters(1, 1, 0, 0)
+
+    def test_status_change_on_reloaded_instance(self):
+        application_id = self.apply('a').pk
+        application = JobApplication.objects.get(pk=application_id)
+        application.status = 'accepted'
+        application.save()
+        self.assertCounters(1, 0, 1, 0)
+
+    def test_delete(self):
+        self.apply('a')
+        accepted = self.apply('b', status='accepted')
+        accepted.delete()
+        self.assertCounters(1, 1, 0, 0)
+
+    def test_cascade_delete(self):
+        # Xóa người ứng tuyển xóa đơn theo cascade, post_delete vẫn được gửi
+        application = self.apply('a', status='rejected')
+        application.applicant.delete()
+        self.assertCounters(0, 0, 0, 0)
+
+    def test_counts_match_rows(self):
+        for index, status in enumerate(['pending', 'pending', 'accepted', 'rejected']):
+            self.apply(f'w{index}', status=status)
+        self.job.applications.filter(status='pending').first().delete()
+        self.job.refresh_from_db()
+        self.assertEqual(self.job.applications_count, self.job.applications.count())
+        self.assertEqual(self.job.pending_applications_count, self.job.applications.filter(status='pending').count())
+
+
+class CursorPaginatorTests(JobFixturesMixin, TestCase):
+    """Phân trang keyset: đi tới/lùi qua mọi trang không trùng, không sót dòng"""
+
+    def setUp(self):
+        jobs = [self.create_job(title=f'Job {index}') for index in range(7)]
+        # Ba job cùng created_at: thứ tự phải được phân định bằng id
+        JobPost.objects.filter(pk__in=[job.pk for job in jobs[2:5]]).update(created_at=jobs[2].created_at)
+        self.expected = list(JobPost.objects.order_by('-created_at', '-id').values_list('pk', flat=True))
+        self.paginator = CursorPaginator(JobPost.objects.all(), per_page=3)
+
+    @staticmethod
+    def ids(page):
+        return [job.pk for job in page]
+
+    def test_forward_then_back(self):
+        pages = [self.paginator.page()]
+        self.assertFalse(pages[0].has_previous())
+        while pages[-1].has_next():
+            pages.append(self.paginator.page(pages[-1].next_cursor))
+        self.assertEqual([len(page) for page in pages], [3, 3, 1])
+        self.assertEqual([pk for page in pages for pk in self.ids(page)], self.expected)
+
+        # Lùi lại từ trang cuối trả về đúng các trang đã đi qua
+        page = pages[-1]
+        for previous in reversed(pages[:-1]):
+            page = self.paginator.page(page.previous_cursor)
+            self.assertEqual(self.ids(page), self.ids(previous))
+        self.assertFalse(page.has_previous())
+        self.assertTrue(page.has_next())
+
+    def test_values_rows(self):
+        paginator = CursorPaginator(JobPost.objects.values('id', 'created_at'), per_page=3)
+        page = paginator.page(paginator.page().next_cursor)
+        self.assertEqual([row['id'] for row in page], self.expected[3:6])
+
+    def test_new_job_does_not_shift_pages(self):
+        # Cursor gắn với dòng cuối trang, không phải offset: job mới không đẩy lệch trang sau
+        first = self.paginator.page()
+        self.create_job(title='Job mới')
+        self.assertEqual(self.ids(self.paginator.page(first.next_cursor)), self.expected[3:6])
+
+    def test_invalid_cursor_returns_first_page(self):
+        for cursor in ('', 'garbage', self.paginator.page().next_cursor + 'x'):
+            self.assertEqual(self.ids(self.paginator.page(cursor)), self.expected[:3])
+
+    def test_job_list_view_cursor_mode(self):
+        response = self.client.get(reverse('jobs:job_list'), {'cursor': ''})
+        self.assertEqual(response.status_code, 200)
+
+
+class JobPostDerivedFieldsTests(JobFixturesMixin, TestCase):
+    """Các cột dẫn xuất được ghi cùng trường gốc khi save(update_fields=...)"""
+
+    def test_location_update_fields(self):
+        job = self.create_job()
+        job.location = 'Cầu Giấy, Hà Nội'
+        job.save(update_fields=['location'])
+        job.refresh_from_db()
+        self.assertEqual(job.search_location, 'cau giay ha noi')
+        self.assertEqual((job.province_id, job.district_id), (1, 5))
+
+    def test_pay_columns_from_int_and_float(self):
+        cases = [
+            # (payment_type, payment_amount, duration_hours, hourly_equivalent, total_payment)
+            ('daily', 400000, 8, '50000.00', '400000'),
+            ('fixed', 100000, 3, '33333.33', '100000'),
+            ('daily', 300000.0, 7.5, '40000.00', '300000'),
+            ('hourly', 30000, 2.5, '30000', '75000'),
+        ]
+        for payment_type, amount, hours, hourly, total in cases:
+            with self.subTest(payment_type=payment_type, amount=amount, hours=hours):
+                job = self.create_job(payment_type=payment_type, payment_amount=amount, duration_hours=hours)
+                job.refresh_from_db()
+                self.assertEqual(job.hourly_equivalent, Decimal(hourly))
+                self.assertEqual(job.total_payment, Decimal(total))
+
+
+class FeedScoreConsistencyTests(JobFixturesMixin, TestCase):
+    """Fan-out và tính lại feed cho cùng một cặp (worker, job) phải cho cùng điểm"""
+
+    def setUp(self):
+        feed.worker_index.invalidate()
+        self.addCleanup(feed.worker_index.invalidate)
+        for index, skills in enumerate([['pha chế', 'phục vụ'], ['pha chế'], ['bảo vệ']]):
+            worker = self.worker if index == 0 else User.objects.create(
+                username=f'worker{index}', email=f'worker{index}@example.com', user_type='worker'
+            )
+            UserProfile.objects.create(user=worker, custom_skills=', '.join(skills))
+        self.create_job(title='Bảo vệ', required_skills='Bảo vệ')
+        # "lái xe" không có worker nào: vẫn phải được tính vào chuẩn hóa vector của job
+        self.job = self.create_job(required_skills='Pha chế, Lái xe')
+
+    def feed_score(self):
+        return feed.WorkerJobFeed.objects.get(worker=self.worker, job=self.job).score
+
+    def test_fan_out_and_rebuild_agree(self):
+        feed.fan_out_job(self.job)
+        fanned_out = self.feed_score()
+        feed.rebuild_worker_feed(self.worker.pk)
+        self.assertAlmostEqual(self.feed_score(), fanned_out)
+
+    def test_unknown_job_skills_lower_the_score(self):
+        engine = feed.worker_index.get()
+        worker = engine.encode(['pha chế', 'phục vụ'])
+        self.assertLess(
+            engine.similarity(worker, engine.encode(['pha chế', 'kỹ năng lạ'])),
+            engine.similarity(worker, engine.encode(['pha chế'])),
+        )
+
+
+class CacheInvalidationOnCommitTests(JobFixturesMixin, TestCase):
+    """Thế hệ cache 'jobs' và category_registry chỉ bị vô hiệu hóa sau khi commit"""
+
+    def test_job_save_bumps_generation_after_commit(self):
+        before = get_generation('jobs')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.create_job()
+            self.assertEqual(get_generation('jobs'), before)
+        self.assertNotEqual(get_generation('jobs'), before)
+
+    def test_job_delete_bumps_generation_after_commit(self):
+        job = self.create_job()
+        before = get_generation('jobs')
+        with self.captureOnCommitCallbacks(execute=True):
+            job.delete()
+            self.assertEqual(get_generation('jobs'), before)
+        self.assertNotEqual(get_generation('jobs'), before)
 
-# Create your tests here.
+    def test_category_rename_after_commit(self):
+        category_registry.get(self.category.pk)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.category.name = 'Pha chế đồ uống'
+            self.category.save()
+            self.assertEqual(category_registry.get(self.category.pk).name, 'Pha chế')
+        self.assertEqual(category_registry.get(self.category.pk).name, 'Pha chế đồ uống')
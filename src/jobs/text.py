@@ -0,0 +1,25 @@
+"""
+Chuẩn hóa văn bản tiếng Việt để so khớp không phân biệt dấu.
+"""
+import re
+import unicodedata
+
+_NON_WORD = re.compile(r'[^\w]+')
+
+
+def fold(text):
+    """
+    Chữ thường, bỏ dấu (kể cả đ -> d), gộp khoảng trắng.
+    "Quận Bình Thạnh" -> "quan binh thanh"
+    """
+    if not text:
+        return ''
+    text = text.lower().replace('đ', 'd')
+    text = unicodedata.normalize('NFD', text)
+    text = ''.join(char for char in text if not unicodedata.combining(char))
+    return ' '.join(text.split())
+
+
+def fold_words(text):
+    """Như fold() nhưng thay dấu câu bằng khoảng trắng: "TP.HCM" -> "tp hcm" """
+    return ' '.join(_NON_WORD.sub(' ', fold(text)).replace('_', ' ').split())
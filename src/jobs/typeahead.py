@@ -0,0 +1,213 @@
+"""
+Gợi ý tự động (typeahead) cho ô tìm kiếm: tiêu đề việc làm, kỹ năng, địa điểm.
+
+Mỗi loại gợi ý là một mảng đã sắp xếp các khóa bỏ dấu (jobs.text.fold_words) giữ
+trong tiến trình; tra cứu tiền tố là một lần bisect cộng quét các khóa liền kề.
+Mỗi nhãn được đánh chỉ mục tại đầu mỗi từ, nên "che" gợi ý được "Pha chế".
+
+Chỉ mục được dựng khi dùng lần đầu, cập nhật tăng dần qua signals (jobs.signals)
+khi job đăng/đóng/đổi tiêu đề, kỹ năng hoặc kỹ năng tự do của hồ sơ thay đổi,
+và dựng lại toàn bộ sau `ttl` giây để đồng bộ thay đổi từ các tiến trình khác.
+"""
+import threading
+import time
+from bisect import bisect_left, insort
+from collections import Counter
+
+from django.conf import settings
+
+from .locations import DISTRICTS, PROVINCES, display_name, expand
+from .text import fold_words
+
+# Số khóa tối đa được quét cho một tiền tố (tiền tố rất ngắn khớp nhiều khóa)
+MAX_SCAN = 200
+MAX_LIMIT = 20
+
+
+class PrefixIndex:
+    """
+    Mảng đã sắp xếp các cặp (khóa, nhãn chuẩn hóa). Nhãn trùng nhau sau khi bỏ dấu
+    được gộp và đếm tham chiếu: nhãn chỉ bị gỡ khi nguồn cuối cùng bị gỡ.
+    """
+
+    def __init__(self, normalize=fold_words):
+        self.normalize = normalize
+        self._entries = []
+        self._labels = {}
+        self._aliases = {}
+        self._counts = Counter()
+
+    def __len__(self):
+        return len(self._labels)
+
+    @staticmethod
+    def _word_keys(canonical):
+        words = canonical.split()
+        return {' '.join(words[start:]) for start in range(len(words))}
+
+    def _keys(self, canonical):
+        return self._word_keys(canonical) | self._aliases.get(canonical, set())
+
+    def _register(self, label, aliases):
+        """Đếm tham chiếu nhãn; trả về nhãn chuẩn hóa nếu nhãn mới cần thêm khóa"""
+        canonical = self.normalize(label)
+        if not canonical:
+            return None
+        self._counts[canonical] += 1
+        if self._counts[canonical] > 1:
+            return None
+        self._labels[canonical] = label.strip()
+        self._aliases[canonical] = {self.normalize(alias) for alias in aliases} - {''}
+        return canonical
+
+    def add(self, label, aliases=()):
+        """Thêm một nhãn (chèn vào mảng đã sắp xếp, dùng cho cập nhật tăng dần)"""
+        canonical = self._register(label, aliases)
+        if canonical:
+            for key in self._keys(canonical):
+                insort(self._entries, (key, canonical))
+
+    def add_many(self, labels):
+        """Thêm nhiều cặp (nhãn, bí danh): gom các khóa rồi sắp xếp một lần khi dựng chỉ mục"""
+        entries = []
+        for label, aliases in labels:
+            canonical = self._register(label, aliases)
+            if canonical:
+                entries.extend((key, canonical) for key in self._keys(canonical))
+        if entries:
+            entries.extend(self._entries)
+            entries.sort()
+            self._entries = entries
+
+    def remove(self, label):
+        canonical = self.normalize(label)
+        if not self._counts.get(canonical):
+            return
+        self._counts[canonical] -= 1
+        if self._counts[canonical]:
+            return
+        for key in self._keys(canonical):
+            position = bisect_left(self._entries, (key, canonical))
+            if position < len(self._entries) and self._entries[position] == (key, canonical):
+                del self._entries[position]
+        del self._counts[canonical], self._labels[canonical], self._aliases[canonical]
+
+    def search(self, prefix, limit=10):
+        """
+        Các nhãn có một từ bắt đầu bằng `prefix`: khớp từ đầu nhãn trước,
+        rồi nhãn được dùng nhiều hơn, rồi theo thứ tự chữ cái.
+        """
+        prefix = self.normalize(prefix)
+        if not prefix:
+            return []
+        entries = self._entries
+        matches = {}
+        start = bisect_left(entries, (prefix,))
+        for position in range(start, min(start + MAX_SCAN, len(entries))):
+            key, canonical = entries[position]
+            if not key.startswith(prefix):
+                break
+            if not matches.get(canonical):
+                matches[canonical] = canonical.startswith(prefix) or key in self._aliases[canonical]
+        counts = self._counts
+        ranked = sorted(matches, key=lambda canonical: (not matches[canonical], -counts[canonical], canonical))
+        return [self._labels[canonical] for canonical in ranked[:limit]]
+
+
+def _title_labels():
+    from .models import JobPost
+
+    return [(title, ()) for title in JobPost.objects.filter(status='published').values_list('title', flat=True)]
+
+
+def _skill_labels():
+    from accounts.models import Skill, UserProfile
+
+    labels = [(name, ()) for name in Skill.objects.filter(is_active=True).values_list('name', flat=True)]
+    for custom_skills in UserProfile.objects.exclude(custom_skills='').values_list('custom_skills', flat=True):
+        labels.extend((name, ()) for name in split_custom_skills(custom_skills))
+    return labels
+
+
+def _location_labels():
+    labels = [(name, aliases) for _, name, aliases in PROVINCES]
+    labels.extend(
+        (display_name(province_id, code), aliases) for code, province_id, _, aliases in DISTRICTS
+    )
+    return labels
+
+
+BUILDERS = {
+    'title': _title_labels,
+    'skill': _skill_labels,
+    'location': _location_labels,
+}
+
+# Địa điểm dùng cùng bộ mở rộng viết tắt với jobs.locations ("q1" -> "quan 1")
+NORMALIZERS = {
+    'location': expand,
+}
+
+
+def split_custom_skills(custom_skills):
+    """Tách chuỗi kỹ năng tự do (cách nhau bởi dấu phẩy) thành danh sách tên"""
+    return [skill.strip() for skill in (custom_skills or '').split(',') if skill.strip()]
+
+
+class TypeaheadIndex:
+    """
+    Các PrefixIndex theo loại gợi ý, dựng lại sau `ttl` giây.
+    Việc dựng chạy ngoài `_lock` (chỉ giữ `_build_lock`), `_lock` chỉ bảo vệ các lần
+    đọc/sửa mảng khóa nên tra cứu không phải chờ một lần dựng lại.
+    """
+
+    def __init__(self, ttl=None):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._build_lock = threading.Lock()
+        self._indexes = {}
+        self._built_at = {}
+
+    def _expired(self, field):
+        ttl = self.ttl
+        if ttl is None:
+            ttl = getattr(settings, 'JOB_TYPEAHEAD_TTL', 600)
+        return field not in self._indexes or time.monotonic() - self._built_at[field] > ttl
+
+    def get(self, field):
+        if self._expired(field):
+            with self._build_lock:
+                if self._expired(field):
+                    index = PrefixIndex(NORMALIZERS.get(field, fold_words))
+                    index.add_many(BUILDERS[field]())
+                    with self._lock:
+                        self._indexes[field] = index
+                        self._built_at[field] = time.monotonic()
+        return self._indexes[field]
+
+    def search(self, field, prefix, limit=10):
+        index = self.get(field)
+        # update() xóa/chèn trực tiếp trong mảng khóa: không đọc khi đang sửa
+        with self._lock:
+            return index.search(prefix, min(limit, MAX_LIMIT))
+
+    def update(self, field, added=(), removed=()):
+        """Cập nhật tăng dần (bỏ qua nếu chỉ mục chưa được dựng trong tiến trình này)"""
+        with self._lock:
+            index = self._indexes.get(field)
+            if index is None:
+                return
+            for label in removed:
+                index.remove(label)
+            for label in added:
+                index.add(label)
+
+    def invalidate(self, field=None):
+        with self._lock:
+            if field is None:
+                self._indexes.clear()
+            else:
+                self._indexes.pop(field, None)
+
+
+typeahead_index = TypeaheadIndex()
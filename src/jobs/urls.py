@@ -7,6 +7,8 @@ urlpatterns = [
     # Job listing and detail
     path('', views.job_list_view, name='job_list'),
     path('<int:pk>/', views.job_detail_view, name='job_detail'),
+    path('typeahead/', views.typeahead_view, name='typeahead'),
+    path('api/', views.job_list_api_view, name='job_list_api'),
     
     # Job management for employers
     path('create/', views.job_create_view, name='job_create'),
@@ -16,6 +18,7 @@ urlpatterns = [
     # Job applications for workers
     path('<int:pk>/apply/', views.job_apply_view, name='job_apply'),
     path('my-applications/', views.my_applications_view, name='my_applications'),
+    path('for-you/', views.job_feed_view, name='job_feed'),
     
     # Application management for employers
     path('applications/<int:pk>/accept/', views.accept_application_view, name='accept_application'),
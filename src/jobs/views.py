@@ -2,97 +2,388 @@ from django.shortcuts import render, get_object_or_404, redirect
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
 from django.core.paginator import Paginator
-from django.db.models import Q, Count
+from django.http import JsonResponse
+from django.urls import reverse
+from django.views.decorators.http import condition, require_GET, require_safe
+from django.db.models import Q, Count, Max
 from django.utils import timezone
+from django.utils.cache import patch_cache_control
+from django.utils.timesince import timesince
 import datetime
-from .models import JobPost, JobCategory, JobApplication
+import hashlib
+from .models import JobPost, JobApplication
 from .forms import JobPostForm, JobApplicationForm, JobSearchForm
+from . import facets, feed, result_cache, search
+from .skills import filter_by_skill
+from .locations import resolve as resolve_location, DISTRICT_NAMES
+from .pagination import CursorPaginator
+from .categories import category_registry
+from .typeahead import BUILDERS as TYPEAHEAD_FIELDS, typeahead_index
+
+# Các cột cần cho thẻ việc làm trên trang danh sách (không lấy experience_required)
+JOB_LIST_FIELDS = (
+    'id', 'title', 'description', 'location', 'work_date', 'work_time_start',
+    'work_time_end', 'payment_type', 'payment_amount', 'required_skills',
+    'priority', 'category_id', 'created_at', 'status',
+)
+
+# Các cột trả về trong API danh sách việc làm
+JOB_API_FIELDS = (
+    'id', 'title', 'category_id', 'location', 'province_id', 'district_id', 'work_date',
+    'work_time_start', 'work_time_end', 'payment_type', 'payment_amount',
+    'hourly_equivalent', 'number_of_workers', 'required_skills', 'priority',
+    'created_at', 'updated_at',
+)
+JOB_API_PAGE_SIZE = 20
+
+# Thời gian (giây) cache dùng chung được giữ trang chi tiết cho khách chưa đăng nhập
+JOB_DETAIL_MAX_AGE = 60
+
+# Sắp xếp theo lương: range scan ngược trên chỉ mục (status, hourly_equivalent/total_payment)
+PAY_SORT_ORDERINGS = {
+    'hourly_pay': ('-hourly_equivalent', '-id'),
+    'total_pay': ('-total_payment', '-id'),
+}
+
+def _attach_categories(rows):
+    """Gắn đối tượng category cho các dòng values() của một trang"""
+    for row in rows:
+        row['category'] = category_registry.get(row['category_id'])
+
+def _query_with(params, **changes):
+    """Query string của trang hiện tại với một số tham số được đặt lại (None = bỏ)"""
+    params = params.copy()
+    for key in ('page', 'cursor'):
+        params.pop(key, None)
+    for key, value in changes.items():
+        if value is None:
+            params.pop(key, None)
+        else:
+            params[key] = value
+    return params.urlencode()
+
+def _facet_links(counts, form, params):
+    """Danh sách facet để hiển thị: nhãn, số lượng, liên kết lọc và trạng thái đang chọn"""
+    data = form.cleaned_data if form.is_valid() else {}
+    category = data.get('category')
+    selected = {
+        'category': str(category.pk) if category else None,
+        'pay': data.get('pay') or None,
+        'date': data['work_date'].isoformat() if data.get('work_date') else None,
+    }
+    district_id = resolve_location(data['location'])[1] if data.get('location') else None
+    selected['district'] = str(district_id) if district_id else None
+    
+    def link(dimension, value, label, **changes):
+        active = selected.get(dimension) == value
+        if active:
+            # Bấm lại facet đang chọn để bỏ lọc
+            changes = {key: None for key in changes}
+        return {'label': label, 'count': counts[dimension][value], 'active': active,
+                'query': _query_with(params, **changes)}
+    
+    links = {'category': [], 'district': [], 'pay': [], 'date': []}
+    for value, _ in counts['category'].most_common():
+        category = category_registry.get(int(value))
+        if category:
+            links['category'].append(link('category', value, category.name, category=value))
+    for value, _ in counts['district'].most_common(10):
+        name = DISTRICT_NAMES.get(int(value))
+        if name:
+            links['district'].append(link('district', value, name, location=name))
+    for key, label, _, _ in facets.PAY_BUCKETS:
+        if counts['pay'][key]:
+            links['pay'].append(link('pay', key, label, pay=key))
+    today = timezone.localdate().isoformat()
+    for value in sorted(value for value in counts['date'] if value >= today)[:7]:
+        label = datetime.date.fromisoformat(value).strftime('%d/%m')
+        links['date'].append(link('date', value, label, work_date=value))
+    return links
+
+def _filter_jobs(jobs, data, cursor_mode=False):
+    """Áp dụng các bộ lọc của JobSearchForm (cleaned_data) lên queryset JobPost"""
+    keyword = data.get('keyword')
+    category = data.get('category')
+    skill = data.get('skill')
+    location = data.get('location')
+    payment_min = data.get('payment_min')
+    payment_max = data.get('payment_max')
+    pay = data.get('pay')
+    work_date = data.get('work_date')
+    
+    if keyword:
+        # Tìm qua chỉ mục toàn văn, xếp theo độ liên quan
+        # (chế độ cursor giữ thứ tự mới nhất để cursor ổn định)
+        jobs = search.filter_jobs(jobs, keyword, ranked=not cursor_mode)
+    
+    if category:
+        jobs = jobs.filter(category=category)
+    
+    if skill:
+        # Join qua chỉ mục của bảng liên kết kỹ năng, không quét required_skills
+        jobs = filter_by_skill(jobs, skill)
+        
+    if location:
+        # "Q1", "quan 1", "Quận 1, TP.HCM" -> cùng một mã quận, lọc chính xác trên chỉ mục
+        province_id, district_id = resolve_location(location)
+        if district_id is not None:
+            jobs = jobs.filter(district_id=district_id)
+        elif province_id is not None:
+            jobs = jobs.filter(province_id=province_id)
+        else:
+            # Địa danh ngoài danh mục: tìm trên cột địa điểm bỏ dấu
+            jobs = jobs.filter(search_location__contains=location)
+        
+    if payment_min:
+        jobs = jobs.filter(hourly_equivalent__gte=payment_min)
+        
+    if payment_max:
+        jobs = jobs.filter(hourly_equivalent__lte=payment_max)
+    
+    if pay:
+        _, _, low, high = next(bucket for bucket in facets.PAY_BUCKETS if bucket[0] == pay)
+        if low is not None:
+            jobs = jobs.filter(hourly_equivalent__gte=low)
+        if high is not None:
+            jobs = jobs.filter(hourly_equivalent__lt=high)
+    
+    if work_date:
+        jobs = jobs.filter(work_date=work_date)
+    
+    # Chế độ cursor chỉ hỗ trợ thứ tự mới nhất
+    sort = data.get('sort')
+    if sort and not cursor_mode:
+        jobs = jobs.order_by(*PAY_SORT_ORDERINGS[sort])
+    return jobs
 
 def job_list_view(request):
     """View danh sách việc làm với tìm kiếm và filter"""
     form = JobSearchForm(request.GET)
+    # Chế độ phân trang cursor (keyset) bật khi URL có tham số `cursor`
+    cursor_mode = 'cursor' in request.GET
     
-    # Use values() to specify exact fields to retrieve, excluding experience_required
-    jobs = JobPost.objects.filter(status='published').order_by('-created_at').values(
-        'id', 'title', 'description', 'location', 'work_date', 'work_time_start', 
-        'work_time_end', 'payment_type', 'payment_amount', 'required_skills', 
-        'priority', 'category_id', 'created_at', 'status'
-    )
+    jobs = JobPost.objects.filter(status='published').order_by('-created_at').values(*JOB_LIST_FIELDS)
     
     # Apply filters if form is valid
     if form.is_valid():
-        keyword = form.cleaned_data.get('keyword')
-        category = form.cleaned_data.get('category')
-        location = form.cleaned_data.get('location')
-        payment_min = form.cleaned_data.get('payment_min')
-        payment_max = form.cleaned_data.get('payment_max')
-        
-        if keyword:
-            jobs = jobs.filter(
-                Q(title__icontains=keyword) | 
-                Q(description__icontains=keyword) |
-                Q(required_skills__icontains=keyword)
-            )
-        
-        if category:
-            jobs = jobs.filter(category=category)
-            
-        if location:
-            jobs = jobs.filter(location__icontains=location)
-            
-        if payment_min:
-            jobs = jobs.filter(payment_amount__gte=payment_min)
-            
-        if payment_max:
-            jobs = jobs.filter(payment_amount__lte=payment_max)
-    
-    # Get categories for each job
-    categories = {cat.id: cat for cat in JobCategory.objects.all()}
+        jobs = _filter_jobs(jobs, form.cleaned_data, cursor_mode)
     
-    # Add category objects to each job dictionary
-    for job in jobs:
-        job['category'] = categories.get(job['category_id'])
+    if cursor_mode:
+        # Keyset pagination: chi phí mỗi trang như nhau, không cần COUNT
+        page_obj = CursorPaginator(jobs, 12).page(request.GET.get('cursor'))
+        _attach_categories(page_obj.object_list)
+        context = {
+            'page_obj': page_obj,
+            'form': form,
+            'cursor_mode': True,
+        }
+        return render(request, 'jobs/job_list.html', context)
     
-    # Pagination
+    # Pagination: chỉ 12 dòng của trang hiện tại được lấy về
     paginator = Paginator(jobs, 12)  # 12 jobs per page
+    filtered = form.is_valid() and any(
+        value for name, value in form.cleaned_data.items() if name != 'sort'
+    )
+    cached = None
+    if filtered:
+        # Cùng bộ lọc (đã chuẩn hóa) trong cùng thế hệ 'jobs' dùng lại danh sách id đã tính
+        cache_key = result_cache.cache_key(form.cleaned_data)
+        cached = result_cache.lookup(cache_key)
+        if cached is None:
+            # Một lượt GROUP BY trên tập đã lọc cho mọi facet; tổng số lấy luôn từ đây thay cho COUNT
+            facet_counts = facets.compute_facets(jobs)
+            paginator.count = sum(facet_counts['category'].values())
+            if paginator.count <= result_cache.SEARCH_CACHE_MAX_IDS:
+                cached = result_cache.store(
+                    cache_key, jobs.values_list('id', flat=True), facet_counts
+                )
+        else:
+            facet_counts = cached['facets']
+    else:
+        # Trang không lọc (phổ biến nhất): đọc bảng facet được duy trì sẵn
+        facet_counts = facets.stored_facets()
     page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
+    if cached is not None:
+        # Phân trang trên danh sách id, chỉ lấy các dòng của trang hiện tại theo khóa chính
+        paginator = Paginator(cached['ids'], 12)
+        page_obj = paginator.get_page(page_number)
+        rows = {
+            row['id']: row
+            for row in JobPost.objects.filter(pk__in=page_obj.object_list).values(*JOB_LIST_FIELDS)
+        }
+        page_obj.object_list = [rows[pk] for pk in page_obj.object_list if pk in rows]
+    else:
+        page_obj = paginator.get_page(page_number)
+        page_obj.object_list = list(page_obj.object_list)
+    _attach_categories(page_obj.object_list)
     
     context = {
         'page_obj': page_obj,
         'form': form,
-        'total_jobs': jobs.count(),
+        'total_jobs': paginator.count,
+        'facets': _facet_links(facet_counts, form, request.GET),
     }
     return render(request, 'jobs/job_list.html', context)
 
-def job_detail_view(request, pk):
-    """View chi tiết việc làm"""
-    job = get_object_or_404(JobPost, pk=pk)
+def _job_api_state(request):
+    """
+    Form, queryset đã lọc và dấu vân tay của tập kết quả (số job đang đăng, số dòng,
+    id và updated_at lớn nhất trên mọi trạng thái của tập đã lọc) của một request API,
+    tính một lần cho cả ETag và phần thân.
+
+    Dấu vân tay đổi khi job được thêm, sửa, đóng/gỡ (updated_at mới) hoặc rời khỏi
+    tập đã lọc/bị xóa hẳn (số job và số dòng giảm) - những trường hợp mà riêng
+    updated_at lớn nhất không phát hiện được, nên API chỉ dùng ETag, không gửi Last-Modified.
+    """
+    state = getattr(request, '_job_api_state', None)
+    if state is None:
+        form = JobSearchForm(request.GET)
+        jobs = summary = None
+        if form.is_valid():
+            matching = _filter_jobs(JobPost.objects.order_by('-created_at'), form.cleaned_data)
+            summary = matching.aggregate(
+                last_modified=Max('updated_at'),
+                max_id=Max('pk'),
+                rows=Count('pk'),
+                total=Count('pk', filter=Q(status='published')),
+            )
+            jobs = matching.filter(status='published')
+        state = request._job_api_state = (form, jobs, summary)
+    return state
+
+def _job_api_etag(request):
+    _, _, summary = _job_api_state(request)
+    if summary is None:
+        return None
+    last_modified = summary['last_modified'].isoformat() if summary['last_modified'] else ''
+    fingerprint = f"{summary['total']}:{summary['rows']}:{summary['max_id']}:{last_modified}"
+    return hashlib.md5(fingerprint.encode()).hexdigest()
+
+def _job_api_row(row):
+    row['category'] = getattr(category_registry.get(row['category_id']), 'name', None)
+    row['skills'] = [skill.strip() for skill in row.pop('required_skills').split(',') if skill.strip()]
+    row['url'] = reverse('jobs:job_detail', args=[row['id']])
+    return row
+
+@require_GET
+@condition(etag_func=_job_api_etag)
+def job_list_api_view(request):
+    """
+    API JSON (chỉ đọc) của danh sách việc làm, nhận cùng tham số lọc với trang tìm việc.
+    Client gửi lại If-None-Match nhận 304 khi tập kết quả không đổi.
+    """
+    form, jobs, summary = _job_api_state(request)
+    if jobs is None:
+        return JsonResponse({'errors': form.errors}, status=400)
     
-    # Kiểm tra nếu công việc đã bắt đầu nhưng vẫn có trạng thái 'published'
-    now = timezone.now()
-    work_datetime = timezone.make_aware(datetime.datetime.combine(job.work_date, job.work_time_start))
+    paginator = Paginator(jobs.values(*JOB_API_FIELDS), JOB_API_PAGE_SIZE)
+    # Số job đã có từ truy vấn trạng thái, không cần COUNT thêm
+    paginator.count = summary['total']
+    page_obj = paginator.get_page(request.GET.get('page'))
+    return JsonResponse({
+        'count': paginator.count,
+        'num_pages': paginator.num_pages,
+        'page': page_obj.number,
+        'next': page_obj.next_page_number() if page_obj.has_next() else None,
+        'previous': page_obj.previous_page_number() if page_obj.has_previous() else None,
+        'results': [_job_api_row(row) for row in page_obj.object_list],
+    })
+
+def _job_detail_state(request, pk):
+    """Bài đăng và đơn ứng tuyển của người xem, tải một lần cho cả ETag và phần thân"""
+    state = getattr(request, '_job_detail_state', None)
+    if state is None:
+        job = get_object_or_404(JobPost.objects.select_related('employer', 'category'), pk=pk)
+        
+        # Check if user already applied
+        user_application = None
+        if request.user.is_authenticated and request.user.user_type == 'worker':
+            try:
+                user_application = JobApplication.objects.get(job=job, applicant=request.user)
+            except JobApplication.DoesNotExist:
+                pass
+        state = request._job_detail_state = (job, user_application)
+    return state
+
+def _has_pending_messages(request):
+    # len() không đánh dấu thông báo là đã đọc
+    return len(messages.get_messages(request)) > 0
+
+def _job_detail_etag(request, pk):
+    """
+    ETag của trang chi tiết: nội dung bài đăng, trạng thái thực tế, các bộ đếm đơn,
+    người xem và đơn ứng tuyển của họ. Không dùng khi có thông báo chờ hiển thị, và
+    không dùng cho người đăng bài: trang của họ kèm danh sách ứng viên (hồ sơ, thư
+    ứng tuyển, trang applicants_page) mà các giá trị trên không bao quát.
+    """
+    if _has_pending_messages(request):
+        return None
+    job, user_application = _job_detail_state(request, pk)
+    if request.user.is_authenticated and request.user.pk == job.employer_id:
+        return None
+    parts = [
+        job.pk, job.updated_at.isoformat(), job.effective_status, job.category.name,
+        job.employer.updated_at.isoformat(), job.applications_count,
+        job.pending_applications_count, job.accepted_applications_count,
+        job.rejected_applications_count, timesince(job.created_at),
+    ]
+    if request.user.is_authenticated:
+        parts += [request.user.pk, request.user.updated_at.isoformat()]
+    if user_application is not None:
+        parts += [user_application.pk, user_application.status, user_application.updated_at.isoformat()]
+    return hashlib.md5(':'.join(map(str, parts)).encode()).hexdigest()
+
+def _job_detail_last_modified(request, pk):
+    """
+    Last-Modified chỉ cho khách chưa đăng nhập (trang của người đăng nhập phụ thuộc
+    vào người xem, chỉ dùng ETag). Mốc start_at đã qua tính là lúc job đóng.
+    """
+    if request.user.is_authenticated or _has_pending_messages(request):
+        return None
+    job, _ = _job_detail_state(request, pk)
+    moments = [job.updated_at, job.employer.updated_at]
+    if job.start_at and job.start_at <= timezone.now():
+        moments.append(job.start_at)
+    return max(moments)
+
+@condition(etag_func=_job_detail_etag, last_modified_func=_job_detail_last_modified)
+def _job_detail_response(request, pk):
+    job, user_application = _job_detail_state(request, pk)
     
-    if job.status == 'published' and now >= work_datetime:
-        # Cập nhật trạng thái thành 'closed'
-        job.status = 'closed'
-        job.save(update_fields=['status'])
+    # Đã đến giờ bắt đầu nhưng vẫn 'published': trang hiển thị effective_status, không ghi
+    # CSDL trong GET (update_expired_jobs/run_expiry_scheduler đóng job)
+    if job.status == 'published' and job.effective_status == 'closed':
         messages.info(request, 'Công việc này đã đến giờ bắt đầu và không thể ứng tuyển nữa.')
     
-    # Check if user already applied
-    user_application = None
-    if request.user.is_authenticated and request.user.user_type == 'worker':
-        try:
-            user_application = JobApplication.objects.get(job=job, applicant=request.user)
-        except JobApplication.DoesNotExist:
-            pass
+    # Danh sách ứng viên cho nhà tuyển dụng: phân trang, số truy vấn cố định
+    # (1 COUNT + 1 trang kèm applicant/profile, kỹ năng đọc từ bộ nhớ đệm của profile)
+    applications_page = None
+    if request.user.is_authenticated and request.user.pk == job.employer_id:
+        applications = job.applications.select_related(
+            'applicant', 'applicant__profile'
+        ).order_by('-applied_at')
+        paginator = Paginator(applications, 10)
+        applications_page = paginator.get_page(request.GET.get('applicants_page'))
     
     context = {
         'job': job,
         'user_application': user_application,
+        'applications_page': applications_page,
     }
     return render(request, 'jobs/job_detail.html', context)
 
+@require_safe
+def job_detail_view(request, pk):
+    """View chi tiết việc làm (trả về 304 khi client đã có bản hiện tại)"""
+    response = _job_detail_response(request, pk)
+    if request.user.is_authenticated:
+        # Trang phụ thuộc người xem: trình duyệt giữ bản riêng nhưng luôn hỏi lại
+        patch_cache_control(response, private=True, no_cache=True)
+    else:
+        # Khách: cho phép cache dùng chung (proxy/CDN) giữ trong thời gian ngắn
+        patch_cache_control(response, public=True, max_age=JOB_DETAIL_MAX_AGE)
+    return response
+
 @login_required
 def job_create_view(request):
     """View tạo bài đăng việc làm (chỉ dành cho employer)"""
@@ -220,10 +511,8 @@ def my_jobs_view(request):
         # Lọc theo từ khóa
         keyword = form.cleaned_data.get('keyword')
         if keyword:
-            jobs = jobs.filter(
-                Q(title__icontains=keyword) | 
-                Q(description__icontains=keyword)
-            )
+            # Từ khóa đã bỏ dấu, tìm qua chỉ mục toàn văn như trang tìm việc
+            jobs = search.filter_jobs(jobs, keyword, ranked=False)
         
         # Lọc theo trạng thái
         status = form.cleaned_data.get('status')
@@ -255,9 +544,9 @@ def my_jobs_view(request):
         # Lọc theo có/không có ứng viên
         has_applicants = form.cleaned_data.get('has_applicants')
         if has_applicants == 'yes':
-            jobs = jobs.annotate(app_count=Count('applications')).filter(app_count__gt=0)
+            jobs = jobs.filter(applications_count__gt=0)
         elif has_applicants == 'no':
-            jobs = jobs.annotate(app_count=Count('applications')).filter(app_count=0)
+            jobs = jobs.filter(applications_count=0)
     
     # Sắp xếp kết quả dựa trên tham số sort
     sort_param = request.GET.get('sort', 'newest')
@@ -265,7 +554,7 @@ def my_jobs_view(request):
     if sort_param == 'oldest':
         jobs = jobs.order_by('created_at')
     elif sort_param == 'most_applicants':
-        jobs = jobs.annotate(app_count=Count('applications')).order_by('-app_count')
+        jobs = jobs.order_by('-applications_count')
     elif sort_param == 'date_asc':
         jobs = jobs.order_by('work_date', 'work_time_start')
     elif sort_param == 'date_desc':
@@ -295,10 +584,7 @@ def job_apply_view(request, pk):
         return redirect('jobs:job_detail', pk=pk)
     
     # Kiểm tra xem đã đến giờ làm việc chưa
-    now = timezone.now()
-    work_datetime = timezone.make_aware(datetime.datetime.combine(job.work_date, job.work_time_start))
-    
-    if now >= work_datetime:
+    if job.is_expired():
         messages.error(request, 'Công việc này đã bắt đầu và không thể ứng tuyển nữa.')
         return redirect('jobs:job_detail', pk=pk)
     
@@ -343,11 +629,39 @@ def my_applications_view(request):
     }
     return render(request, 'jobs/my_applications.html', context)
 
+def typeahead_view(request):
+    """Gợi ý cho ô tìm kiếm: ?field=title|skill|location&q=<tiền tố>, trả về JSON"""
+    field = request.GET.get('field')
+    if field not in TYPEAHEAD_FIELDS:
+        return JsonResponse({'error': 'Loại gợi ý không hợp lệ.'}, status=400)
+    try:
+        limit = int(request.GET.get('limit', 10))
+    except ValueError:
+        limit = 10
+    query = request.GET.get('q', '')
+    return JsonResponse({
+        'field': field,
+        'query': query,
+        'results': typeahead_index.search(field, query, max(limit, 1)),
+    })
+
+@login_required
+def job_feed_view(request):
+    """View "Việc làm cho bạn": các job phù hợp kỹ năng, tính sẵn khi job được đăng"""
+    if request.user.user_type != 'worker':
+        messages.error(request, 'Bạn không có quyền truy cập trang này.')
+        return redirect('jobs:job_list')
+    
+    context = {
+        'entries': feed.get_feed(request.user.pk),
+    }
+    return render(request, 'jobs/job_feed.html', context)
+
 @login_required
 def accept_application_view(request, pk):
     """View chấp nhận đơn ứng tuyển"""
     application = get_object_or_404(
-        JobApplication, 
+        JobApplication.objects.select_related('applicant'),
         pk=pk, 
         job__employer=request.user
     )
@@ -355,13 +669,13 @@ def accept_application_view(request, pk):
     application.status = 'accepted'
     application.save()
     messages.success(request, f'Đã chấp nhận đơn ứng tuyển của {application.applicant.get_full_name()}.')
-    return redirect('jobs:job_detail', pk=application.job.pk)
+    return redirect('jobs:job_detail', pk=application.job_id)
 
 @login_required
 def reject_application_view(request, pk):
     """View từ chối đơn ứng tuyển"""
     application = get_object_or_404(
-        JobApplication, 
+        JobApplication.objects.select_related('applicant'),
         pk=pk, 
         job__employer=request.user
     )
@@ -369,4 +683,4 @@ def reject_application_view(request, pk):
     application.status = 'rejected'
     application.save()
     messages.success(request, f'Đã từ chối đơn ứng tuyển của {application.applicant.get_full_name()}.')
-    return redirect('jobs:job_detail', pk=application.job.pk)
+    return redirect('jobs:job_detail', pk=application.job_id)